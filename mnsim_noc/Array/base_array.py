@@ -7,8 +7,19 @@
 @CreateTime:
     2021/10/08 18:21
 """
+import os
+import pickle
+import time
+from functools import partial
 import numpy as np
 from mnsim_noc.utils.component import Component
+from mnsim_noc.utils.event_queue import EventQueue
+from mnsim_noc.utils.trace import TraceWriter
+from mnsim_noc.utils.steady_state import SteadyStateDetector
+from mnsim_noc.utils.profiler import Profiler
+from mnsim_noc.utils.result import get_latency_throughput
+from mnsim_noc.utils import counter
+from mnsim_noc.Wire.link_load import get_link_load, get_link_load_report
 from mnsim_noc.Strategy.mapping import Mapping
 from mnsim_noc.Strategy.schedule import Schedule
 
@@ -20,7 +31,8 @@ class BaseArray(Component):
     NAME = "behavior_driven"
     def __init__(self, task_behavior_list, image_num,
         tile_net_shape, buffer_size, band_width,
-        mapping_strategy="naive", schedule_strategy="naive", transparent_flag=False
+        mapping_strategy="naive", schedule_strategy="naive", transparent_flag=False,
+        mapping_kwargs=None
     ):
         super(BaseArray, self).__init__()
         # logging
@@ -37,11 +49,14 @@ class BaseArray(Component):
         )
         # show the array
         self._get_behavior_number(task_behavior_list)
-        # init
+        # init, the mapping time is kept for the benchmark
+        start_time = time.perf_counter()
         self.mapping_strategy = Mapping.get_class_(mapping_strategy)(
-            task_behavior_list, image_num, tile_net_shape, buffer_size, band_width
+            task_behavior_list, image_num, tile_net_shape, buffer_size, band_width,
+            **({} if mapping_kwargs is None else mapping_kwargs)
         )
         self.tile_list, self.communication_list, self.wire_net = self.mapping_strategy.mapping_net()
+        self.mapping_time = time.perf_counter() - start_time
         # set transparent
         self.wire_net.set_transparent_flag(transparent_flag)
         self.schedule_strategy = Schedule.get_class_(schedule_strategy)(
@@ -51,6 +66,22 @@ class BaseArray(Component):
         self.image_num = image_num
         self.tile_net_shape = tile_net_shape
         self.time_point_list = []
+        self.time_point_number = 0
+        self.end_time = 0.
+        self.statistics_only = False
+        self.event_queue = None
+        # steady state detector, and the simulated image number of each task
+        self.steady_state = None
+        self.simulated_image_num = None
+        # checkpoint and trace writer
+        self.checkpoint_path = None
+        self.checkpoint_events = None
+        self.checkpoint_seconds = None
+        self.trace = None
+        # profiler, None for no profile
+        self.profiler = None
+        # counters registry, shared by the components
+        self.counters = counter.Counters()
 
     def _get_behavior_number(self, task_behavior_list):
         """
@@ -86,37 +117,235 @@ class BaseArray(Component):
                 f" {behavior_number[i]} behaviors"
             )
 
-    def run(self):
+    def run(self, trace_path=None, statistics_only=False,
+        steady_state_tolerance=None, steady_state_window=8,
+        checkpoint_path=None, checkpoint_events=None, checkpoint_seconds=None,
+        resume_path=None, profile=False
+    ):
         """
         run the array
+        trace_path: stream the events to the trace file, None for no trace
+        statistics_only: keep only the accumulators, not the range and time point list
+        steady_state_tolerance: stop when the image completion is periodic
+            within the relative tolerance, and extrapolate the remaining images
+            None for the full simulation
+        steady_state_window: the least number of intervals to check the steady state,
+            raised to the pipeline depth of each task
+        checkpoint_path: write the checkpoint every checkpoint_events time points
+            or every checkpoint_seconds seconds, None for no checkpoint
+        resume_path: resume the simulation from the checkpoint
+        profile: record the wall time and call count of each phase in the loop
         """
         current_time = 0.
         update_module = self.mapping_strategy.get_update_order(
             self.tile_list, self.communication_list
         )
         self.time_point_list = []
-        while True:
-            # running the data
+        self.time_point_number = 0
+        self.end_time = 0.
+        self.statistics_only = statistics_only
+        for module in update_module:
+            module.set_statistics_only(statistics_only)
+        # event queue, tiles and communications push end time into it
+        self.event_queue = EventQueue(update_module)
+        for module in update_module:
+            module.set_event_queue(self.event_queue)
+        self._set_wakeup()
+        # counters registry
+        self.counters = counter.Counters()
+        for module in update_module:
+            module.set_counters(self.counters)
+        self.schedule_strategy.set_counters(self.counters)
+        self.wire_net.route_table.set_counters(self.counters)
+        # steady state detector
+        self.steady_state = None
+        self.simulated_image_num = None
+        if steady_state_tolerance is not None:
+            self.steady_state = SteadyStateDetector(
+                self.tile_list, self.image_num, steady_state_tolerance, steady_state_window
+            )
+        # resume from the checkpoint
+        trace_event_number = 0
+        if resume_path is not None:
+            current_time, trace_event_number = self.load_checkpoint(resume_path)
+            self.logger.info(f"Resume from {resume_path} at {current_time/1e6:.3f} ms")
+        # checkpoint
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_events = checkpoint_events
+        self.checkpoint_seconds = checkpoint_seconds
+        # trace writer
+        self.trace = None if trace_path is None else \
+            TraceWriter(trace_path, event_number=trace_event_number)
+        for i, tile in enumerate(self.tile_list):
+            tile.set_trace(self.trace, i)
+        for i, communication in enumerate(self.communication_list):
+            communication.set_trace(self.trace, i)
+        # profiler, wrap the methods called in the loop
+        self.profiler = None
+        if profile:
+            self.profiler = Profiler()
             for module in update_module:
+                self.profiler.wrap(module, "update", f"update {module.__class__.__name__}")
+            self.profiler.wrap(self.schedule_strategy, "schedule", "schedule")
+            self.profiler.wrap(self.event_queue, "get_next_time", "next_time")
+            if self.steady_state is not None:
+                self.profiler.wrap(self.steady_state, "check", "steady_state")
+            self.profiler.wrap(self, "save_checkpoint", "checkpoint")
+            self.profiler.start()
+        try:
+            self._run_loop(current_time)
+        finally:
+            if self.profiler is not None:
+                self.profiler.stop()
+                self.profiler.unwrap()
+            if self.trace is not None:
+                self.trace.close()
+                self.logger.info(f"Trace {self.trace.event_number} events to {trace_path}")
+        # extrapolate the remaining images in the steady state
+        if self.steady_state is not None and self.steady_state.steady_flag:
+            self.simulated_image_num = self.steady_state.extrapolate()
+            self.logger.info(
+                f"Steady state at {self.end_time/1e6:.3f} ms, simulated image number is " + \
+                ", ".join([f"{v} for task {k}" for k, v in self.simulated_image_num.items()])
+            )
+            return None
+        # check if the simulation is over
+        self.check_finish()
+        return None
+
+    def _run_loop(self, current_time):
+        """
+        run the simulation loop from current_time
+        """
+        checkpoint_time_point = self.time_point_number
+        checkpoint_clock = time.time()
+        while True:
+            # running the data, only for the wakeup modules
+            for module in self.event_queue.get_wakeup_module():
+                self.counters[counter.MODULE_UPDATE] += 1
                 module.update(current_time)
             # schedule for the path
             self.schedule_strategy.schedule(current_time)
+            # stop on the steady state
+            if self.steady_state is not None and self.steady_state.check():
+                break
             # get next time
-            next_time = min([
-                min([tile.get_computation_end_time() for tile in self.tile_list]),
-                min([
-                    communication.get_communication_end_time()
-                    for communication in self.communication_list
-                ])
-            ])
+            next_time = self.event_queue.get_next_time(current_time)
             # check if the simulation is over
             assert next_time > current_time
             current_time = next_time
             if current_time == float("inf"):
                 break
-            self.time_point_list.append(current_time)
-        # check if the simulation is over
-        self.check_finish()
+            self.time_point_number += 1
+            self.end_time = current_time
+            if not self.statistics_only:
+                self.time_point_list.append(current_time)
+            # checkpoint between two time points
+            if self.checkpoint_path is None:
+                continue
+            if (self.checkpoint_events is not None and \
+                self.time_point_number - checkpoint_time_point >= self.checkpoint_events) or \
+                (self.checkpoint_seconds is not None and \
+                time.time() - checkpoint_clock >= self.checkpoint_seconds):
+                self.save_checkpoint(self.checkpoint_path, current_time)
+                checkpoint_time_point = self.time_point_number
+                checkpoint_clock = time.time()
+
+    def _get_checkpoint_key(self):
+        """
+        get the key of the array, the checkpoint is only for the same array
+        """
+        return {
+            "image_num": self.image_num,
+            "tile_net_shape": tuple(self.tile_net_shape),
+            "tile": [(tile.task_id, tile.tile_id, tile.position) for tile in self.tile_list],
+            "communication": [c.communication_id for c in self.communication_list],
+            "schedule": self.schedule_strategy.NAME,
+            "transparent_flag": self.wire_net.transparent_flag,
+            "statistics_only": self.statistics_only,
+            "data_number": len(self.tile_list[0].data_table.data_size),
+        }
+
+    def save_checkpoint(self, checkpoint_path, current_time):
+        """
+        save the mutable state on the current time point to the checkpoint
+        the static task behavior is not saved
+        """
+        trace_event_number = 0
+        if self.trace is not None:
+            self.trace.flush()
+            trace_event_number = self.trace.event_number
+        state = {
+            "key": self._get_checkpoint_key(),
+            "current_time": current_time,
+            "time_point_number": self.time_point_number,
+            "end_time": self.end_time,
+            "time_point_list": self.time_point_list,
+            "event_queue": self.event_queue.get_state(),
+            "schedule": self.schedule_strategy.get_state(),
+            "wire_net": self.wire_net.get_state(),
+            "tile": [tile.get_state() for tile in self.tile_list],
+            "communication": [c.get_state() for c in self.communication_list],
+            "steady_state": None if self.steady_state is None else \
+                self.steady_state.get_state(),
+            "trace_event_number": trace_event_number,
+            "counters": dict(self.counters),
+        }
+        # write to the temporary file first, the former checkpoint is kept on crash
+        temp_path = checkpoint_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, checkpoint_path)
+        self.logger.info(f"Checkpoint at {current_time/1e6:.3f} ms to {checkpoint_path}")
+
+    def load_checkpoint(self, checkpoint_path):
+        """
+        load the mutable state from the checkpoint
+        return the current time and the trace event number
+        """
+        with open(checkpoint_path, "rb") as f:
+            state = pickle.load(f)
+        assert state["key"] == self._get_checkpoint_key(), \
+            "the checkpoint is not for this array"
+        assert (state["steady_state"] is None) == (self.steady_state is None), \
+            "the steady state mode should be the same as the checkpoint"
+        self.time_point_number = state["time_point_number"]
+        self.end_time = state["end_time"]
+        self.time_point_list = state["time_point_list"]
+        self.event_queue.set_state(state["event_queue"])
+        self.schedule_strategy.set_state(state["schedule"])
+        self.wire_net.set_state(state["wire_net"])
+        for tile, tile_state in zip(self.tile_list, state["tile"]):
+            tile.set_state(tile_state)
+        for communication, communication_state in \
+            zip(self.communication_list, state["communication"]):
+            communication.set_state(communication_state)
+        if self.steady_state is not None:
+            self.steady_state.set_state(state["steady_state"])
+        self.counters.clear()
+        self.counters.update(state["counters"])
+        return state["current_time"], state["trace_event_number"]
+
+    def _set_wakeup(self):
+        """
+        set the wakeup of the buffers
+        data in the input buffer and space in the output buffer wakeup the tile
+        data in the output buffer and space in the input buffer wakeup the communication
+        """
+        tile_communication = self.mapping_strategy.get_tile_communication(
+            self.tile_list, self.communication_list
+        )
+        for tile in self.tile_list:
+            input_communication, output_communication = tile_communication[id(tile)]
+            tile_wakeup = [partial(self.event_queue.wakeup, tile)]
+            tile.input_buffer.set_wakeup(tile_wakeup, [
+                partial(self.schedule_strategy.wakeup, communication)
+                for communication in input_communication
+            ])
+            tile.output_buffer.set_wakeup([
+                partial(self.schedule_strategy.wakeup, communication)
+                for communication in output_communication
+            ], tile_wakeup)
 
     def check_finish(self):
         """
@@ -142,29 +371,24 @@ class BaseArray(Component):
             if task_id not in complete_time:
                 complete_time[task_id] = \
                     [[float("inf"), float("-inf")] for _ in range(self.image_num)]
-            computation_range = tile.get_computation_range()
-            assert len(computation_range) == self.image_num
+            image_range = tile.get_image_range()
+            assert len(image_range) == self.image_num
             for i in range(self.image_num):
                 complete_time[task_id][i][0] = min([
-                    complete_time[task_id][i][0], computation_range[i][0][0]
+                    complete_time[task_id][i][0], image_range[i][0]
                 ])
                 complete_time[task_id][i][1] = max([
-                    complete_time[task_id][i][1], computation_range[i][-1][1]
+                    complete_time[task_id][i][1], image_range[i][1]
                 ])
         # logger complete time
         for task_id, computation_range in complete_time.items():
-            al = sum([x[1]-x[0] for x in computation_range])/self.image_num
+            al, at, total_time = get_latency_throughput(computation_range)
             output_str = f"Task {task_id} average latency is {al/1e6:.3f} ms"
-            if self.image_num > 1:
-                at = sum([
-                    computation_range[i+1][1]-computation_range[i][1]
-                    for i in range(self.image_num-1)
-                ])/(self.image_num-1)
+            if at is not None:
                 output_str += f", average throughput is {at/1e6:.3f} ms"
             else:
                 output_str += ", no throughput time"
-            output_str += f", total cost time is " + \
-                f"{(computation_range[-1][1]-computation_range[0][0])/1e6:.3f} ms"
+            output_str += f", total cost time is {total_time/1e6:.3f} ms"
             self.logger.info(output_str)
             for i, sl in enumerate(computation_range):
                 self.logger.info(
@@ -177,8 +401,10 @@ class BaseArray(Component):
         show the tile and wire running rate
         """
         # show the tile and wire running rate
-        end_time = self.time_point_list[-1]
-        tile_task_id = np.zeros(self.tile_net_shape, dtype=np.int)
+        assert self.simulated_image_num is None, \
+            "tile and wire rate is not available after the steady state stop"
+        end_time = self.end_time
+        tile_task_id = np.zeros(self.tile_net_shape, dtype=int)
         tile_load_rate = np.zeros(self.tile_net_shape)
         for tile in self.tile_list:
             position = tile.position
@@ -216,9 +442,94 @@ class BaseArray(Component):
                 self.logger.info(split_str)
         return tile_task_id, tile_load_rate, horizontal_rate, vectical_rate
 
+    def show_profile(self):
+        """
+        show the profile of the phases in the loop, return the result dict
+        """
+        assert self.profiler is not None, "the array is not run with profile"
+        result = self.profiler.get_result(self.time_point_number)
+        self.logger.info(
+            f"Profile: {result['total_time']:.3f} s for {result['event_number']} time points," + \
+            f" {result['events_per_second']:.1f} time points per second"
+        )
+        for phase, phase_result in result["phase"].items():
+            self.logger.info(
+                f"\t{phase}: {phase_result['time']:.3f} s, {phase_result['count']} calls," + \
+                f" {phase_result['time']/result['total_time']*100:.1f}%"
+            )
+        self.logger.info(f"\tother: {result['other_time']:.3f} s")
+        return result
+
+    def get_counters(self):
+        """
+        get the counters and the cache hit rate
+        """
+        counters = dict(self.counters)
+        counters[counter.TIME_POINT] = self.time_point_number
+        return {
+            "counters": dict(sorted(counters.items())),
+            "hit_rate": dict(
+                (name, self.counters.get_hit_rate(name))
+                for name in self.counters.get_cache_name_list()
+            ),
+        }
+
+    def show_counters(self):
+        """
+        show the counters and the cache hit rate, return the result dict
+        blocked transfers are from the wire contention
+        blocked computations and space are from the buffer back-pressure
+        """
+        result = self.get_counters()
+        self.logger.info("Counters")
+        for name, value in result["counters"].items():
+            self.logger.info(f"\t{name}: {value}")
+        for name, rate in result["hit_rate"].items():
+            self.logger.info(f"\t{name} hit rate: {rate*100:.2f}%")
+        return result
+
+    def get_link_load(self):
+        """
+        get the analytic load of each wire, bits of all images on the XY routes
+        """
+        tile_index = dict((id(tile), i) for i, tile in enumerate(self.tile_list))
+        return get_link_load(
+            np.array([tile.position for tile in self.tile_list]).reshape(-1, 2),
+            np.array([tile_index[id(c.input_tile)] for c in self.communication_list],
+                dtype=np.int64),
+            np.array([tile_index[id(c.output_tile)] for c in self.communication_list],
+                dtype=np.int64),
+            np.array([
+                sum(dependence.output_size for dependence in c.input_tile.dependence_list) \
+                    * self.image_num
+                for c in self.communication_list
+            ]),
+            self.tile_net_shape
+        )
+
+    def show_link_load(self, top_number=5):
+        """
+        show the total, max and variance of the analytic wire load, and the hot wires
+        return the report dict
+        """
+        load = self.get_link_load()
+        report = dict((key, float(value)) for key, value in get_link_load_report(load).items())
+        self.logger.info("Analytic wire load")
+        self.logger.info(
+            f"\ttotal: {report['total']:.0f} bits, max: {report['max']:.0f} bits, "
+            f"variance: {report['variance']:.3g}"
+        )
+        for index in np.argsort(-load, kind="stable")[:top_number].tolist():
+            if load[index] > 0:
+                self.logger.info(
+                    f"\twire {self.wire_net.wire_position[index]}: {load[index]:.0f} bits"
+                )
+        return report
+
     def show_simulation_result(self):
         """
         show the simulation result
         """
-        self.show_latency_throughput()
+        complete_time = self.show_latency_throughput()
         # self.show_tile_wire_rate()
+        return complete_time
@@ -1,4 +1,5 @@
 #-*-coding:utf-8-*-
+from mnsim_noc.Buffer.data_table import DataTable
 from mnsim_noc.Buffer.base_buffer import BaseBuffer
 from mnsim_noc.Buffer.multi_input_buffer import MultiInputBuffer
 from mnsim_noc.Buffer.multi_output_buffer import MultiOutputBuffer
\ No newline at end of file
@@ -9,20 +9,9 @@
 @CreateTime:
     2022/05/07 09:27
 """
+import collections
 from mnsim_noc.utils.component import Component
-
-def get_data_size(data):
-    """
-    get the size of the data
-    (x, y, start, end, bit, total, image_id, layer_id, in_id, tile_id)
-    """
-    return (data[3] - data[2]) * data[4]
-
-def get_data_tile(data):
-    """
-    check if the data is from the tile
-    """
-    return data[9]
+from mnsim_noc.Buffer.data_table import default_data_table
 
 class BaseBuffer(Component):
     """
@@ -30,41 +19,65 @@ class BaseBuffer(Component):
     """
     REGISTRY = "buffer"
     NAME = "behavior_driven"
-    def __init__(self, buffer_size):
+    def __init__(self, buffer_size, data_table=None):
         """
         buffer_size: buffer size in bits
+        data_table: the table of the data id, default shared table if None
         """
         super(BaseBuffer, self).__init__()
         self.buffer_size = buffer_size
-        self.buffer_data = []
+        self.data_table = default_data_table if data_table is None else data_table
+        # key is the data id, value is the count, in the add order
+        self.buffer_data = collections.OrderedDict()
         self.used_space = 0
 
-    def _add_one(self, data):
+    def add_data_list(self, data_list, data_size=None):
         """
-        add one data to the buffer
+        add list data to the buffer
+        data_size is the total size of the data list, computed if None
         """
-        # perhaps add a check to make sure data is not in the buffer
-        self.buffer_data.append(data)
-        self.used_space += get_data_size(data)
+        for data in data_list:
+            self.buffer_data[data] = self.buffer_data.get(data, 0) + 1
+        if data_size is None:
+            data_size = self.data_table.get_data_list_size(data_list)
+        self.used_space += data_size
 
-    def add_data_list(self, data_list):
+    def delete_data_list(self, data_list, data_size=None):
         """
-        add list data to the buffer
+        delete list data in the buffer
+        data_size is the total size of the data list, computed if None
         """
         for data in data_list:
-            self._add_one(data)
+            count = self.buffer_data[data]
+            if count == 1:
+                del self.buffer_data[data]
+            else:
+                self.buffer_data[data] = count - 1
+        if data_size is None:
+            data_size = self.data_table.get_data_list_size(data_list)
+        self.used_space -= data_size
 
-    def _delete_one(self, data):
+    def get_state(self):
         """
-        delete one data in the buffer
+        get the mutable state of the buffer, for the checkpoint
         """
-        # perhaps add a check to make sure data is in the buffer
-        self.buffer_data.remove(data)
-        self.used_space -= get_data_size(data)
+        return {
+            "buffer_data": list(self.buffer_data.items()),
+            "used_space": self.used_space,
+        }
 
-    def delete_data_list(self, data_list):
+    def set_state(self, state):
         """
-        delete list data in the buffer
+        set the mutable state of the buffer, from the checkpoint
+        """
+        self.buffer_data = collections.OrderedDict(state["buffer_data"])
+        self.used_space = state["used_space"]
+
+    def check_data_already(self, data_list):
+        """
+        check if the data is already in the buffer
         """
         for data in data_list:
-            self._delete_one(data)
+            if data not in self.buffer_data:
+                return False
+        return True
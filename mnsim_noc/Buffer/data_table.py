@@ -0,0 +1,161 @@
+#-*-coding:utf-8-*-
+"""
+@FileName:
+    data_table.py
+@Description:
+    data table, intern the data descriptor to int id
+@CreateTime:
+    2026/10/18 13:05
+"""
+import collections
+
+# data id is (image_id << IMAGE_SHIFT) | base_id
+IMAGE_SHIFT = 32
+BASE_MASK = (1 << IMAGE_SHIFT) - 1
+
+def get_data_size(data):
+    """
+    get the size of the data
+    (x, y, start, end, bit, total, image_id, layer_id, in_id, tile_id)
+    """
+    return (data[3] - data[2]) * data[4]
+
+def get_data_tile(data):
+    """
+    check if the data is from the tile
+    """
+    return data[9]
+
+# compiled dependence, wait, output and drop are base id tuples
+# wait_split and drop_split are tuples of (source_tile_id, base id tuple, size)
+Dependence = collections.namedtuple("Dependence", [
+    "wait", "output", "drop", "latency",
+    "wait_size", "output_size", "drop_size",
+    "wait_split", "drop_split",
+])
+
+class DataTable(object):
+    """
+    data table, intern each distinct data descriptor to an int base id
+    (x, y, start, end, bit, total, image_id, layer_id, in_id, tile_id)
+    the image id is not in the table, it is the high part of the data id
+    size and source tile are kept in parallel lists, index by base id
+    """
+    def __init__(self):
+        self.data_index = {}
+        self.data_descriptor = []
+        self.data_size = []
+        self.data_tile = []
+
+    def intern(self, data):
+        """
+        get the base id of the data, ignore the image id
+        """
+        key = tuple(data[:6]) + (None,) + tuple(data[7:])
+        base_id = self.data_index.get(key, None)
+        if base_id is None:
+            base_id = len(self.data_descriptor)
+            assert base_id <= BASE_MASK, "too many data in the data table"
+            self.data_index[key] = base_id
+            self.data_descriptor.append(key)
+            self.data_size.append(get_data_size(key))
+            self.data_tile.append(get_data_tile(key))
+        return base_id
+
+    def intern_list(self, data_list):
+        """
+        get the base id tuple of the data list
+        """
+        return tuple(self.intern(data) for data in data_list)
+
+    def get_data_id(self, data, image_id=None):
+        """
+        get the data id, image id is from the data if it is None
+        """
+        if image_id is None:
+            image_id = 0 if data[6] is None else data[6]
+        return (image_id << IMAGE_SHIFT) | self.intern(data)
+
+    def get_data(self, data_id):
+        """
+        get the data descriptor of the data id
+        """
+        data = list(self.data_descriptor[data_id & BASE_MASK])
+        data[6] = data_id >> IMAGE_SHIFT
+        return data
+
+    def get_data_size(self, data_id):
+        """
+        get the size of the data id
+        """
+        return self.data_size[data_id & BASE_MASK]
+
+    def get_data_list_size(self, data_id_list):
+        """
+        get the total size of the data id list
+        """
+        return sum([self.data_size[data_id & BASE_MASK] for data_id in data_id_list])
+
+    def get_data_tile(self, data_id):
+        """
+        get the source tile of the data id
+        """
+        return self.data_tile[data_id & BASE_MASK]
+
+    def split_data_list(self, base_id_list):
+        """
+        split the base id list regarding the source tile
+        return tuple of (source_tile_id, base id tuple, size)
+        """
+        split_data_dict = collections.OrderedDict()
+        for base_id in base_id_list:
+            split_data_dict.setdefault(self.data_tile[base_id], []).append(base_id)
+        return tuple(
+            (source_tile_id, tuple(value), self.get_data_list_size(value))
+            for source_tile_id, value in split_data_dict.items()
+        )
+
+    def compile_dependence(self, dependence):
+        """
+        compile the dependence to the immutable form
+        data list to base id tuple, with the size and the source split
+        """
+        wait = self.intern_list(dependence["wait"])
+        output = self.intern_list(dependence["output"])
+        drop = self.intern_list(dependence["drop"])
+        return Dependence(
+            wait, output, drop, dependence["latency"],
+            self.get_data_list_size(wait),
+            self.get_data_list_size(output),
+            self.get_data_list_size(drop),
+            self.split_data_list(wait),
+            self.split_data_list(drop),
+        )
+
+    def compile_dependence_list(self, dependence_list):
+        """
+        compile the dependence list
+        the columnar dependence list compiles itself on the arrays, without the dict
+        """
+        if not hasattr(dependence_list, "compile"):
+            return [self.compile_dependence(dependence) for dependence in dependence_list]
+        return [Dependence(*field) for field in dependence_list.compile(self)]
+
+def get_image_data_list(base_id_list, image_id):
+    """
+    get the data id list of the image
+    """
+    image_offset = image_id << IMAGE_SHIFT
+    return [image_offset | base_id for base_id in base_id_list]
+
+def get_image_split_list(split_list, image_id):
+    """
+    get the split list of the image, (source_tile_id, data id list, size)
+    """
+    return [
+        (source_tile_id, get_image_data_list(base_id_list, image_id), data_size)
+        for source_tile_id, base_id_list, data_size in split_list
+    ]
+
+# shared by the components which are not created with a data table
+default_data_table = DataTable()
@@ -9,20 +9,19 @@
 @CreateTime:
     2022/05/07 10:15
 """
-from mnsim_noc.Buffer.base_buffer import BaseBuffer, get_data_size
+import collections
+from mnsim_noc.Buffer.base_buffer import BaseBuffer
 
 class InputBuffer(BaseBuffer):
     """
     input behavior buffer
     """
     NAME = "behavior_buffer_input"
-    def __init__(self, buffer_size):
-        super(InputBuffer, self).__init__(buffer_size)
+    def __init__(self, buffer_size, data_table=None):
+        super(InputBuffer, self).__init__(buffer_size, data_table)
         # for input buffer, there may be transfer data to add
-        self.transfer_data = []
+        self.transfer_data = collections.Counter()
         self.transfer_data_size = 0
-        # cache for check already
-        self.cache = {}
         self.start_flag = False
 
     def check_remain_size(self):
@@ -31,52 +30,63 @@ class InputBuffer(BaseBuffer):
         """
         return self.buffer_size - self.used_space - self.transfer_data_size
 
-    def check_enough_space(self, data_list):
+    def check_enough_space(self, data_size):
         """
-        check if the buffer has enough space to add the data
+        check if the buffer has enough space to add the data size
         """
-        data_size = sum([get_data_size(data) for data in data_list])
         return self.check_remain_size() >= data_size
 
-    def _add_transfer_one(self, data):
+    def add_transfer_data_list(self, data_list, data_size=None):
         """
-        add one data to the transfer data
+        add list data to the transfer data
         """
-        self.transfer_data.append(data)
-        self.transfer_data_size += get_data_size(data)
+        for data in data_list:
+            self.transfer_data[data] += 1
+        if data_size is None:
+            data_size = self.data_table.get_data_list_size(data_list)
+        self.transfer_data_size += data_size
 
-    def add_transfer_data_list(self, data_list):
+    def delete_transfer_data_list(self, data_list, data_size=None):
         """
-        add list data to the transfer data
+        delete list data from the transfer data
         """
         for data in data_list:
-            self._add_transfer_one(data)
+            assert self.transfer_data[data] > 0, "the data is not in the transfer data"
+            self.transfer_data[data] -= 1
+            if self.transfer_data[data] == 0:
+                del self.transfer_data[data]
+        if data_size is None:
+            data_size = self.data_table.get_data_list_size(data_list)
+        self.transfer_data_size -= data_size
 
-    def _delete_transfer_one(self, data):
+    def get_state(self):
         """
-        delete one data in the transfer data
+        get the mutable state of the buffer, with the transfer data
         """
-        self.transfer_data.remove(data)
-        self.transfer_data_size -= get_data_size(data)
+        state = super(InputBuffer, self).get_state()
+        state["transfer_data"] = dict(self.transfer_data)
+        state["transfer_data_size"] = self.transfer_data_size
+        return state
 
-    def delete_transfer_data_list(self, data_list):
+    def set_state(self, state):
         """
-        delete list data from the transfer data
+        set the mutable state of the buffer, with the transfer data
         """
-        for data in data_list:
-            self._delete_transfer_one(data)
+        super(InputBuffer, self).set_state(state)
+        self.transfer_data = collections.Counter(state["transfer_data"])
+        self.transfer_data_size = state["transfer_data_size"]
 
-    def add_data_list(self, data_list):
+    def add_data_list(self, data_list, data_size=None):
         """
         add list data to the buffer
         """
         assert not self.start_flag, "the input buffer is already started"
+        if data_size is None:
+            data_size = self.data_table.get_data_list_size(data_list)
         # the data must come from transfer data
-        self.delete_transfer_data_list(data_list)
+        self.delete_transfer_data_list(data_list, data_size)
         # add data list
-        super(InputBuffer, self).add_data_list(data_list)
-        # clear the cache
-        self.cache.clear()
+        super(InputBuffer, self).add_data_list(data_list, data_size)
 
     def check_data_already(self, data_list):
         """
@@ -84,22 +94,14 @@ class InputBuffer(BaseBuffer):
         """
         if self.start_flag:
             return True
-        key = str(data_list)
-        if key in self.cache:
-            return self.cache[key]
-        else:
-            # check the data already
-            value = all([data in self.buffer_data for data in data_list])
-            self.cache[key] = value
-            return value
+        return super(InputBuffer, self).check_data_already(data_list)
 
-    def delete_data_list(self, data_list):
+    def delete_data_list(self, data_list, data_size=None):
         """
         delete list data from the buffer
         """
         if not self.start_flag:
-            super(InputBuffer, self).delete_data_list(data_list)
-            self.cache.clear()
+            super(InputBuffer, self).delete_data_list(data_list, data_size)
 
     def set_start(self):
         """
@@ -10,7 +10,7 @@
     2022/05/09 15:05
 """
 from mnsim_noc.utils.component import Component
-from mnsim_noc.Buffer.base_buffer import get_data_tile
+from mnsim_noc.Buffer.data_table import default_data_table
 from mnsim_noc.Buffer.input_buffer import InputBuffer
 
 class MultiInputBuffer(Component):
@@ -19,70 +19,89 @@ class MultiInputBuffer(Component):
     """
     REGISTRY = "multi_buffer"
     NAME = "behavior_buffer_input"
-    def __init__(self, buffer_size, input_source_id):
+    def __init__(self, buffer_size, input_source_id, data_table=None):
         super(MultiInputBuffer, self).__init__()
         # init multi input buffer, id with source
         self.input_source_id = input_source_id
+        self.data_table = default_data_table if data_table is None else data_table
         self.input_buffer_dict = dict()
         for source_tile_id in self.input_source_id:
-            self.input_buffer_dict[str(source_tile_id)] = \
-                InputBuffer(buffer_size // len(self.input_source_id))
+            self.input_buffer_dict[source_tile_id] = \
+                InputBuffer(buffer_size // len(self.input_source_id), self.data_table)
+        # wakeup for data added and space freed
+        self.data_wakeup = []
+        self.space_wakeup = []
         # check
         self.start_flag = False
         assert len(input_source_id) > 0, "input source id is empty"
         if len(input_source_id) == 1 and input_source_id[0] == -1:
             self.set_start()
 
-    def check_enough_space(self, data_list, source_tile_id):
+    def set_wakeup(self, data_wakeup, space_wakeup):
         """
-        check if the buffer has enough space to add the data
+        set the wakeup functions
+        data_wakeup is called when data is added, for the computation
+        space_wakeup is called when space is freed, for the communication
         """
-        return self.input_buffer_dict[str(source_tile_id)].check_enough_space(data_list)
+        self.data_wakeup = data_wakeup
+        self.space_wakeup = space_wakeup
 
-    def add_transfer_data_list(self, data_list, source_tile_id):
+    def get_state(self):
         """
-        add data list to the buffer's transfer data
+        get the mutable state of each input buffer
         """
-        self.input_buffer_dict[str(source_tile_id)].add_transfer_data_list(data_list)
+        return dict((k, v.get_state()) for k, v in self.input_buffer_dict.items())
 
-    def add_data_list(self, data_list, source_tile_id):
+    def set_state(self, state):
         """
-        add data list to the buffer
+        set the mutable state of each input buffer
+        """
+        for k, v in self.input_buffer_dict.items():
+            v.set_state(state[k])
+
+    def check_enough_space(self, data_size, source_tile_id):
+        """
+        check if the buffer has enough space to add the data size
         """
-        self.input_buffer_dict[str(source_tile_id)].add_data_list(data_list)
+        return self.input_buffer_dict[source_tile_id].check_enough_space(data_size)
 
-    def _split_data_list(self, data_list):
+    def add_transfer_data_list(self, data_list, source_tile_id, data_size=None):
         """
-        split data list regarding the inuput_source_id
+        add data list to the buffer's transfer data
+        """
+        self.input_buffer_dict[source_tile_id].add_transfer_data_list(data_list, data_size)
+
+    def add_data_list(self, data_list, source_tile_id, data_size=None):
+        """
+        add data list to the buffer
         """
-        split_data_dict = dict()
-        for data in data_list:
-            source_tile_id = get_data_tile(data)
-            split_data_dict[str(source_tile_id)] = \
-                split_data_dict.get(str(source_tile_id), []) + [data]
-        return split_data_dict
+        self.input_buffer_dict[source_tile_id].add_data_list(data_list, data_size)
+        for wakeup in self.data_wakeup:
+            wakeup()
 
-    def check_data_already(self, data_list):
+    def check_data_already(self, split_data_list):
         """
         check if the data is already in the buffer
+        split_data_list: list of (source_tile_id, data_list, data_size)
         """
         if self.start_flag:
             return True
-        split_data_dict = self._split_data_list(data_list)
-        for k, v in split_data_dict.items():
-            if not self.input_buffer_dict[k].check_data_already(v):
+        for source_tile_id, data_list, _ in split_data_list:
+            if not self.input_buffer_dict[source_tile_id].check_data_already(data_list):
                 return False
         return True
 
-    def delete_data_list(self, data_list):
+    def delete_data_list(self, split_data_list):
         """
         delete data list from the buffer
+        split_data_list: list of (source_tile_id, data_list, data_size)
         """
         if self.start_flag:
             return None
-        split_data_dict = self._split_data_list(data_list)
-        for k, v in split_data_dict.items():
-            self.input_buffer_dict[k].delete_data_list(v)
+        for source_tile_id, data_list, data_size in split_data_list:
+            self.input_buffer_dict[source_tile_id].delete_data_list(data_list, data_size)
+        for wakeup in self.space_wakeup:
+            wakeup()
 
     def set_start(self):
         """
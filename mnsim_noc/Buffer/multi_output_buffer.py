@@ -10,6 +10,7 @@
     2022/05/07 19:53
 """
 from mnsim_noc.utils.component import Component
+from mnsim_noc.Buffer.data_table import default_data_table
 from mnsim_noc.Buffer.output_buffer import OutputBuffer
 
 class MultiOutputBuffer(Component):
@@ -18,46 +19,76 @@ class MultiOutputBuffer(Component):
     """
     REGISTRY = "multi_buffer"
     NAME = "behavior_buffer_output"
-    def __init__(self, buffer_size, output_target_id):
+    def __init__(self, buffer_size, output_target_id, data_table=None):
         super(MultiOutputBuffer, self).__init__()
         # init multi output buffer, id with target
         self.output_target_id = output_target_id
+        self.data_table = default_data_table if data_table is None else data_table
         self.output_buffer_dict = dict()
         for target_tile_id in self.output_target_id:
-            self.output_buffer_dict[str(target_tile_id)] = \
-                OutputBuffer(buffer_size)
+            self.output_buffer_dict[target_tile_id] = \
+                OutputBuffer(buffer_size, self.data_table)
+        # wakeup for data added and space freed
+        self.data_wakeup = []
+        self.space_wakeup = []
         # assert output target id
         assert len(output_target_id) > 0, "output target id is empty"
         if len(output_target_id) == 1 and output_target_id[0] == -1:
             self.set_end()
 
-    def check_enough_space(self, data_list):
+    def set_wakeup(self, data_wakeup, space_wakeup):
         """
-        check if the buffer has enough space to add the data
+        set the wakeup functions
+        data_wakeup is called when data is added, for the communication
+        space_wakeup is called when space is freed, for the computation
         """
-        enough = [output_buffer.check_enough_space(data_list)
-            for output_buffer in self.output_buffer_dict.values()
-        ]
-        return all(enough)
+        self.data_wakeup = data_wakeup
+        self.space_wakeup = space_wakeup
 
-    def add_data_list(self, data_list):
+    def get_state(self):
+        """
+        get the mutable state of each output buffer
+        """
+        return dict((k, v.get_state()) for k, v in self.output_buffer_dict.items())
+
+    def set_state(self, state):
+        """
+        set the mutable state of each output buffer
+        """
+        for k, v in self.output_buffer_dict.items():
+            v.set_state(state[k])
+
+    def check_enough_space(self, data_size):
+        """
+        check if the buffer has enough space to add the data size
+        """
+        for output_buffer in self.output_buffer_dict.values():
+            if not output_buffer.check_enough_space(data_size):
+                return False
+        return True
+
+    def add_data_list(self, data_list, data_size=None):
         """
         add data list to the buffer
         """
         for output_buffer in self.output_buffer_dict.values():
-            output_buffer.add_data_list(data_list)
+            output_buffer.add_data_list(data_list, data_size)
+        for wakeup in self.data_wakeup:
+            wakeup()
 
     def next_transfer_data(self, target_tile_id):
         """
         get the next transfer data of the target tile id
         """
-        return self.output_buffer_dict[str(target_tile_id)].next_transfer_data()
+        return self.output_buffer_dict[target_tile_id].next_transfer_data()
 
-    def delete_data_list(self, data_list, target_tile_id):
+    def delete_data_list(self, data_list, target_tile_id, data_size=None):
         """
         delete data list from the buffer
         """
-        return self.output_buffer_dict[str(target_tile_id)].delete_data_list(data_list)
+        self.output_buffer_dict[target_tile_id].delete_data_list(data_list, data_size)
+        for wakeup in self.space_wakeup:
+            wakeup()
 
     def set_end(self):
         """
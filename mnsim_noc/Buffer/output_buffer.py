@@ -9,15 +9,15 @@
 @CreateTime:
     2022/05/07 10:51
 """
-from mnsim_noc.Buffer.base_buffer import BaseBuffer, get_data_size
+from mnsim_noc.Buffer.base_buffer import BaseBuffer
 
 class OutputBuffer(BaseBuffer):
     """
     output behavior buffer
     """
     NAME = "behavior_buffer_output"
-    def __init__(self, buffer_size):
-        super(OutputBuffer, self).__init__(buffer_size)
+    def __init__(self, buffer_size, data_table=None):
+        super(OutputBuffer, self).__init__(buffer_size, data_table)
         self.end_flag = False
 
     def check_remain_size(self):
@@ -28,13 +28,20 @@ class OutputBuffer(BaseBuffer):
             return float("inf")
         return self.buffer_size - self.used_space
 
-    def check_enough_space(self, data_list):
+    def check_enough_space(self, data_size):
         """
-        check if the buffer has enough space to add the data
+        check if the buffer has enough space to add the data size
         """
-        data_size = sum([get_data_size(data) for data in data_list])
         return self.check_remain_size() >= data_size
 
+    def add_data_list(self, data_list, data_size=None):
+        """
+        add list data to the buffer, the end buffer keeps nothing
+        """
+        if self.end_flag:
+            return None
+        return super(OutputBuffer, self).add_data_list(data_list, data_size)
+
     def next_transfer_data(self):
         """
         get the next transfer data
@@ -44,7 +51,7 @@ class OutputBuffer(BaseBuffer):
         if len(self.buffer_data) == 0:
             return None
         else:
-            return [self.buffer_data[0]]
+            return [next(iter(self.buffer_data))]
 
     def set_end(self):
         """
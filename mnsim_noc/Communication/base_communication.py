@@ -10,6 +10,9 @@
     2022/05/07 17:38
 """
 from mnsim_noc.utils.component import Component
+from mnsim_noc.utils.trace import COMMUNICATION_START, COMMUNICATION_END, \
+    WIRE_START, WIRE_END
+from mnsim_noc.utils import counter
 from mnsim_noc.Tile import BaseTile
 from mnsim_noc.Wire import WireNet
 
@@ -37,15 +40,78 @@ class BaseCommunication(Component):
         # state
         self.running_state = False
         self.communication_end_time = float("inf")
+        # statistics, the range list is not kept in the statistics only mode
+        self.statistics_only = False
         self.communication_range_time = []
-        # transfer data and path
+        self.communication_busy_time = 0.
+        self.communication_count = 0
+        self.communication_min_time = float("inf")
+        self.communication_max_time = float("-inf")
+        # event queue, push the end time when communication start
+        self.event_queue = None
+        # trace writer and the communication index in the trace
+        self.trace = None
+        self.trace_id = -1
+        # counters, shared by the array
+        self.counters = counter.Counters()
+        # transfer data and path, data is the list of data id
         self.transfer_data = None
+        self.transfer_size = 0
         self.transfer_path = None
         # set communication id
         self.communication_id = \
             f"{input_tile.task_id},{input_tile.tile_id}"+\
             f"->{output_tile.task_id},{output_tile.tile_id}"
 
+    def set_event_queue(self, event_queue):
+        """
+        set the event queue for the end time of the communication
+        """
+        self.event_queue = event_queue
+
+    def set_statistics_only(self, statistics_only):
+        """
+        set the statistics only mode, only accumulators are kept
+        """
+        self.statistics_only = statistics_only
+
+    def set_counters(self, counters):
+        """
+        set the counters registry
+        """
+        self.counters = counters
+
+    def set_trace(self, trace, trace_id):
+        """
+        set the trace writer, trace is None for no trace
+        """
+        self.trace = trace
+        self.trace_id = trace_id
+
+    def get_state(self):
+        """
+        get the mutable state of the communication, for the checkpoint
+        """
+        return {
+            "running_state": self.running_state,
+            "communication_end_time": self.communication_end_time,
+            "communication_range_time": list(self.communication_range_time),
+            "communication_busy_time": self.communication_busy_time,
+            "communication_count": self.communication_count,
+            "communication_min_time": self.communication_min_time,
+            "communication_max_time": self.communication_max_time,
+            "transfer_data": self.transfer_data,
+            "transfer_size": self.transfer_size,
+            "transfer_path": self.transfer_path,
+        }
+
+    def set_state(self, state):
+        """
+        set the mutable state of the communication, from the checkpoint
+        """
+        for key, value in state.items():
+            setattr(self, key, list(value) if isinstance(value, list) else value)
+
     def update(self, current_time):
         """
         since there may be multiple communication
@@ -56,11 +122,16 @@ class BaseCommunication(Component):
                 # PHASE COMMUNICATION END
                 # NO next communication
                 self.running_state = False
-                self.input_buffer.add_data_list(self.transfer_data, self.source_tile_id)
+                self.communication_end_time = float("inf")
+                self.input_buffer.add_data_list(
+                    self.transfer_data, self.source_tile_id, self.transfer_size
+                )
                 # clear transfer data path
                 self.wire_net.set_data_path_state(
                     self.transfer_path, False, self.communication_id, current_time
                 )
+                if self.trace is not None:
+                    self._record_trace(current_time, COMMUNICATION_END, WIRE_END)
 
     def check_communication_ready(self):
         """
@@ -71,9 +142,13 @@ class BaseCommunication(Component):
             return False
         # PHASE COMMUNICATION JUDGE
         self.transfer_data = self.output_buffer.next_transfer_data(self.target_tile_id)
-        if self.transfer_data is not None \
-            and self.input_buffer.check_enough_space(self.transfer_data, self.source_tile_id):
+        if self.transfer_data is None:
+            self.counters[counter.COMMUNICATION_NO_DATA] += 1
+            return False
+        self.transfer_size = self.input_tile.data_table.get_data_list_size(self.transfer_data)
+        if self.input_buffer.check_enough_space(self.transfer_size, self.source_tile_id):
             return True
+        self.counters[counter.COMMUNICATION_BLOCKED_SPACE] += 1
         return False
 
     def set_communication_task(self, current_time, trasnfer_path, transfer_time):
@@ -89,15 +164,44 @@ class BaseCommunication(Component):
         self.running_state = True
         self.transfer_path = trasnfer_path
         # set buffer
-        self.input_buffer.add_transfer_data_list(self.transfer_data, self.source_tile_id)
-        self.output_buffer.delete_data_list(self.transfer_data, self.target_tile_id)
+        self.input_buffer.add_transfer_data_list(
+            self.transfer_data, self.source_tile_id, self.transfer_size
+        )
+        self.output_buffer.delete_data_list(
+            self.transfer_data, self.target_tile_id, self.transfer_size
+        )
         # get transfet time
         self.communication_end_time = current_time + transfer_time
-        self.communication_range_time.append((current_time, self.communication_end_time))
+        self._record_communication(current_time, self.communication_end_time)
+        if self.event_queue is not None:
+            self.event_queue.push(self.communication_end_time, self)
         # set wire state, in schedule
         self.wire_net.set_data_path_state(self.transfer_path, True, self.communication_id, current_time)
+        if self.trace is not None:
+            self._record_trace(current_time, COMMUNICATION_START, WIRE_START)
         return None
 
+    def _record_trace(self, current_time, communication_event, wire_event):
+        """
+        record the communication event and the wire events on the path
+        """
+        self.trace.record(
+            current_time, communication_event, self.trace_id, self.transfer_data[0]
+        )
+        self.trace.record_path(current_time, wire_event, self.transfer_path, self.trace_id)
+
+    def _record_communication(self, start_time, end_time):
+        """
+        record the communication range, and the accumulators
+        """
+        if not self.statistics_only:
+            self.communication_range_time.append((start_time, end_time))
+        duration = end_time - start_time
+        self.communication_busy_time += duration
+        self.communication_count += 1
+        self.communication_min_time = min(self.communication_min_time, duration)
+        self.communication_max_time = max(self.communication_max_time, duration)
+
     def get_communication_end_time(self):
         """
         get the end time of the communication
@@ -111,8 +215,21 @@ class BaseCommunication(Component):
         """
         get the range of the communication
         """
+        assert not self.statistics_only, \
+            "communication range is not kept in the statistics only mode"
         return self.communication_range_time
 
+    def get_communication_statistics(self):
+        """
+        get the statistics of the communication
+        """
+        return {
+            "busy_time": self.communication_busy_time,
+            "count": self.communication_count,
+            "min_time": self.communication_min_time,
+            "max_time": self.communication_max_time,
+        }
+
     def check_finish(self):
         """
         check if the communication is finish
@@ -126,7 +243,4 @@ class BaseCommunication(Component):
         get the simulation result
         """
         self.check_finish()
-        communication_time = sum([
-            end - start for start, end in self.communication_range_time
-        ])
-        return communication_time * 1. / end_time
+        return self.communication_busy_time * 1. / end_time
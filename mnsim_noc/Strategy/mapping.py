@@ -10,15 +10,13 @@
     2022/05/07 20:43
 """
 import abc
-import copy
-from hashlib import new
-import random
+from mnsim_noc.utils import RegistryMeta
 from mnsim_noc.utils.component import Component
 from mnsim_noc.Tile import BaseTile
+from mnsim_noc.Buffer import DataTable
 from mnsim_noc.Wire import WireNet
 from mnsim_noc.Communication import BaseCommunication
-from numpy import sort
-from torch import rand
+from mnsim_noc.Strategy.placement import PlacementState
 
 class Mapping(Component):
     """
@@ -72,10 +70,13 @@ class Mapping(Component):
         # get position
         position_list = self._get_position_list(tile_behavior_list)
         self._check_position_list(position_list, tile_behavior_list)
-        # get tile list
+        # get tile list, data descriptors are interned in one data table
+        data_table = DataTable()
         tile_list = []
         for position, tile_behavior in zip(position_list, tile_behavior_list):
-            tile = BaseTile(position, self.image_num, self.buffer_size, tile_behavior)
+            tile = BaseTile(
+                position, self.image_num, self.buffer_size, tile_behavior, data_table
+            )
             tile_list.append(tile)
         # get wire net
         wire_net = WireNet((self.tile_row, self.tile_column), self.band_width)
@@ -89,28 +90,43 @@ class Mapping(Component):
                     and end_tile.tile_id in end_target_tile_id_list:
                     communication = BaseCommunication(start_tile, end_tile, wire_net)
                     communication_list.append(communication)
+        # precompute the routes of all communications
+        wire_net.route_table.build([
+            (communication.input_tile.position, communication.output_tile.position)
+            for communication in communication_list
+        ])
         return tile_list, communication_list, wire_net
 
+    def get_tile_communication(self, tile_list, communication_list):
+        """
+        get the input and output communication of each tile, key is id(tile)
+        """
+        tile_communication = dict((id(tile), ([], [])) for tile in tile_list)
+        for communication in communication_list:
+            tile_communication[id(communication.output_tile)][0].append(communication)
+            tile_communication[id(communication.input_tile)][1].append(communication)
+        return tile_communication
+
     def get_update_order(self, tile_list, communication_list):
         """
         get update order, first write the read
         """
+        tile_communication = self.get_tile_communication(tile_list, communication_list)
         update_module = []
-        communication_in_ids = []
+        communication_in_ids = set()
         for tile in tile_list:
+            input_communication, output_communication = tile_communication[id(tile)]
             # first, communication output tile is this tile
-            for communication in communication_list:
-                if communication.output_tile is tile and \
-                    id(communication) not in communication_in_ids:
-                    communication_in_ids.append(id(communication))
+            for communication in input_communication:
+                if id(communication) not in communication_in_ids:
+                    communication_in_ids.add(id(communication))
                     update_module.append(communication)
             # this tile
             update_module.append(tile)
             # last for the communication input tile is this tile
-            for communication in communication_list:
-                if communication.input_tile is tile and \
-                    id(communication) not in communication_in_ids:
-                    communication_in_ids.append(id(communication))
+            for communication in output_communication:
+                if id(communication) not in communication_in_ids:
+                    communication_in_ids.add(id(communication))
                     update_module.append(communication)
         return update_module
 
@@ -156,49 +172,48 @@ class SnakeMapping(Mapping):
         # return list
         return position_list[:len(tile_behavior_list)]
     
+def get_rank_list(tile_behavior_list):
+    """
+    get the links between the tiles, ranked by the transferred data amount
+    return: [((tile_id, target_tile_id), transfer_amount)]
+    """
+    data_dict = dict()
+    for tile_behavior in tile_behavior_list:
+        tile_id = tile_behavior["tile_id"]
+        target_tile_list = tile_behavior["target_tile_id"]
+        transfer_list = tile_behavior["dependence"]
+        transfer_amount = 0
+        for data in transfer_list:
+            outputs = data["output"]
+            for output in outputs:
+                transfer_amount += (output[3] - output[2]) * output[4]
+        for target_tile_id in target_tile_list:
+            if target_tile_id >= 0:
+                data_dict[(tile_id,target_tile_id)] = transfer_amount
+    return sorted(data_dict.items(),key=lambda s:s[1],reverse=True)
+
 class CommunicationWiseMapping(Mapping):
     """
     Communication-Wise mapping, designed to minimize the total communication
     """
     NAME = "commwise"
     
-    def get_nearest_pos(self, pos, map_list):
+    def get_nearest_pos(self, pos, placement):
         """
         get the nearest empty space
         Args:
             pos
-            map_list
+            placement
         """
-        for distance in range(1,self.tile_row+self.tile_column-1):
-            for loc in [(i+pos[0],distance-abs(i)+pos[1]) for i in range(-distance,distance)]+[(i+pos[0],abs(i)-distance+pos[1]) for i in range(distance,-distance,-1)]:
-                if 0<=loc[0]<self.tile_row and 0<=loc[1]<self.tile_column and map_list[loc[0]][loc[1]] == -1:
-                    return loc
+        return placement.get_nearest_free(pos)
     
-    def get_best_point(self, position_list):
+    def get_best_point(self, placement):
         """
-        get the most open point
+        get the most open point, the farthest from the mapped tiles and the border
         Args:
-            position_list
-            map_list
+            placement
         """
-        loc = None
-        wide = 0
-        for row in range(0,self.tile_row):
-            for column in range(0,self.tile_column):
-                pos_tmp = (row,column)
-                # already mapped
-                if pos_tmp in position_list:
-                    continue
-                # search in position_list
-                dis = min([self.tile_row-row,row+1,self.tile_column-column,column+1])
-                for pos in position_list:
-                    if pos:
-                        dis = min(dis,abs(pos[0]-row)+abs(pos[1]-column))
-                # update the best point
-                if dis > wide:
-                    loc = pos_tmp
-                    wide = dis
-        return loc
+        return placement.get_most_open()
     
     def _get_position_list(self, tile_behavior_list):
         """
@@ -209,30 +224,14 @@ class CommunicationWiseMapping(Mapping):
                 total data size transferred from tile[i] -> tile[j]
             rank_list: 
                 [((tile_id,target_tile_id),transfer_amount)]
-            map_list:
-                mesh[i][j] is reserved for tile x
+            placement:
+                free cells and distance field of the mesh
             position_list:
                 tile x is mapped to (i,j)
         """
         # rank the transferred data amount between tiles
-        data_dict = dict()
-        data_matrix = [[0]*len(tile_behavior_list) for _ in range(0,len(tile_behavior_list))]
-        for tile_behavior in tile_behavior_list:
-            tile_id = tile_behavior["tile_id"]
-            target_tile_list = tile_behavior["target_tile_id"]
-            transfer_list = tile_behavior["dependence"]
-            transfer_amount = 0
-            for data in transfer_list:
-                outputs = data["output"]
-                for output in outputs:
-                    transfer_amount += (output[3] - output[2]) * output[4]
-            for target_tile_id in target_tile_list:
-                if target_tile_id >= 0:
-                    data_dict[(tile_id,target_tile_id)] = transfer_amount
-                    data_matrix[tile_id][target_tile_id] = transfer_amount
-        # info for mapping
-        rank_list = sorted(data_dict.items(),key=lambda s:s[1],reverse=True)    #[((tile_id,target_tile_id),transfer_amount)]
-        map_list = [[-1]*self.tile_column for _ in range(0,self.tile_row)]
+        rank_list = get_rank_list(tile_behavior_list)
+        placement = PlacementState(self.tile_row, self.tile_column)
         position_list = [None]*len(tile_behavior_list)
         # try for the best mapping
         for link in rank_list:
@@ -242,176 +241,28 @@ class CommunicationWiseMapping(Mapping):
             pos_2 = position_list[tile_2]
             if pos_1:
                 if pos_2:
-                    # TODO: adjust the pos to ahieve lower communication latency
+                    # already mapped, adjusted by the anneal mapping
                     pass
                 else:
-                    loc = self.get_nearest_pos(pos_1, map_list)
+                    loc = self.get_nearest_pos(pos_1, placement)
                     position_list[tile_2] = loc
-                    map_list[loc[0]][loc[1]] = tile_2
+                    placement.place(loc)
             else:
                 if pos_2:
-                    loc = self.get_nearest_pos(pos_2, map_list)
+                    loc = self.get_nearest_pos(pos_2, placement)
                     position_list[tile_1] = loc
-                    map_list[loc[0]][loc[1]] = tile_1
+                    placement.place(loc)
                 else:
                     # map the first tile on the best point
-                    loc_1 = self.get_best_point(position_list)
+                    loc_1 = self.get_best_point(placement)
                     position_list[tile_1] = loc_1
-                    map_list[loc_1[0]][loc_1[1]] = tile_1
+                    placement.place(loc_1)
                     # map the second tile on the nearest place
-                    loc_2 = self.get_nearest_pos(loc_1, map_list)
+                    loc_2 = self.get_nearest_pos(loc_1, placement)
                     position_list[tile_2] = loc_2
-                    map_list[loc_2[0]][loc_2[1]] = tile_2
+                    placement.place(loc_2)
         return position_list
 
-# class for individuals and its behaviour
-class Individual:
-    def __init__(self, tile_row, tile_column, tile_num, rank_list):
-        self.tile_row = tile_row
-        self.tile_column = tile_column
-        self.tile_num = tile_num
-        self.total_comm = 0
-        self.rank_list = rank_list
-        self.map_list = [[-1]*self.tile_column for _ in range(0,self.tile_row)]
-        self.position_list = [None]*tile_num
-    # tool fuctions for mapping
-    def get_nearest_pos(self, pos, map_list):
-        for distance in range(1,self.tile_row+self.tile_column-1):
-            for loc in [(i+pos[0],distance-abs(i)+pos[1]) for i in range(-distance,distance)]+[(i+pos[0],abs(i)-distance+pos[1]) for i in range(distance,-distance,-1)]:
-                if 0<=loc[0]<self.tile_row and 0<=loc[1]<self.tile_column and map_list[loc[0]][loc[1]] == -1:
-                    return loc
-    def get_random_point(self, position_list):
-        """
-        get a random point
-        """
-        loc_list = []
-        for row in range(0,self.tile_row):
-            for column in range(0,self.tile_column):
-                pos_tmp = (row,column)
-                # already mapped
-                if pos_tmp in position_list:
-                    continue
-                loc_list.append(pos_tmp)
-        # random choose
-        loc = loc_list[random.randint(0,len(loc_list)-1)]
-        return loc
-    # rendom initialize
-    def random_mapping(self):
-        for link in self.rank_list:
-            tile_1 = link[0][0]
-            tile_2 = link[0][1]
-            pos_1 = self.position_list[tile_1]
-            pos_2 = self.position_list[tile_2]
-            if pos_1:
-                if pos_2:
-                    continue
-                else:
-                    loc = self.get_nearest_pos(pos_1, self.map_list)
-                    self.position_list[tile_2] = loc
-                    self.map_list[loc[0]][loc[1]] = tile_2
-            else:
-                if pos_2:
-                    loc = self.get_nearest_pos(pos_2, self.map_list)
-                    self.position_list[tile_1] = loc
-                    self.map_list[loc[0]][loc[1]] = tile_1
-                else:
-                    # map the first tile on the best point
-                    loc_1 = self.get_random_point(self.position_list)
-                    self.position_list[tile_1] = loc_1
-                    self.map_list[loc_1[0]][loc_1[1]] = tile_1
-                    # map the second tile on the nearest place
-                    loc_2 = self.get_nearest_pos(loc_1, self.map_list)
-                    self.position_list[tile_2] = loc_2
-                    self.map_list[loc_2[0]][loc_2[1]] = tile_2
-    # mutation
-    def mutation_exchange(self, parent):
-        pass
-    def mutation_reverse(self, parent):
-        pass
-    def mutation_insert(self, parent):
-        pass
-    def mutation_remap(self, parent):
-        self.map_list = copy.deepcopy(parent.map_list)
-        self.position_list = copy.deepcopy(parent.position_list)
-        cut_place = random.randint(0,self.tile_num-1)
-        for tile_id in range(cut_place,self.tile_num):
-            loc = self.position_list[tile_id]
-            self.map_list[loc[0]][loc[1]] = -1
-            self.position_list[tile_id] = None
-        self.random_mapping()
-    # crossover
-    def crossover(self, parent1, parent2):
-        pass
-    # update total comm
-    def update_total_comm(self):
-        total_comm = 0
-        for link in self.rank_list:
-            tile_1 = link[0][0]
-            tile_2 = link[0][1]
-            pos_1 = self.position_list[tile_1]
-            pos_2 = self.position_list[tile_2]
-            comm = link[1]
-            total_comm += comm * (abs(pos_1[0]-pos_2[0])+abs(pos_1[1]-pos_2[1]))
-        self.total_comm = total_comm
-
-class NSGA_II(Mapping):
-    """
-    NSGA_II Mapping algorithm
-    """
-    NAME = "nsga2"
-    def _get_position_list(self, tile_behavior_list):
-        # rank the transferred data amount between tiles
-        data_dict = dict()
-        data_matrix = [[0]*len(tile_behavior_list) for _ in range(0,len(tile_behavior_list))]
-        for tile_behavior in tile_behavior_list:
-            tile_id = tile_behavior["tile_id"]
-            target_tile_list = tile_behavior["target_tile_id"]
-            transfer_list = tile_behavior["dependence"]
-            transfer_amount = 0
-            for data in transfer_list:
-                outputs = data["output"]
-                for output in outputs:
-                    transfer_amount += (output[3] - output[2]) * output[4]
-            for target_tile_id in target_tile_list:
-                if target_tile_id >= 0:
-                    data_dict[(tile_id,target_tile_id)] = transfer_amount
-                    data_matrix[tile_id][target_tile_id] = transfer_amount
-        # info for mapping
-        rank_list = sorted(data_dict.items(),key=lambda s:s[1],reverse=True)    #[((tile_id,target_tile_id),transfer_amount)]
-        tile_num = len(tile_behavior_list)
-        # 0.parameters
-        N = 200
-        maxGEN = 200
-        # crossover_probability = 0.9
-        mutation_probability = 0.7
-        # 1.random initialize
-        population = []
-        for i in range(0,N):
-            individual = Individual(self.tile_row,self.tile_column,tile_num,rank_list)
-            individual.random_mapping()
-            individual.update_total_comm()
-            population.append(individual)
-        # 2.first generation child
-        # 2.1 tournament
-        # 2.2 crossover/mutation
-        # 3.repeated evolution
-        for round in range(0,maxGEN):
-            child=[]
-            for individual in population:
-                # if mutation happens
-                if random.random() < mutation_probability:
-                    new_child = Individual(self.tile_row,self.tile_column,tile_num,rank_list)
-                    new_child.mutation_remap(individual)
-                    new_child.update_total_comm()
-                    child.append(new_child)
-            elete = sorted(population+child,key=lambda s:s.total_comm)
-            population = elete[:N]
-            # print('min comm:'+str(population[0].total_comm))
-        # 3.1 tournament
-        # 3.2 crossover/mutation
-        # 3.3 elete choice
-        # 4 choose the best mapping result
-        position_list = population[0].position_list
-        self.logger.info('final min comm:'+str(population[0].total_comm))
-        # return list
-        return position_list
\ No newline at end of file
+# search based mapping, imported when first used, with numpy and multiprocessing
+RegistryMeta.register_lazy("mapping", "nsga2", "mnsim_noc.Strategy.search_mapping")
+RegistryMeta.register_lazy("mapping", "anneal", "mnsim_noc.Strategy.search_mapping")
@@ -0,0 +1,156 @@
+#-*-coding:utf-8-*-
+"""
+@FileName:
+    placement.py
+@Description:
+    placement state of the tiles on the grid, for the mapping strategies
+@CreateTime:
+    2026/10/18 21:10
+"""
+import itertools
+
+# ring offset table for each grid shape
+_ring_offset_dict = {}
+
+def get_ring_offset(tile_row, tile_column):
+    """
+    get the offsets of the manhattan rings from distance 1 to the farthest, in search order
+    the order is the same as the nearest position search of the mapping
+    """
+    shape = (tile_row, tile_column)
+    if shape not in _ring_offset_dict:
+        ring_offset = []
+        for distance in range(1, tile_row + tile_column - 1):
+            ring_offset.extend(
+                [(i, distance - abs(i)) for i in range(-distance, distance)] + \
+                [(i, abs(i) - distance) for i in range(distance, -distance, -1)]
+            )
+        _ring_offset_dict[shape] = ring_offset
+    return _ring_offset_dict[shape]
+
+class PlacementState(object):
+    """
+    placement state of the grid
+    free is the bitmap of the free cells, index is row * tile_column + column
+    distance is the field of the distance to the nearest occupied cell or out of the grid,
+    built on the first query and updated incrementally on the placement
+    """
+    def __init__(self, tile_row, tile_column):
+        self.tile_row = tile_row
+        self.tile_column = tile_column
+        self.free = bytearray(b"\x01") * (tile_row * tile_column)
+        self.free_number = tile_row * tile_column
+        self.distance = None
+
+    def copy(self):
+        """
+        copy the state
+        """
+        placement = PlacementState.__new__(PlacementState)
+        placement.tile_row = self.tile_row
+        placement.tile_column = self.tile_column
+        placement.free = bytearray(self.free)
+        placement.free_number = self.free_number
+        placement.distance = None if self.distance is None else list(self.distance)
+        return placement
+
+    def is_free(self, loc):
+        """
+        check the loc is free
+        """
+        return self.free[loc[0] * self.tile_column + loc[1]] == 1
+
+    def place(self, loc):
+        """
+        occupy the loc, the distance field is updated from the loc
+        """
+        index = loc[0] * self.tile_column + loc[1]
+        assert self.free[index] == 1, f"{loc} is already occupied"
+        self.free[index] = 0
+        self.free_number -= 1
+        if self.distance is None:
+            return None
+        # the field is 1-lipschitz, so the improved cells are connected to the loc
+        self.distance[index] = 0
+        queue = [loc]
+        for row, column in queue:
+            for next_row, next_column in [
+                (row - 1, column), (row + 1, column), (row, column - 1), (row, column + 1)
+            ]:
+                if 0 <= next_row < self.tile_row and 0 <= next_column < self.tile_column:
+                    next_index = next_row * self.tile_column + next_column
+                    next_distance = abs(next_row - loc[0]) + abs(next_column - loc[1])
+                    if next_distance < self.distance[next_index]:
+                        self.distance[next_index] = next_distance
+                        queue.append((next_row, next_column))
+        return None
+
+    def remove(self, loc):
+        """
+        free the loc, the distance field is rebuilt on the next query
+        """
+        index = loc[0] * self.tile_column + loc[1]
+        assert self.free[index] == 0, f"{loc} is already free"
+        self.free[index] = 1
+        self.free_number += 1
+        self.distance = None
+
+    def _build_distance(self):
+        """
+        build the distance field, two pass transform from the border and occupied cells
+        """
+        distance = [0] * (self.tile_row * self.tile_column)
+        for row in range(self.tile_row):
+            for column in range(self.tile_column):
+                index = row * self.tile_column + column
+                if self.free[index] == 1:
+                    distance[index] = min(self.tile_row - row, row + 1,
+                        self.tile_column - column, column + 1
+                    )
+        for row in range(self.tile_row):
+            for column in range(self.tile_column):
+                index = row * self.tile_column + column
+                if row > 0:
+                    distance[index] = min(distance[index], distance[index - self.tile_column] + 1)
+                if column > 0:
+                    distance[index] = min(distance[index], distance[index - 1] + 1)
+        for row in range(self.tile_row - 1, -1, -1):
+            for column in range(self.tile_column - 1, -1, -1):
+                index = row * self.tile_column + column
+                if row < self.tile_row - 1:
+                    distance[index] = min(distance[index], distance[index + self.tile_column] + 1)
+                if column < self.tile_column - 1:
+                    distance[index] = min(distance[index], distance[index + 1] + 1)
+        self.distance = distance
+
+    def get_nearest_free(self, pos):
+        """
+        get the nearest free loc to the pos, searched on the precomputed rings
+        """
+        for row_offset, column_offset in get_ring_offset(self.tile_row, self.tile_column):
+            row = pos[0] + row_offset
+            column = pos[1] + column_offset
+            if 0 <= row < self.tile_row and 0 <= column < self.tile_column \
+                and self.free[row * self.tile_column + column] == 1:
+                return (row, column)
+        return None
+
+    def get_free(self, index):
+        """
+        get the index-th free loc in the row major order
+        """
+        free_index = next(itertools.islice(
+            itertools.compress(range(len(self.free)), self.free), index, None
+        ))
+        return divmod(free_index, self.tile_column)
+
+    def get_most_open(self):
+        """
+        get the first free loc with the largest distance, None if there is no free loc
+        """
+        if self.distance is None:
+            self._build_distance()
+        index = max(range(len(self.distance)), key=self.distance.__getitem__)
+        if self.distance[index] == 0:
+            return None
+        return divmod(index, self.tile_column)
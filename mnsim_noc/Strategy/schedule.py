@@ -11,7 +11,7 @@
 """
 import abc
 from mnsim_noc.utils.component import Component
-from mnsim_noc.Wire.wire_net import _get_map_key
+from mnsim_noc.utils import counter
 
 class Schedule(Component):
     """
@@ -22,29 +22,75 @@ class Schedule(Component):
         super(Schedule, self).__init__()
         self.communication_list = communication_list
         self.wire_net = wire_net
-        self.all_wire_state = {}
+        # wakeup communication, all communications at the beginning
+        self.communication_index = dict(
+            (id(communication), i) for i, communication in enumerate(communication_list)
+        )
+        self.wakeup_set = set(range(len(communication_list)))
+        # counters, shared by the array
+        self.counters = counter.Counters()
+
+    def set_counters(self, counters):
+        """
+        set the counters registry
+        """
+        self.counters = counters
+
+    def wakeup(self, communication):
+        """
+        wakeup the communication, it may be ready on the next schedule
+        """
+        self.wakeup_set.add(self.communication_index[id(communication)])
+
+    def get_state(self):
+        """
+        get the mutable state of the schedule, for the checkpoint
+        """
+        return {"wakeup_set": sorted(self.wakeup_set)}
+
+    def set_state(self, state):
+        """
+        set the mutable state of the schedule, from the checkpoint
+        """
+        self.wakeup_set = set(state["wakeup_set"])
 
     @abc.abstractmethod
-    def _get_transfer_path_list(self, communication_ready_flag):
+    def _get_transfer_path_list(self, communication_ready_list):
         """
         get transfer path list, and transfer time list
+        communication_ready_list is the index of the ready communication
         """
         raise NotImplementedError
 
     def schedule(self, current_time):
         """
         schedule the communication
+        only the wakeup communications are checked, in the index order
+        running communications are kept to be checked after they end
         """
-        # get communication flag
-        communication_ready_flag = [communication.check_communication_ready()
-            for communication in self.communication_list
-        ]
+        self.counters[counter.SCHEDULE] += 1
+        self.counters[counter.SCHEDULE_CHECK] += len(self.wakeup_set)
+        communication_ready_list = []
+        for i in sorted(self.wakeup_set):
+            communication = self.communication_list[i]
+            if communication.running_state:
+                continue
+            if communication.check_communication_ready():
+                communication_ready_list.append(i)
+            else:
+                self.wakeup_set.discard(i)
         transfer_path_list, transfer_time_list = \
-            self._get_transfer_path_list(communication_ready_flag)
-        # set task
-        for transfer_path, transfer_time, communication in \
-            zip(transfer_path_list, transfer_time_list, self.communication_list):
-            communication.set_communication_task(current_time, transfer_path, transfer_time)
+            self._get_transfer_path_list(communication_ready_list)
+        # set task, the ready communication without path is blocked by the wire
+        for transfer_path, transfer_time, i in \
+            zip(transfer_path_list, transfer_time_list, communication_ready_list):
+            if transfer_path is None:
+                self.counters[counter.TRANSFER_BLOCKED_WIRE] += 1
+            else:
+                self.counters[counter.TRANSFER_START] += 1
+            self.communication_list[i].set_communication_task(
+                current_time, transfer_path, transfer_time
+            )
 
 class NaiveSchedule(Schedule):
     """
@@ -53,67 +99,42 @@ class NaiveSchedule(Schedule):
     NAME = "naive"
     def __init__(self, communication_list, wire_net):
         """
-        initialize the schedule with cache
+        initialize the schedule with the route of each communication
         """
         super(NaiveSchedule, self).__init__(communication_list, wire_net)
-        self.path_cache = {} # cache the communication path
+        self.route_table = self.wire_net.route_table
+        self.route_id_list = [
+            self.route_table.get_route_id(
+                communication.input_tile.position, communication.output_tile.position
+            ) for communication in self.communication_list
+        ]
 
-    def _get_transfer_path_list(self, communication_ready_flag):
+    def _get_transfer_path_list(self, communication_ready_list):
         """
         get transfer path list
         """
         # naive schedule
         transfer_path_list = []
         transfer_time_list = []
-        # get used wire state
-        for i, ready_flag in enumerate(communication_ready_flag):
-            if ready_flag:
-                transfer_path, transfer_path_str = self._get_naive_path(i)
-                self.wire_net.get_all_wire_state(self.all_wire_state, transfer_path_str)
+        # get used wire state, bitmask over the wire index
+        wire_state_mask = self.wire_net.get_wire_state_mask()
         # judge
-        for i, ready_flag in enumerate(communication_ready_flag):
-            if ready_flag:
-                transfer_path, transfer_path_str = self._get_naive_path(i)
-                if not any([self.all_wire_state[key] for key in transfer_path_str]):
-                    # add transfer path to list
-                    transfer_path_list.append(transfer_path)
-                    # set transfer time
-                    transfer_time_list.append(
-                        self.wire_net.get_wire_transfer_time(
-                            transfer_path, self.communication_list[i].transfer_data
-                        )
+        for i in communication_ready_list:
+            route_id = self.route_id_list[i]
+            transfer_path_mask = self.route_table.route_mask[route_id]
+            if wire_state_mask & transfer_path_mask == 0:
+                # add transfer path to list
+                transfer_path_list.append(self.route_table.route_index[route_id])
+                # set transfer time
+                transfer_time_list.append(
+                    self.route_table.get_transfer_time(
+                        route_id, self.communication_list[i].transfer_size
                     )
-                    # update all wire state
-                    for key in transfer_path_str:
-                        self.all_wire_state[key] = not self.wire_net.transparent_flag
-                    continue
+                )
+                # update used wire state
+                if not self.wire_net.transparent_flag:
+                    wire_state_mask |= transfer_path_mask
+                continue
             transfer_path_list.append(None)
             transfer_time_list.append(None)
         return transfer_path_list, transfer_time_list
-
-    def _get_naive_path(self, i):
-        """
-        get naive path
-        """
-        # use cache path
-        if str(i) in self.path_cache:
-            return self.path_cache[str(i)]
-        # ge path
-        start_position = self.communication_list[i].input_tile.position
-        end_position = self.communication_list[i].output_tile.position
-        assert start_position != end_position
-        current_position = [start_position[0], start_position[1]]
-        path = []
-        while True:
-            path.append(tuple(current_position))
-            # first left or right
-            if current_position[1] != end_position[1]:
-                current_position[1] += 1 if current_position[1] < end_position[1] else -1
-            elif current_position[0] != end_position[0]:
-                current_position[0] += 1 if current_position[0] < end_position[0] else -1
-            else:
-                break
-        navie_path = [(path[i], path[i+1]) for i in range(len(path)-1)] # get wire
-        navie_path_str = [_get_map_key(path) for path in navie_path] # get map key
-        self.path_cache[str(i)] = (navie_path, navie_path_str) # cache path
-        return self.path_cache[str(i)]
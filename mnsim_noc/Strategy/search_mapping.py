@@ -0,0 +1,698 @@
+#-*-coding:utf-8-*-
+"""
+@FileName:
+    search_mapping.py
+@Description:
+    search based mapping strategies, nsga2 and anneal,
+    registered lazily in mapping.py
+@CreateTime:
+    2026/10/18 23:40
+"""
+import math
+import multiprocessing
+import random
+import time
+import numpy as np
+from mnsim_noc.Wire.link_load import get_link_load
+from mnsim_noc.Strategy.mapping import Mapping, CommunicationWiseMapping, get_rank_list
+from mnsim_noc.Strategy.placement import PlacementState
+
+def get_tile_link_list(tile_num, rank_list):
+    """
+    get the links of each tile, list of (other tile, volume), for both ends
+    """
+    tile_link_list = [[] for _ in range(tile_num)]
+    for (tile_1, tile_2), comm in rank_list:
+        tile_link_list[tile_1].append((tile_2, comm))
+        tile_link_list[tile_2].append((tile_1, comm))
+    return tile_link_list
+
+# class for individuals and its behaviour
+class Individual:
+    """
+    individual of the mapping
+    position_list is the position of each tile
+    slot_list is the permutation encoding of all the grid slots (row * column + column),
+    the slot of the tile i is slot_list[i], the rest are the free slots
+    total_comm is None if not evaluated, max_load is the max wire load for the comm_load
+    selection_key is set on the selection, smaller is better for the tournament
+    """
+    def __init__(self, tile_row, tile_column, tile_num, rank_list, rng=None,
+        tile_link_list=None
+    ):
+        # rng is the random.Random of the island, the global random by default
+        self.rng = random if rng is None else rng
+        self.tile_row = tile_row
+        self.tile_column = tile_column
+        self.tile_num = tile_num
+        self.total_comm = None
+        self.max_load = None
+        self.selection_key = None
+        self.rank_list = rank_list
+        self.tile_link_list = get_tile_link_list(tile_num, rank_list) \
+            if tile_link_list is None else tile_link_list
+        self.placement = PlacementState(tile_row, tile_column)
+        self.position_list = [None]*tile_num
+        self.slot_list = None
+    def _new_individual(self):
+        """
+        get a new empty individual with the same context
+        """
+        return Individual(self.tile_row, self.tile_column, self.tile_num,
+            self.rank_list, self.rng, self.tile_link_list
+        )
+    def get_slot_list(self):
+        """
+        get the permutation encoding, the free slots are in ascending order
+        """
+        if self.slot_list is None:
+            tile_slot = [row*self.tile_column+column for row, column in self.position_list]
+            mapped_set = set(tile_slot)
+            self.slot_list = tile_slot + [slot
+                for slot in range(self.tile_row*self.tile_column) if slot not in mapped_set
+            ]
+        return self.slot_list
+    def set_slot_list(self, slot_list):
+        """
+        set the permutation encoding, the position list and the placement are rebuilt
+        """
+        self.slot_list = slot_list
+        self.position_list = [divmod(slot, self.tile_column)
+            for slot in slot_list[:self.tile_num]
+        ]
+        for loc in self.position_list:
+            self.placement.place(loc)
+    def _set_move(self, parent, slot_list, start, end):
+        """
+        set the slot list after a local move of the parent
+        only tiles in [start, end) may be moved, the total comm is updated incrementally
+        """
+        self.set_slot_list(slot_list)
+        changed_tile_list = [tile_id for tile_id in range(start, min(end, self.tile_num))
+            if slot_list[tile_id] != parent.slot_list[tile_id]
+        ]
+        # too many tiles moved, evaluated with the whole population
+        if parent.total_comm is None or 2 * len(changed_tile_list) > self.tile_num:
+            self.total_comm = None
+            return None
+        changed_tile_set = set(changed_tile_list)
+        delta = 0
+        for tile_id in changed_tile_list:
+            old_1, new_1 = parent.position_list[tile_id], self.position_list[tile_id]
+            for other, comm in self.tile_link_list[tile_id]:
+                # links inside the moved tiles are counted once
+                if other in changed_tile_set and other < tile_id:
+                    continue
+                old_2, new_2 = parent.position_list[other], self.position_list[other]
+                delta += comm * (abs(new_1[0]-new_2[0]) + abs(new_1[1]-new_2[1]) - \
+                    abs(old_1[0]-old_2[0]) - abs(old_1[1]-old_2[1]))
+        self.total_comm = parent.total_comm + delta
+        return None
+    def set_position_list(self, position_list):
+        """
+        set the position list, the placement is rebuilt
+        """
+        self.position_list = [tuple(position) for position in position_list]
+        for loc in self.position_list:
+            self.placement.place(loc)
+    # tool fuctions for mapping
+    def get_nearest_pos(self, pos, placement):
+        return placement.get_nearest_free(pos)
+    def get_random_point(self, placement):
+        """
+        get a random free point
+        """
+        return placement.get_free(self.rng.randint(0,placement.free_number-1))
+    # rendom initialize
+    def random_mapping(self):
+        for link in self.rank_list:
+            tile_1 = link[0][0]
+            tile_2 = link[0][1]
+            pos_1 = self.position_list[tile_1]
+            pos_2 = self.position_list[tile_2]
+            if pos_1:
+                if pos_2:
+                    continue
+                else:
+                    loc = self.get_nearest_pos(pos_1, self.placement)
+                    self.position_list[tile_2] = loc
+                    self.placement.place(loc)
+            else:
+                if pos_2:
+                    loc = self.get_nearest_pos(pos_2, self.placement)
+                    self.position_list[tile_1] = loc
+                    self.placement.place(loc)
+                else:
+                    # map the first tile on the best point
+                    loc_1 = self.get_random_point(self.placement)
+                    self.position_list[tile_1] = loc_1
+                    self.placement.place(loc_1)
+                    # map the second tile on the nearest place
+                    loc_2 = self.get_nearest_pos(loc_1, self.placement)
+                    self.position_list[tile_2] = loc_2
+                    self.placement.place(loc_2)
+    # mutation
+    def mutation_exchange(self, parent):
+        """
+        swap the slot of a tile with another tile or a free slot
+        """
+        slot_list = list(parent.get_slot_list())
+        i = self.rng.randrange(self.tile_num)
+        j = self.rng.randrange(len(slot_list) - 1)
+        j = j + 1 if j >= i else j
+        slot_list[i], slot_list[j] = slot_list[j], slot_list[i]
+        self._set_move(parent, slot_list, min(i, j), max(i, j) + 1)
+    def mutation_reverse(self, parent):
+        """
+        reverse a segment of the permutation, starting from a tile
+        """
+        slot_list = list(parent.get_slot_list())
+        i = self.rng.randrange(self.tile_num)
+        j = self.rng.randrange(i + 1, len(slot_list) + 1)
+        slot_list[i:j] = slot_list[i:j][::-1]
+        self._set_move(parent, slot_list, i, j)
+    def mutation_insert(self, parent):
+        """
+        move the slot of a tile to another place of the permutation
+        """
+        slot_list = list(parent.get_slot_list())
+        i = self.rng.randrange(self.tile_num)
+        j = self.rng.randrange(len(slot_list))
+        slot_list.insert(j, slot_list.pop(i))
+        self._set_move(parent, slot_list, min(i, j), max(i, j) + 1)
+    def mutation_remap(self, parent):
+        self.placement = parent.placement.copy()
+        self.position_list = list(parent.position_list)
+        cut_place = self.rng.randint(0,self.tile_num-1)
+        for tile_id in range(cut_place,self.tile_num):
+            self.placement.remove(self.position_list[tile_id])
+            self.position_list[tile_id] = None
+        self.random_mapping()
+    # crossover
+    def crossover(self, parent1, parent2, method="ox"):
+        """
+        crossover on the permutation encoding
+        the segment is from parent1, the rest is from parent2
+        ox keeps the order of parent2, pmx keeps the place of parent2 if possible
+        """
+        assert method in CROSSOVER_METHOD_LIST, f"crossover method {method} is not supported"
+        slot_list_1 = parent1.get_slot_list()
+        slot_list_2 = parent2.get_slot_list()
+        length = len(slot_list_1)
+        start = self.rng.randrange(self.tile_num)
+        end = self.rng.randrange(start + 1, length + 1)
+        segment_set = set(slot_list_1[start:end])
+        slot_list = [None] * length
+        slot_list[start:end] = slot_list_1[start:end]
+        if method == "ox":
+            rest = [slot for slot in slot_list_2[end:] + slot_list_2[:end]
+                if slot not in segment_set
+            ]
+            for index, slot in zip(list(range(end, length)) + list(range(0, start)), rest):
+                slot_list[index] = slot
+        else:
+            index_1 = dict((slot, index) for index, slot in enumerate(slot_list_1))
+            for index in list(range(0, start)) + list(range(end, length)):
+                slot = slot_list_2[index]
+                while slot in segment_set:
+                    slot = slot_list_2[index_1[slot]]
+                slot_list[index] = slot
+        self.set_slot_list(slot_list)
+    # update total comm
+    def update_total_comm(self):
+        total_comm = 0
+        for link in self.rank_list:
+            tile_1 = link[0][0]
+            tile_2 = link[0][1]
+            pos_1 = self.position_list[tile_1]
+            pos_2 = self.position_list[tile_2]
+            comm = link[1]
+            total_comm += comm * (abs(pos_1[0]-pos_2[0])+abs(pos_1[1]-pos_2[1]))
+        self.total_comm = total_comm
+
+def get_link_array(rank_list):
+    """
+    get the source, target and volume array of the links from the rank list
+    """
+    link_source = np.array([link[0][0] for link in rank_list], dtype=np.int64)
+    link_target = np.array([link[0][1] for link in rank_list], dtype=np.int64)
+    link_volume = np.array([link[1] for link in rank_list], dtype=np.int64)
+    return link_source, link_target, link_volume
+
+def get_population_comm(position, link_source, link_target, link_volume):
+    """
+    get the total comm of each individual in one expression
+    position: population x tiles x 2 array of the tile positions
+    return: population array of the sum of volume x manhattan distance
+    """
+    distance = np.abs(position[:, link_source, :] - position[:, link_target, :]).sum(axis=2)
+    return distance @ link_volume
+
+# context of the islands in the worker, set by _init_island
+_island_context = None
+
+CROSSOVER_PROBABILITY = 0.9
+CROSSOVER_METHOD_LIST = ["ox", "pmx"]
+MUTATION_PROBABILITY = 0.7
+MUTATION_METHOD_LIST = [
+    "mutation_exchange", "mutation_reverse", "mutation_insert", "mutation_remap"
+]
+
+OBJECTIVE_LIST = ["comm", "comm_load"]
+
+def get_non_dominated_rank(objective):
+    """
+    non dominated sorting, all objectives are minimized
+    objective: population x objective number array
+    return: the front rank of each individual, 0 for the pareto front
+    """
+    objective = np.asarray(objective, dtype=np.float64)
+    # dominate[i, j] is True if i dominates j
+    dominate = np.all(objective[:, np.newaxis, :] <= objective[np.newaxis, :, :], axis=2) & \
+        np.any(objective[:, np.newaxis, :] < objective[np.newaxis, :, :], axis=2)
+    count = dominate.sum(axis=0)
+    rank = np.zeros(len(objective), dtype=np.int64)
+    front = np.flatnonzero(count == 0)
+    current_rank = 0
+    while len(front) > 0:
+        rank[front] = current_rank
+        count[front] = -1
+        count = count - dominate[front].sum(axis=0)
+        front = np.flatnonzero(count == 0)
+        current_rank += 1
+    return rank
+
+def get_crowding_distance(objective, rank):
+    """
+    crowding distance in each front, the boundary individuals are inf
+    """
+    objective = np.asarray(objective, dtype=np.float64)
+    distance = np.zeros(len(objective))
+    for front_rank in np.unique(rank).tolist():
+        index = np.flatnonzero(rank == front_rank)
+        if len(index) <= 2:
+            distance[index] = np.inf
+            continue
+        for value in objective[index].T:
+            order = np.argsort(value, kind="stable")
+            distance[index[order[0]]] = distance[index[order[-1]]] = np.inf
+            span = value[order[-1]] - value[order[0]]
+            if span > 0:
+                distance[index[order[1:-1]]] += (value[order[2:]] - value[order[:-2]]) / span
+    return distance
+
+def _get_objective(individual, objective):
+    """
+    get the objective tuple of the individual
+    """
+    if objective == "comm":
+        return (individual.total_comm,)
+    return (individual.total_comm, individual.max_load)
+
+def _evaluate_population(population, context):
+    """
+    evaluate the individuals not evaluated, in one expression
+    comm is the total comm, comm_load also the max wire load of the XY routes
+    """
+    tile_row, tile_column, _, _, objective, link_source, link_target, link_volume = context
+    if objective == "comm":
+        population = [individual for individual in population
+            if individual.total_comm is None
+        ]
+    else:
+        population = [individual for individual in population
+            if individual.max_load is None
+        ]
+    if len(population) == 0:
+        return None
+    position = np.array([individual.position_list for individual in population],
+        dtype=np.int64).reshape(len(population), -1, 2)
+    if objective == "comm":
+        total_comm = get_population_comm(position, link_source, link_target, link_volume)
+        for individual, comm in zip(population, total_comm.tolist()):
+            individual.total_comm = comm
+        return None
+    load = get_link_load(position, link_source, link_target, link_volume,
+        (tile_row, tile_column)
+    )
+    for individual, total, max_load in zip(population,
+        load.sum(axis=1).tolist(), load.max(axis=1).tolist()
+    ):
+        individual.total_comm = int(round(total))
+        individual.max_load = max_load
+    return None
+
+def _select_population(population, population_size, objective):
+    """
+    select the population, sorted from the best
+    comm: elete choice on the total comm, stable sort to keep the parent first on tie
+    comm_load: non dominated rank, then the larger crowding distance
+    """
+    if objective == "comm":
+        population = sorted(population,key=lambda s:s.total_comm)[:population_size]
+        for individual in population:
+            individual.selection_key = individual.total_comm
+        return population
+    value = np.array([_get_objective(individual, objective) for individual in population])
+    rank = get_non_dominated_rank(value)
+    distance = get_crowding_distance(value, rank)
+    order = np.lexsort((-distance, rank))[:population_size].tolist()
+    for index in order:
+        population[index].selection_key = (int(rank[index]), -float(distance[index]))
+    return [population[index] for index in order]
+
+def _init_island(context):
+    """
+    set the island context in the worker
+    context: (tile_row, tile_column, tile_num, rank_list, objective)
+    """
+    global _island_context
+    _island_context = context + get_link_array(context[3])
+
+def _evolve_island(island_state):
+    """
+    evolve one island for some generations
+    island_state: (seed, rng_state, position_list_list, population_size, generation)
+        rng_state and position_list_list are None for the random initialization
+    return: (rng_state, position_list_list, objective_list), sorted from the best
+    """
+    tile_row, tile_column, tile_num, rank_list, objective = _island_context[:5]
+    seed, rng_state, position_list_list, population_size, generation = island_state
+    rng = random.Random(seed)
+    if rng_state is not None:
+        rng.setstate(rng_state)
+    tile_link_list = get_tile_link_list(tile_num, rank_list)
+    # 1.random initialize, or the population from the last epoch
+    population = []
+    for i in range(0,population_size):
+        individual = Individual(tile_row,tile_column,tile_num,rank_list,rng,tile_link_list)
+        if position_list_list is None:
+            individual.random_mapping()
+        else:
+            individual.set_position_list(position_list_list[i])
+        population.append(individual)
+    _evaluate_population(population, _island_context)
+    population = _select_population(population, population_size, objective)
+    # 2.repeated evolution
+    for round in range(0,generation):
+        child=[]
+        for individual in population:
+            new_child = None
+            # 2.1 tournament and crossover
+            if rng.random() < CROSSOVER_PROBABILITY:
+                mate = min(rng.sample(population, 2), key=lambda s:s.selection_key)
+                new_child = individual._new_individual()
+                new_child.crossover(individual, mate, rng.choice(CROSSOVER_METHOD_LIST))
+            # 2.2 mutation, on the crossover child if any
+            if rng.random() < MUTATION_PROBABILITY:
+                parent = individual if new_child is None else new_child
+                new_child = individual._new_individual()
+                getattr(new_child, rng.choice(MUTATION_METHOD_LIST))(parent)
+            if new_child is not None:
+                child.append(new_child)
+        # evaluate the children not updated incrementally, at once
+        _evaluate_population(child, _island_context)
+        # 3.selection
+        population = _select_population(population+child, population_size, objective)
+    return (
+        rng.getstate(),
+        [individual.position_list for individual in population],
+        [_get_objective(individual, objective) for individual in population],
+    )
+
+class NSGA_II(Mapping):
+    """
+    NSGA_II Mapping algorithm
+    the population is split into islands, evolved in the worker processes
+    every migration_interval generations, the best migration_size individuals
+    of each island replace the worst ones of the next island, in a ring
+    the result only depends on the seed and the island number
+    objective is comm for the total comm, or comm_load for the total comm
+    and the max wire load of the XY routes, with the non dominated sorting
+    """
+    NAME = "nsga2"
+    def __init__(self, task_behavior_list, image_num,
+        tile_net_shape, buffer_size, band_width,
+        population=200, generation=200, island=1, seed=None,
+        migration_interval=20, migration_size=2, workers=None, objective="comm"
+    ):
+        super(NSGA_II, self).__init__(task_behavior_list, image_num,
+            tile_net_shape, buffer_size, band_width
+        )
+        assert objective in OBJECTIVE_LIST, f"objective {objective} is not supported"
+        assert population >= 2 * island, "population should be at least 2 for each island"
+        assert island == 1 or migration_size < population // island, \
+            "migration size should be less than the population of each island"
+        self.population = population
+        self.generation = generation
+        self.island = island
+        # random seed from the global random if not given, logged to reproduce
+        self.seed = random.randrange(2**32) if seed is None else seed
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.workers = min(island, multiprocessing.cpu_count()) \
+            if workers is None else workers
+        self.objective = objective
+
+    def _get_position_list(self, tile_behavior_list):
+        # rank the transferred data amount between tiles
+        rank_list = get_rank_list(tile_behavior_list)
+        tile_num = len(tile_behavior_list)
+        self.logger.info(f"NSGA_II with population {self.population}, " + \
+            f"generation {self.generation}, island {self.island}, seed {self.seed}, " + \
+            f"objective {self.objective}"
+        )
+        context = (self.tile_row, self.tile_column, tile_num, rank_list, self.objective)
+        # islands in the worker processes, in this process for one worker
+        # or inside a daemon process, which can not have children
+        if self.workers <= 1 or multiprocessing.current_process().daemon:
+            _init_island(context)
+            island_map = map
+            pool = None
+        else:
+            pool = multiprocessing.Pool(
+                self.workers, initializer=_init_island, initargs=(context,)
+            )
+            island_map = pool.map
+        # island state, (seed, rng_state, position_list_list, population_size)
+        island_state = [
+            [f"{self.seed}-{i}", None, None,
+                self.population * (i + 1) // self.island - self.population * i // self.island]
+            for i in range(self.island)
+        ]
+        try:
+            # the first epoch is the random initialization
+            generation = 0
+            epoch_generation = 0
+            while True:
+                result = list(island_map(_evolve_island, [
+                    tuple(state) + (epoch_generation,) for state in island_state
+                ]))
+                for state, (rng_state, position_list_list, _) in zip(island_state, result):
+                    state[1] = rng_state
+                    state[2] = position_list_list
+                generation += epoch_generation
+                if generation >= self.generation:
+                    break
+                epoch_generation = min(self.migration_interval, self.generation - generation)
+                # migration in a ring, after the first epoch
+                if generation > 0 and self.island > 1:
+                    best_list = [
+                        position_list_list[:self.migration_size]
+                        for _, position_list_list, _ in result
+                    ]
+                    for i, state in enumerate(island_state):
+                        migrant = best_list[(i - 1) % self.island]
+                        state[2] = state[2][:len(state[2]) - len(migrant)] + migrant
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        # 4 choose the best mapping result
+        if self.objective == "comm":
+            best_island = min(range(self.island), key=lambda i: result[i][2][0])
+            position_list = result[best_island][1][0]
+            self.logger.info('final min comm:'+str(result[best_island][2][0][0]))
+            return position_list
+        # on the pareto front of all islands, the min sum of the normalized objectives
+        position_list_list = [position_list for _, position_list_list, _ in result
+            for position_list in position_list_list
+        ]
+        value = np.array([value for _, _, value_list in result for value in value_list],
+            dtype=np.float64)
+        front = np.flatnonzero(get_non_dominated_rank(value) == 0)
+        front_value = value[front]
+        span = front_value.max(axis=0) - front_value.min(axis=0)
+        score = ((front_value - front_value.min(axis=0)) / np.where(span > 0, span, 1)).sum(axis=1)
+        best = int(front[np.argmin(score)])
+        self.logger.info(f"pareto front of {len(np.unique(front_value, axis=0))} points, " + \
+            f"comm from {front_value[:, 0].min():.0f} to {front_value[:, 0].max():.0f}, " + \
+            f"max load from {front_value[:, 1].min():.0f} to {front_value[:, 1].max():.0f}"
+        )
+        self.logger.info(f"final comm: {value[best, 0]:.0f}, max load: {value[best, 1]:.0f}")
+        return position_list_list[best]
+
+class AnnealMapping(CommunicationWiseMapping):
+    """
+    simulated annealing mapping, refine the commwise mapping
+    each move is a swap with another tile or a move to a free slot in the window,
+    the cost delta is only on the links of the moved tiles
+    the temperature goes from initial_temperature to final_temperature,
+    exponential or linear, over the move number
+    move_number is move_factor * tile_num ** 2 by default, so the mapping only depends
+    on the seed, time_budget is an optional cap in seconds
+    """
+    NAME = "anneal"
+    def __init__(self, task_behavior_list, image_num,
+        tile_net_shape, buffer_size, band_width,
+        initial_temperature=None, final_temperature=None, schedule="exponential",
+        move_number=None, move_factor=20, time_budget=None, seed=None
+    ):
+        super(AnnealMapping, self).__init__(task_behavior_list, image_num,
+            tile_net_shape, buffer_size, band_width
+        )
+        assert schedule in ["exponential", "linear"], \
+            f"temperature schedule {schedule} is not supported"
+        self.initial_temperature = initial_temperature
+        self.final_temperature = final_temperature
+        self.schedule = schedule
+        self.time_budget = time_budget
+        self.move_number = move_number
+        self.move_factor = move_factor
+        # random seed from the global random if not given, logged to reproduce
+        self.seed = random.randrange(2**32) if seed is None else seed
+
+    def _get_temperature(self, progress):
+        """
+        get the temperature for the progress in [0, 1]
+        """
+        if self.schedule == "linear":
+            return self.initial_temperature + \
+                (self.final_temperature - self.initial_temperature) * progress
+        return self.initial_temperature * \
+            (self.final_temperature / self.initial_temperature) ** progress
+
+    def _get_position_list(self, tile_behavior_list):
+        """
+        get position list, start from the commwise mapping
+        """
+        position_list = super(AnnealMapping, self)._get_position_list(tile_behavior_list)
+        tile_num = len(position_list)
+        tile_link_list = get_tile_link_list(tile_num, get_rank_list(tile_behavior_list))
+        rng = random.Random(self.seed)
+        # grid of the tile index, -1 for free
+        grid = [-1] * (self.tile_row * self.tile_column)
+        for tile_id, (row, column) in enumerate(position_list):
+            grid[row * self.tile_column + column] = tile_id
+        position_list = list(position_list)
+
+        def get_cost(tile_1, tile_2):
+            """
+            cost on the links of tile_1 and tile_2, the links between them counted once
+            """
+            cost = 0
+            row_1, column_1 = position_list[tile_1]
+            for other, comm in tile_link_list[tile_1]:
+                row, column = position_list[other]
+                cost += comm * (abs(row_1 - row) + abs(column_1 - column))
+            if tile_2 >= 0:
+                row_2, column_2 = position_list[tile_2]
+                for other, comm in tile_link_list[tile_2]:
+                    if other != tile_1:
+                        row, column = position_list[other]
+                        cost += comm * (abs(row_2 - row) + abs(column_2 - column))
+            return cost
+
+        def propose(window):
+            """
+            propose a move of a random tile to a random slot in the window
+            return (tile_1, tile_2, slot), tile_2 is -1 for the free slot
+            """
+            tile_1 = rng.randrange(tile_num)
+            row_1, column_1 = position_list[tile_1]
+            row = rng.randint(max(0, row_1 - window), min(self.tile_row - 1, row_1 + window))
+            column = rng.randint(max(0, column_1 - window),
+                min(self.tile_column - 1, column_1 + window)
+            )
+            slot = row * self.tile_column + column
+            return tile_1, grid[slot], slot
+
+        def apply(tile_1, tile_2, slot):
+            """
+            apply the move, apply it again to undo
+            """
+            row_1, column_1 = position_list[tile_1]
+            slot_1 = row_1 * self.tile_column + column_1
+            position_list[tile_1] = divmod(slot, self.tile_column)
+            grid[slot] = tile_1
+            grid[slot_1] = tile_2
+            if tile_2 >= 0:
+                position_list[tile_2] = (row_1, column_1)
+            return tile_1, tile_2, slot_1
+
+        def get_delta(move):
+            """
+            get the cost delta of the move, and apply it
+            """
+            before = get_cost(move[0], move[1])
+            undo = apply(*move)
+            return get_cost(move[0], move[1]) - before, undo
+
+        move_number = self.move_factor * tile_num ** 2 \
+            if self.move_number is None else self.move_number
+        max_window = max(self.tile_row, self.tile_column)
+        # initial temperature from the mean uphill delta of the random moves
+        if self.initial_temperature is None:
+            uphill = []
+            for _ in range(min(1000, 10 * tile_num)):
+                delta, undo = get_delta(propose(max_window))
+                apply(*undo)
+                if delta > 0:
+                    uphill.append(delta)
+            self.initial_temperature = sum(uphill) / len(uphill) if len(uphill) > 0 else 1.
+        if self.final_temperature is None:
+            self.final_temperature = self.initial_temperature * 1e-4
+        self.logger.info(f"Anneal from {self.initial_temperature:.3g} " + \
+            f"to {self.final_temperature:.3g}, {self.schedule}, " + \
+            f"move number {move_number}, time budget {self.time_budget}, seed {self.seed}"
+        )
+        cost = sum(comm * (abs(position_list[tile_1][0] - position_list[tile_2][0]) + \
+            abs(position_list[tile_1][1] - position_list[tile_2][1]))
+            for (tile_1, tile_2), comm in get_rank_list(tile_behavior_list)
+        )
+        self.logger.info(f"commwise comm: {cost}")
+        best_cost, best_position_list = cost, list(position_list)
+        # moves in batches, the temperature and the window are updated on each batch
+        batch_size = 1000
+        start_time = time.perf_counter()
+        move_count = 0
+        accept_count = 0
+        while True:
+            progress = 0.
+            if self.time_budget is not None:
+                progress = max(progress, (time.perf_counter() - start_time) / self.time_budget)
+            progress = max(progress, move_count / max(move_number, 1))
+            if progress >= 1.:
+                break
+            temperature = self._get_temperature(progress)
+            window = max(1, int(round(max_window * (1. - progress))))
+            batch = min(batch_size, move_number - move_count)
+            for _ in range(batch):
+                move = propose(window)
+                if move[0] == move[1]:
+                    continue
+                delta, undo = get_delta(move)
+                if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+                    cost += delta
+                    accept_count += 1
+                else:
+                    apply(*undo)
+            move_count += batch
+            # the best mapping is kept at the end of each batch
+            if cost < best_cost:
+                best_cost, best_position_list = cost, list(position_list)
+        elapsed_time = time.perf_counter() - start_time
+        self.logger.info(f"{move_count} moves in {elapsed_time:.2f} s, " + \
+            f"{accept_count} accepted, final min comm: {best_cost}"
+        )
+        return best_position_list
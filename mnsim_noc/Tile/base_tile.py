@@ -7,9 +7,12 @@
 @CreateTime:
     2021/10/08 17:57
 """
-import copy
 from mnsim_noc.utils.component import Component
+from mnsim_noc.utils.trace import COMPUTATION_START, COMPUTATION_END
+from mnsim_noc.utils import counter
 from mnsim_noc.Buffer import MultiInputBuffer, MultiOutputBuffer
+from mnsim_noc.Buffer.data_table import default_data_table, \
+    get_image_data_list, get_image_split_list
 
 class BaseTile(Component):
     """
@@ -22,16 +25,17 @@ class BaseTile(Component):
     """
     REGISTRY = "tile"
     NAME = "behavior_driven"
-    def __init__(self, position, image_num, buffer_size, tile_behavior_cfg):
+    def __init__(self, position, image_num, buffer_size, tile_behavior_cfg, data_table=None):
         """
         image_num: int, throughput
         buffer_size: tuple of int, (buffer_size_input, buffer_size_output), bits
+        data_table: the table of the data id, default shared table if None
         """
         super(BaseTile, self).__init__()
         # position and tile_behavior_cfg
         self.position = position
         self.image_num = image_num
-        self.tile_behavior_cfg = copy.deepcopy(tile_behavior_cfg)
+        self.tile_behavior_cfg = tile_behavior_cfg
         # other parameters
         self.task_id = tile_behavior_cfg["task_id"] # value
         self.tile_id = tile_behavior_cfg["tile_id"] # value
@@ -39,33 +43,115 @@ class BaseTile(Component):
         self.target_tile_id = tile_behavior_cfg["target_tile_id"] # this is a list
         self.source_tile_id = tile_behavior_cfg["source_tile_id"] # this is a list
         # input buffer and output buffer
-        self.input_buffer = MultiInputBuffer(buffer_size[0], self.source_tile_id)
-        self.output_buffer = MultiOutputBuffer(buffer_size[1], self.target_tile_id)
+        self.data_table = default_data_table if data_table is None else data_table
+        self.input_buffer = MultiInputBuffer(
+            buffer_size[0], self.source_tile_id, self.data_table
+        )
+        self.output_buffer = MultiOutputBuffer(
+            buffer_size[1], self.target_tile_id, self.data_table
+        )
         # running state, False for idle, True for running
         self.running_state = False
-        self.computation_list = self._get_computation_list()
+        # compiled dependence is shared as the template for all images
+        self.dependence_list = self.data_table.compile_dependence_list(
+            tile_behavior_cfg["dependence"]
+        )
+        self.computation_number = self.image_num * len(self.dependence_list)
         self.computation_id = 0
+        self.computation = None
         self.computation_end_time = float("inf")
+        # statistics, the range list is not kept in the statistics only mode
+        self.statistics_only = False
         self.computation_range_time = []
+        self.computation_busy_time = 0.
+        self.computation_count = 0
+        self.computation_min_time = float("inf")
+        self.computation_max_time = float("-inf")
+        self.image_start_time = [0.] * self.image_num
+        self.image_end_time = [0.] * self.image_num
+        # event queue, push the end time when computation start
+        self.event_queue = None
+        # trace writer and the tile index in the trace
+        self.trace = None
+        self.trace_id = -1
+        # counters, shared by the array
+        self.counters = counter.Counters()
 
-    def _get_computation_list(self):
+    def set_event_queue(self, event_queue):
         """
-        get the computation list
-        each item is a tuple, (dependence, done_flag)
-        done_flag, idle, running, done
+        set the event queue for the end time of the computation
         """
-        computation_list = []
-        dependence_length = len(self.tile_behavior_cfg["dependence"])
-        for i in range(self.image_num):
-            for j in range(dependence_length):
-                dependence = copy.deepcopy(self.tile_behavior_cfg["dependence"][j])
-                # modify dependence base on image num
-                for key in ["wait", "output", "drop"]:
-                    for value in dependence[key]:
-                        # x, y, start, end, bit, total, image_id, layer_id, tile_id
-                        value[6] = i
-                computation_list.append([dependence, "idle"])
-        return computation_list
+        self.event_queue = event_queue
+
+    def set_statistics_only(self, statistics_only):
+        """
+        set the statistics only mode, only accumulators are kept
+        """
+        self.statistics_only = statistics_only
+
+    def set_counters(self, counters):
+        """
+        set the counters registry
+        """
+        self.counters = counters
+
+    def set_trace(self, trace, trace_id):
+        """
+        set the trace writer, trace is None for no trace
+        """
+        self.trace = trace
+        self.trace_id = trace_id
+
+    def get_state(self):
+        """
+        get the mutable state of the tile and the buffers, for the checkpoint
+        """
+        return {
+            "running_state": self.running_state,
+            "computation_id": self.computation_id,
+            "computation_end_time": self.computation_end_time,
+            "computation_range_time": list(self.computation_range_time),
+            "computation_busy_time": self.computation_busy_time,
+            "computation_count": self.computation_count,
+            "computation_min_time": self.computation_min_time,
+            "computation_max_time": self.computation_max_time,
+            "image_start_time": list(self.image_start_time),
+            "image_end_time": list(self.image_end_time),
+            "input_buffer": self.input_buffer.get_state(),
+            "output_buffer": self.output_buffer.get_state(),
+        }
+
+    def set_state(self, state):
+        """
+        set the mutable state of the tile and the buffers, from the checkpoint
+        """
+        for key in ["input_buffer", "output_buffer"]:
+            getattr(self, key).set_state(state[key])
+        for key, value in state.items():
+            if key not in ["input_buffer", "output_buffer"]:
+                setattr(self, key, list(value) if isinstance(value, list) else value)
+        self.computation = None
+
+    def _get_computation(self, computation_id):
+        """
+        get the computation of the computation id, the image id is on the template
+        the computation is cached until the computation id changes
+        """
+        if self.computation is not None and self.computation[0] == computation_id:
+            self.counters[counter.COMPUTATION_CACHE_HIT] += 1
+            return self.computation[1]
+        self.counters[counter.COMPUTATION_CACHE_MISS] += 1
+        image_id, dependence_id = divmod(computation_id, len(self.dependence_list))
+        dependence = self.dependence_list[dependence_id]
+        computation = {
+            "wait": get_image_split_list(dependence.wait_split, image_id),
+            "output": get_image_data_list(dependence.output, image_id),
+            "output_size": dependence.output_size,
+            "drop": get_image_split_list(dependence.drop_split, image_id),
+            "latency": dependence.latency,
+        }
+        self.computation = (computation_id, computation)
+        return computation
 
     def update(self, current_time):
         """
@@ -78,37 +164,67 @@ class BaseTile(Component):
             if current_time >= self.computation_end_time:
                 # PHASE: Tile COMPUTATION DONE
                 # get computation
-                computation = self.computation_list[self.computation_id][0]
+                computation = self._get_computation(self.computation_id)
+                if self.trace is not None:
+                    self.trace.record(
+                        current_time, COMPUTATION_END, self.trace_id, self.computation_id
+                    )
                 # modify state
                 self.running_state = False
-                self.computation_list[self.computation_id][1] = "done"
                 self.computation_id += 1
                 # modify buffer
                 self.input_buffer.delete_data_list(computation["drop"])
-                self.output_buffer.add_data_list(computation["output"])
+                self.output_buffer.add_data_list(
+                    computation["output"], computation["output_size"]
+                )
             else:
                 return None
         assert self.running_state == False, "running_state should be idle"
-        if self.computation_id >= len(self.computation_list):
+        if self.computation_id >= self.computation_number:
             # if all computation are done, return None
             self.computation_end_time = float("inf")
             return None
-        computation = self.computation_list[self.computation_id][0]
+        computation = self._get_computation(self.computation_id)
         # for idle state, running state is False
         # check if the computation can run
         # PHASE: TILE COMPUTATION JUDGE
-        if self.input_buffer.check_data_already(computation["wait"]) \
-            and self.output_buffer.check_enough_space(computation["output"]):
+        if not self.input_buffer.check_data_already(computation["wait"]):
+            self.counters[counter.COMPUTATION_BLOCKED_INPUT] += 1
+        elif not self.output_buffer.check_enough_space(computation["output_size"]):
+            self.counters[counter.COMPUTATION_BLOCKED_OUTPUT] += 1
+        else:
             # PHASE: TILE COMPUTATION START
+            self.counters[counter.COMPUTATION_START] += 1
             self.running_state = True
-            self.computation_list[self.computation_id][1] = "running"
             assert computation["latency"] > 0, "latency should be positive"
             self.computation_end_time = current_time + computation["latency"]
-            self.computation_range_time.append((current_time, self.computation_end_time))
-            return None
-        else:
-            self.computation_end_time = float("inf")
+            self._record_computation(current_time, self.computation_end_time)
+            if self.event_queue is not None:
+                self.event_queue.push(self.computation_end_time, self)
+            if self.trace is not None:
+                self.trace.record(
+                    current_time, COMPUTATION_START, self.trace_id, self.computation_id
+                )
             return None
+        self.computation_end_time = float("inf")
+        return None
+
+    def _record_computation(self, start_time, end_time):
+        """
+        record the computation range, and the accumulators
+        """
+        if not self.statistics_only:
+            self.computation_range_time.append((start_time, end_time))
+        duration = end_time - start_time
+        self.computation_busy_time += duration
+        self.computation_count += 1
+        self.computation_min_time = min(self.computation_min_time, duration)
+        self.computation_max_time = max(self.computation_max_time, duration)
+        image_id, dependence_id = divmod(self.computation_id, len(self.dependence_list))
+        if dependence_id == 0:
+            self.image_start_time[image_id] = start_time
+        if dependence_id == len(self.dependence_list) - 1:
+            self.image_end_time[image_id] = end_time
 
     def get_computation_end_time(self):
         """
@@ -122,20 +238,39 @@ class BaseTile(Component):
         """
         get the range of the computation
         """
+        assert not self.statistics_only, \
+            "computation range is not kept in the statistics only mode"
         computation_range = []
-        dependence_length = len(self.tile_behavior_cfg["dependence"])
+        dependence_length = len(self.dependence_list)
         for i in range(self.image_num):
             computation_range.append([])
             for j in range(dependence_length):
                 computation_range[-1].append(self.computation_range_time[i*dependence_length+j])
         return computation_range
 
+    def get_image_range(self):
+        """
+        get the range of each image, first start and last end
+        """
+        return list(zip(self.image_start_time, self.image_end_time))
+
+    def get_computation_statistics(self):
+        """
+        get the statistics of the computation
+        """
+        return {
+            "busy_time": self.computation_busy_time,
+            "count": self.computation_count,
+            "min_time": self.computation_min_time,
+            "max_time": self.computation_max_time,
+        }
+
     def check_finish(self):
         """
         check if the tile is finished
         """
         assert self.running_state == False, f"{self.tile_id} running_state should be idle"
-        assert self.computation_id == len(self.computation_list), \
+        assert self.computation_id == self.computation_number, \
             f"{self.tile_id} computation_id should to the end of the list"
         assert self.computation_end_time == float("inf"), \
             f"{self.tile_id} computation_end_time should be inf"
@@ -147,8 +282,4 @@ class BaseTile(Component):
         get the simulation result
         """
         self.check_finish()
-        # get the range of the computation
-        computation_time = sum([
-            end - start for start, end in self.computation_range_time
-        ])
-        return computation_time * 1. / end_time
+        return self.computation_busy_time * 1. / end_time
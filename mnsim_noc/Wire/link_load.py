@@ -0,0 +1,65 @@
+#-*-coding:utf-8-*-
+"""
+@FileName:
+    link_load.py
+@Description:
+    analytic per wire load of the XY routes, without the simulation
+@CreateTime:
+    2026/10/18 21:50
+"""
+import numpy as np
+
+def get_link_load(position, link_source, link_target, link_volume, tile_net_shape):
+    """
+    get the load of each wire, with the same XY route and wire index as the wire net
+    first along the row of the source, then along the column of the target
+    position: tiles x 2 array, or population x tiles x 2 array
+    link_source, link_target, link_volume: array of the links, volume in bits
+    return: wire number array, or population x wire number array
+    """
+    row_num, column_num = tile_net_shape
+    position = np.asarray(position, dtype=np.int64)
+    single_flag = position.ndim == 2
+    if single_flag:
+        position = position[np.newaxis]
+    population_num = position.shape[0]
+    start = position[:, link_source, :]
+    end = position[:, link_target, :]
+    volume = np.broadcast_to(
+        np.asarray(link_volume, dtype=np.float64), start.shape[:2]
+    ).ravel()
+    population_index = np.repeat(np.arange(population_num), len(link_source))
+    def get_load(line, line_num, low, high, cell_num):
+        """
+        difference array on each line, +volume at low and -volume at high
+        cumsum is the load of the wire between cell i and i+1 for low <= i < high
+        """
+        base = (population_index * line_num + line.ravel()) * cell_num
+        size = population_num * line_num * cell_num
+        difference = np.bincount(base + low.ravel(), weights=volume, minlength=size) - \
+            np.bincount(base + high.ravel(), weights=volume, minlength=size)
+        load = np.cumsum(difference.reshape(population_num, line_num, cell_num), axis=2)
+        return load[:, :, :cell_num-1].reshape(population_num, -1)
+    # horizontal wires on the row of the source, index i * (column_num - 1) + j
+    horizontal_load = get_load(start[:, :, 0], row_num,
+        np.minimum(start[:, :, 1], end[:, :, 1]), np.maximum(start[:, :, 1], end[:, :, 1]),
+        column_num
+    )
+    # vertical wires on the column of the target, index j * (row_num - 1) + i
+    vertical_load = get_load(end[:, :, 1], column_num,
+        np.minimum(start[:, :, 0], end[:, :, 0]), np.maximum(start[:, :, 0], end[:, :, 0]),
+        row_num
+    )
+    load = np.concatenate([horizontal_load, vertical_load], axis=1)
+    return load[0] if single_flag else load
+
+def get_link_load_report(load):
+    """
+    get the total, max and variance of the wire load
+    for the population load, each value is an array over the population
+    """
+    return {
+        "total": load.sum(axis=-1),
+        "max": load.max(axis=-1),
+        "variance": load.var(axis=-1),
+    }
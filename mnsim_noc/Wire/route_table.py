@@ -0,0 +1,91 @@
+#-*-coding:utf-8-*-
+"""
+@FileName:
+    route_table.py
+@Description:
+    route table of the wire net, shared by the schedule strategies
+@CreateTime:
+    2026/10/18 15:20
+"""
+from mnsim_noc.utils.component import Component
+from mnsim_noc.utils import counter
+
+class RouteTable(Component):
+    """
+    XY route table of the wire net
+    first left or right, then up or down
+    each route is numbered by int id, with wire index array, bitmask and hop count
+    transfer time is cached for each route and data size
+    """
+    REGISTRY = "route_table"
+    NAME = "xy"
+    def __init__(self, wire_net):
+        super(RouteTable, self).__init__()
+        self.wire_net = wire_net
+        self.route_id = {}
+        self.route_index = []
+        self.route_mask = []
+        self.route_hop = []
+        self.transfer_time_cache = {}
+        # counters, shared by the array
+        self.counters = counter.Counters()
+
+    def set_counters(self, counters):
+        """
+        set the counters registry
+        """
+        self.counters = counters
+
+    def _get_xy_path(self, start_position, end_position):
+        """
+        get the xy path in wire position
+        """
+        assert start_position != end_position
+        current_position = [start_position[0], start_position[1]]
+        path = []
+        while True:
+            path.append(tuple(current_position))
+            # first left or right
+            if current_position[1] != end_position[1]:
+                current_position[1] += 1 if current_position[1] < end_position[1] else -1
+            elif current_position[0] != end_position[0]:
+                current_position[0] += 1 if current_position[0] < end_position[0] else -1
+            else:
+                break
+        return [(path[i], path[i+1]) for i in range(len(path)-1)]
+
+    def get_route_id(self, start_position, end_position):
+        """
+        get the route id from start position to end position, add if not exist
+        """
+        key = (tuple(start_position), tuple(end_position))
+        if key in self.route_id:
+            return self.route_id[key]
+        route_index = self.wire_net.get_path_index(self._get_xy_path(*key))
+        self.route_id[key] = len(self.route_index)
+        self.route_index.append(route_index)
+        self.route_mask.append(self.wire_net.get_path_mask(route_index))
+        self.route_hop.append(len(route_index))
+        return self.route_id[key]
+
+    def build(self, position_pair_list):
+        """
+        precompute the routes of all used (start, end) position pairs
+        """
+        return [self.get_route_id(start, end) for start, end in position_pair_list]
+
+    def get_transfer_time(self, route_id, data_size):
+        """
+        get the transfer time of the data size on the route, cached
+        """
+        key = (route_id, data_size)
+        transfer_time = self.transfer_time_cache.get(key, None)
+        if transfer_time is None:
+            self.counters[counter.TRANSFER_TIME_CACHE_MISS] += 1
+            transfer_time = self.wire_net.get_wire_transfer_time(
+                self.route_index[route_id], data_size
+            )
+            self.transfer_time_cache[key] = transfer_time
+        else:
+            self.counters[counter.TRANSFER_TIME_CACHE_HIT] += 1
+        return transfer_time
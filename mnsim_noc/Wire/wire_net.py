@@ -11,7 +11,7 @@
 """
 import numpy as np
 from mnsim_noc.utils.component import Component
-from mnsim_noc.Wire.base_wire import BaseWire
+from mnsim_noc.Wire.route_table import RouteTable
 
 def _get_map_key(wire_position):
     """
@@ -20,12 +20,15 @@ def _get_map_key(wire_position):
     """
     if wire_position[0][0] + wire_position[0][1] > \
         wire_position[1][0] + wire_position[1][1]:
-        return str((wire_position[1], wire_position[0]))
-    return str(wire_position)
+        return (wire_position[1], wire_position[0])
+    return wire_position
 
 class WireNet(Component):
     """
     wire net class for behavior-driven simulation
+    wires are numbered by int index, horizontally first and then vertically
+    path is the int index array of the wires
+    wire state is a bitmask over the wire index, bit is 1 for the busy wire
     """
     REGISTRY = "wire_net"
     NAME = "behavior_driven"
@@ -37,92 +40,135 @@ class WireNet(Component):
         super(WireNet, self).__init__()
         # init wire net
         self.tile_net_shape = tile_net_shape
-        self.wires = []
-        self.wires_map = {}
+        self.band_width = band_width
+        self.wire_position = []
         # horizontally wire
         for i in range(tile_net_shape[0]):
             for j in range(tile_net_shape[1] - 1):
-                wire_position = ((i, j), (i, j + 1))
-                wire = BaseWire(wire_position, band_width)
-                self.wires.append(wire)
-                self.wires_map[_get_map_key(wire_position)] = wire
+                self.wire_position.append(((i, j), (i, j + 1)))
         # vertically wire
         for j in range(tile_net_shape[1]):
             for i in range(tile_net_shape[0] - 1):
-                wire_position = ((i, j), (i + 1, j))
-                wire = BaseWire(wire_position, band_width)
-                self.wires.append(wire)
-                self.wires_map[_get_map_key(wire_position)] = wire
+                self.wire_position.append(((i, j), (i + 1, j)))
+        self.wire_index = dict(
+            (wire_position, i) for i, wire_position in enumerate(self.wire_position)
+        )
+        # wire state and busy time
+        self.wire_state_mask = 0
+        self.wire_busy_time = np.zeros(len(self.wire_position))
+        self.transfer_start_time = {}
         self.transparent_flag = False
+        # route table, shared by the schedule strategies
+        self.route_table = RouteTable(self)
 
     def set_transparent_flag(self, transparent_flag):
         """
         set the transparent flag
         """
-        for wire in self.wires:
-            wire.set_transparent_flag(transparent_flag)
         self.transparent_flag = transparent_flag
 
-    def get_all_wire_state(self, all_wire_state, transfer_path_keys):
+    def get_state(self):
         """
-        set all wire state, with key and value
-        return dict with key and state
+        get the mutable state of the wire net, for the checkpoint
         """
-        for transfer_path in transfer_path_keys:
-            all_wire_state[transfer_path] = self.wires_map[transfer_path].get_wire_state()
+        return {
+            "wire_state_mask": self.wire_state_mask,
+            "wire_busy_time": self.wire_busy_time.copy(),
+            "transfer_start_time": dict(self.transfer_start_time),
+        }
 
-    def get_data_path_state(self, transfer_path):
+    def set_state(self, state):
         """
-        get data path state
-        return False only when all wires are idle
+        set the mutable state of the wire net, from the checkpoint
+        """
+        assert len(state["wire_busy_time"]) == len(self.wire_position)
+        self.wire_state_mask = state["wire_state_mask"]
+        self.wire_busy_time = state["wire_busy_time"].copy()
+        self.transfer_start_time = dict(state["transfer_start_time"])
+
+    def get_wire_index(self, wire_position):
+        """
+        get the wire index of the wire position
+        """
+        return self.wire_index[_get_map_key(wire_position)]
+
+    def get_path_index(self, transfer_path):
+        """
+        get the wire index array of the transfer path in position
+        """
+        return np.array(
+            [self.get_wire_index(wire_position) for wire_position in transfer_path],
+            dtype=np.intp
+        )
+
+    def get_path_mask(self, path_index):
+        """
+        get the bitmask of the path
+        """
+        path_mask = 0
+        for index in path_index:
+            path_mask |= 1 << int(index)
+        return path_mask
+
+    def get_wire_state_mask(self):
         """
-        all_state = [self.wires_map[_get_map_key(path)].get_wire_state()
-            for path in transfer_path
-        ]
-        return any(all_state)
+        get the bitmask of the busy wires
+        """
+        return self.wire_state_mask
 
-    def set_data_path_state(self, transfer_path, state, communication_id, current_time):
+    def get_data_path_state(self, path_index):
         """
-        set data path state, and record transfer range time
+        get data path state
+        return False only when all wires are idle
         """
-        for path in transfer_path:
-            self.wires_map[_get_map_key(path)].set_wire_state(state, communication_id, current_time)
+        return (self.wire_state_mask & self.get_path_mask(path_index)) != 0
 
-    def get_wire_transfer_time(self, transfer_path, data_list):
+    def set_data_path_state(self, path_index, state, communication_id, current_time):
+        """
+        set data path state, and record transfer busy time
+        """
+        if state:
+            self.transfer_start_time[communication_id] = current_time
+        else:
+            start_time = self.transfer_start_time.pop(communication_id)
+            self.wire_busy_time[path_index] += current_time - start_time
+        if self.transparent_flag:
+            return None
+        path_mask = self.get_path_mask(path_index)
+        if state:
+            assert self.wire_state_mask & path_mask == 0
+            self.wire_state_mask |= path_mask
+        else:
+            assert self.wire_state_mask & path_mask == path_mask
+            self.wire_state_mask &= ~path_mask
+        return None
+
+    def get_wire_transfer_time(self, path_index, data_size):
         """
-        get wire transfer time
+        get wire transfer time, data size in bits
         """
         transfer_time = 0
-        for path in transfer_path:
-            wire = self.wires_map[_get_map_key(path)]
-            transfer_time += wire.get_transfer_time(data_list)
+        for _ in range(len(path_index)):
+            transfer_time += data_size / self.band_width
         return transfer_time
 
     def check_finish(self):
         """
         check if all wires are idle
         """
-        for wire in self.wires:
-            assert wire.get_wire_state() == False
+        assert self.wire_state_mask == 0
+        assert len(self.transfer_start_time) == 0
 
     def get_running_rate(self, end_time):
         """
         show wire rate, two decimal places
         """
-        horizontal_rate = np.zeros(
-            [self.tile_net_shape[0], self.tile_net_shape[1] - 1]
-        )
-        for i in range(self.tile_net_shape[0]):
-            for j in range(self.tile_net_shape[1] - 1):
-                wire_position = ((i, j), (i, j + 1))
-                horizontal_rate[i, j] = \
-                    self.wires_map[_get_map_key(wire_position)].get_running_rate(end_time)
-        vectical_rate = np.zeros(
-            [self.tile_net_shape[0] - 1, self.tile_net_shape[1]]
+        rate = self.wire_busy_time / end_time
+        horizontal_number = self.tile_net_shape[0] * (self.tile_net_shape[1] - 1)
+        horizontal_rate = rate[:horizontal_number].reshape(
+            self.tile_net_shape[0], self.tile_net_shape[1] - 1
         )
-        for i in range(self.tile_net_shape[0] - 1):
-            for j in range(self.tile_net_shape[1]):
-                wire_position = ((i, j), (i + 1, j))
-                vectical_rate[i, j] = \
-                    self.wires_map[_get_map_key(wire_position)].get_running_rate(end_time)
+        vectical_rate = rate[horizontal_number:].reshape(
+            self.tile_net_shape[1], self.tile_net_shape[0] - 1
+        ).T
         return horizontal_rate, vectical_rate
@@ -0,0 +1,175 @@
+#-*-coding:utf-8-*-
+"""
+@FileName:
+    benchmark.py
+@Description:
+    benchmark suite on the synthetic workload, results are appended as json lines
+@CreateTime:
+    2026/10/18 18:55
+"""
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import click
+
+from mnsim_noc.Array import BaseArray
+from mnsim_noc.utils.workload import generate_task_behavior
+
+def get_benchmark_workload(grid_size, fan_in=2, feature_map_size=4):
+    """
+    get the workload to fill the grid, grid_size layers with grid_size tiles each
+    """
+    return {
+        "layer_num": grid_size,
+        "tile_per_layer": grid_size,
+        "fan_in": fan_in,
+        "merge_interval": 0,
+        "feature_map_size": feature_map_size,
+        "channel": max(16, grid_size),
+        "bit": 8,
+        "radius": 1,
+        "latency": 10,
+    }
+
+def get_commit():
+    """
+    get the git commit of the code, empty if not in the git repo
+    """
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).decode().strip()
+    except Exception: # pylint: disable=broad-except
+        return ""
+
+def run_case(grid_size, image_num, mapping_strategy="naive", schedule_strategy="naive",
+    buffer_size=822400, band_width=1, workload=None
+):
+    """
+    run one benchmark case, time the array construction, mapping and run
+    """
+    workload = get_benchmark_workload(grid_size) if workload is None else workload
+    task_behavior = generate_task_behavior(**workload)
+    tile_net_shape = (grid_size, grid_size)
+    # array construction, the mapping inside is timed by the array and subtracted
+    start_time = time.perf_counter()
+    array = BaseArray([task_behavior], image_num, tile_net_shape,
+        (buffer_size, buffer_size), band_width,
+        mapping_strategy=mapping_strategy, schedule_strategy=schedule_strategy
+    )
+    mapping_time = array.mapping_time
+    construct_time = time.perf_counter() - start_time - mapping_time
+    # run
+    start_time = time.perf_counter()
+    array.run(statistics_only=True)
+    run_time = time.perf_counter() - start_time
+    return {
+        "case": {
+            "grid_size": grid_size,
+            "image_num": image_num,
+            "mapping_strategy": mapping_strategy,
+            "schedule_strategy": schedule_strategy,
+            "buffer_size": buffer_size,
+            "band_width": band_width,
+            "workload": workload,
+        },
+        "tile_number": len(array.tile_list),
+        "communication_number": len(array.communication_list),
+        "mapping_time": mapping_time,
+        "construct_time": construct_time,
+        "run_time": run_time,
+        "time_point_number": array.time_point_number,
+        "events_per_second": array.time_point_number / run_time if run_time > 0 else 0.,
+        "end_time": array.end_time,
+    }
+
+# modules should not be imported on the startup
+HEAVY_MODULE_LIST = ["torch", "scipy", "matplotlib", "pandas"]
+
+def run_startup(repeat=5, module_name="mnsim_noc.main"):
+    """
+    time the import of the module in a new interpreter, best of repeat
+    return the best time and the heavy modules imported
+    """
+    code = "import sys, time; t = time.perf_counter(); " + \
+        f"import {module_name}; t = time.perf_counter() - t; " + \
+        f"print(t, ','.join(m for m in {HEAVY_MODULE_LIST!r} if m in sys.modules))"
+    best_time = float("inf")
+    heavy_module = []
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, "-c", code]).decode().split()
+        best_time = min(best_time, float(output[0]))
+        heavy_module = output[1].split(",") if len(output) > 1 else []
+    return best_time, heavy_module
+
+def get_case_key(result):
+    """
+    get the key of the case, for the comparison
+    """
+    return json.dumps(result["case"], sort_keys=True)
+
+def load_result(result_path):
+    """
+    load the results, the last one for each case
+    """
+    result_dict = {}
+    with open(result_path, "r") as f:
+        for line in f:
+            if line.strip():
+                result = json.loads(line)
+                result_dict[get_case_key(result)] = result
+    return result_dict
+
+def _parse_int_list(value):
+    """
+    parse the comma separated int list
+    """
+    return [int(v) for v in value.split(",") if v.strip()]
+
+@click.command(help="mnsim noc benchmark on the synthetic workload")
+@click.option("--grid_size", type=str, default="4,8,16,32,64", help="grid size list")
+@click.option("--image_num", type=str, default="1,10,100", help="image number list")
+@click.option("--mapping_strategy", "-M", type=str, default="naive", help="mapping strategy")
+@click.option("--schedule_strategy", "-S", type=str, default="naive", help="schedule strategy")
+@click.option("--output", type=str, default="benchmark.jsonl", help="result file, appended")
+@click.option("--compare", type=str, default=None, help="baseline result file to compare")
+@click.option("--startup", is_flag=True, default=False, help="only time the startup import")
+def main(grid_size, image_num, mapping_strategy, schedule_strategy, output, compare, startup):
+    """
+    benchmark function
+    """
+    if startup:
+        best_time, heavy_module = run_startup()
+        print(f"import mnsim_noc.main: {best_time:.3f} s, " + \
+            f"heavy modules: {', '.join(heavy_module) if heavy_module else 'none'}")
+        return None
+    logging.disable(logging.INFO)
+    baseline = load_result(compare) if compare is not None else {}
+    commit = get_commit()
+    for size in _parse_int_list(grid_size):
+        for num in _parse_int_list(image_num):
+            result = run_case(size, num, mapping_strategy, schedule_strategy)
+            result["commit"] = commit
+            result["python"] = platform.python_version()
+            result["date"] = time.strftime("%Y-%m-%d %H:%M:%S")
+            with open(output, "a") as f:
+                f.write(json.dumps(result) + "\n")
+            output_str = f"grid {size}x{size}, image {num}: " + \
+                f"mapping {result['mapping_time']:.3f} s, " + \
+                f"construct {result['construct_time']:.3f} s, " + \
+                f"run {result['run_time']:.3f} s, " + \
+                f"{result['events_per_second']:.0f} time points per second"
+            base_result = baseline.get(get_case_key(result), None)
+            if base_result is not None:
+                output_str += f", run time {result['run_time']/base_result['run_time']:.2f}x" + \
+                    f" of {base_result.get('commit', '')}"
+                if base_result["end_time"] != result["end_time"]:
+                    output_str += ", END TIME CHANGED"
+            print(output_str)
+    return None
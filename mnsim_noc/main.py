@@ -7,59 +7,151 @@
 @CreateTime:
     2021/10/08 18:48
 """
-import pickle
+import inspect
+import random
 
 import click
 
 from mnsim_noc.Array import BaseArray
+from mnsim_noc.Strategy.mapping import Mapping
 from mnsim_noc.utils.yaml_io import read_yaml
+from mnsim_noc.utils.task_io import load_task_behavior
+from mnsim_noc.utils.steady_state import get_relative_error
 
 
+def get_array_kwargs(array_config):
+    """
+    get the array arguments from the array config, with default value
+    """
+    return {
+        "image_num": array_config.get("image_num", 1),
+        "tile_net_shape": (
+            array_config.get("tile_array_row", 16),
+            array_config.get("tile_array_col", 16)
+        ),
+        "buffer_size": (
+            array_config.get("input_buffer_size", 822400),
+            array_config.get("output_buffer_size", 822400)
+        ), # default 32768 bits, 4KB
+        "band_width": array_config.get("band_width", 1), # default, 1Gbps
+        "mapping_strategy": array_config.get("mapping_strategy", "naive"),
+        "schedule_strategy": array_config.get("schedule_strategy", "naive"),
+        "transparent_flag": array_config.get("transparent_flag", False),
+        # extra arguments of the mapping strategy, like the population of nsga2
+        "mapping_kwargs": dict(array_config.get("mapping_kwargs", None) or {}),
+    }
+
+def get_mapping_option_kwargs(mapping_strategy, option_dict):
+    """
+    get the mapping kwargs from the given command line options
+    an option not in the arguments of the mapping strategy is a usage error
+    """
+    option_dict = dict((key, value) for key, value in option_dict.items() if value is not None)
+    if len(option_dict) == 0:
+        return {}
+    parameter = inspect.signature(Mapping.get_class_(mapping_strategy).__init__).parameters
+    unknown_list = [key for key in option_dict if key not in parameter]
+    if len(unknown_list) > 0:
+        option_str = ", ".join("--" + key for key in unknown_list)
+        raise click.UsageError(
+            f"{option_str} does not apply to the mapping strategy {mapping_strategy}"
+        )
+    return option_dict
+
+def load_task_behavior_list(task_config_path_list):
+    """
+    load task behavior list from the task config path list
+    pickle file or columnar directory, which is memory mapped
+    """
+    assert len(task_config_path_list) > 0, "task config path list is empty"
+    task_behavior_list = []
+    for i, task_config_path in enumerate(task_config_path_list):
+        print(f"loading {i}th task config from {task_config_path} ")
+        task_behavior_list.append(load_task_behavior(task_config_path))
+    return task_behavior_list
+
 @click.command(help="mnsim noc behavior driven simulation")
 @click.option("--config", type=str, default="config.yaml", help="config file path")
 @click.option("--task", type=str, help="task file path list")
 @click.option("--mapping_strategy", "-M", type=str, help="mapping strategy")
 @click.option("--schedule_strategy", "-S", type=str, help="schedule strategy")
 @click.option("--transprent_flag", "-T", is_flag=True, default=False, help="transparent mode")
-def main(config, task, mapping_strategy, schedule_strategy, transprent_flag):
+@click.option("--trace", type=str, default=None, help="binary trace file path")
+@click.option("--statistics_only", is_flag=True, default=False, help="keep only statistics")
+@click.option("--steady_state", type=float, default=None,
+    help="stop on the steady state within the tolerance and extrapolate")
+@click.option("--steady_state_window", type=int, default=8,
+    help="least steady state window, raised to the pipeline depth")
+@click.option("--validate_steady_state", is_flag=True, default=False,
+    help="check the extrapolation against a full run")
+@click.option("--checkpoint", type=str, default=None, help="checkpoint file path")
+@click.option("--checkpoint_events", type=int, default=None,
+    help="write the checkpoint every N time points")
+@click.option("--checkpoint_seconds", type=float, default=None,
+    help="write the checkpoint every T seconds, default 600 if no N is given")
+@click.option("--resume", type=str, default=None, help="resume from the checkpoint file")
+@click.option("--profile", is_flag=True, default=False, help="profile the phases of the run")
+@click.option("--counters", is_flag=True, default=False, help="show the counters of the run")
+@click.option("--link_load", is_flag=True, default=False,
+    help="show the analytic wire load of the mapping before the run")
+@click.option("--population", type=int, default=None, help="population of nsga2 mapping")
+@click.option("--generation", type=int, default=None, help="generation of nsga2 mapping")
+@click.option("--island", type=int, default=None, help="island number of nsga2 mapping")
+@click.option("--seed", type=int, default=None, help="random seed of nsga2 and anneal mapping")
+def main(config, task, mapping_strategy, schedule_strategy, transprent_flag,
+    trace, statistics_only, steady_state, steady_state_window, validate_steady_state,
+    checkpoint, checkpoint_events, checkpoint_seconds, resume, profile, counters,
+    link_load, population, generation, island, seed
+):
     """
     main function
     """
     # load array config
     array_config = read_yaml(config)
-    # load array config
-    image_num = array_config.get("image_num", 1)
-    tile_net_shape = (
-        array_config.get("tile_array_row", 16),
-        array_config.get("tile_array_col", 16)
-    )
-    buffer_size = (
-        array_config.get("input_buffer_size", 822400),
-        array_config.get("output_buffer_size", 822400)
-    ) # default 32768 bits, 4KB
-    band_width = array_config.get("band_width", 1) # default, 1Gbps
-    mapping_strategy = array_config.get("mapping_strategy", "naive") \
-        if mapping_strategy is None else mapping_strategy
-    schedule_strategy = array_config.get("schedule_strategy", "naive") \
-        if schedule_strategy is None else schedule_strategy
-    transparent_flag = array_config.get("transparent_flag", False) \
-        if transprent_flag is None else transprent_flag
+    array_kwargs = get_array_kwargs(array_config)
     # overide config
+    if mapping_strategy is not None:
+        array_kwargs["mapping_strategy"] = mapping_strategy
+    if schedule_strategy is not None:
+        array_kwargs["schedule_strategy"] = schedule_strategy
+    if transprent_flag:
+        array_kwargs["transparent_flag"] = True
+    array_kwargs["mapping_kwargs"].update(get_mapping_option_kwargs(
+        array_kwargs["mapping_strategy"],
+        {"population": population, "generation": generation, "island": island, "seed": seed}
+    ))
+    # the full run for the validation should have the same mapping, pin the seed
+    if validate_steady_state and steady_state is not None and \
+        array_kwargs["mapping_kwargs"].get("seed", None) is None and \
+        "seed" in inspect.signature(
+            Mapping.get_class_(array_kwargs["mapping_strategy"]).__init__
+        ).parameters:
+        array_kwargs["mapping_kwargs"]["seed"] = random.randrange(2**32)
     # load task config behavior list
     task_config_path_list = array_config.get("task_config_path_list", []) \
         if task is None else task.split(",")
-    assert len(task_config_path_list) > 0, "task config path list is empty"
-    task_behavior_list = []
-    for i, task_config_path in enumerate(task_config_path_list):
-        print(f"loading {i}th task config from {task_config_path} ")
-        with open(task_config_path, "rb") as f:
-            task_behavior_list.append(pickle.load(f))
+    task_behavior_list = load_task_behavior_list(task_config_path_list)
     # create array
-    array = BaseArray(
-        task_behavior_list, image_num,
-        tile_net_shape, buffer_size, band_width,
-        mapping_strategy, schedule_strategy, transparent_flag
-    )
+    array = BaseArray(task_behavior_list, **array_kwargs)
+    if link_load:
+        array.show_link_load()
     # array run and show config
-    array.run()
-    array.show_simulation_result()
+    if checkpoint is not None and checkpoint_events is None and checkpoint_seconds is None:
+        checkpoint_seconds = 600.
+    array.run(trace_path=trace, statistics_only=statistics_only,
+        steady_state_tolerance=steady_state, steady_state_window=steady_state_window,
+        checkpoint_path=checkpoint, checkpoint_events=checkpoint_events,
+        checkpoint_seconds=checkpoint_seconds, resume_path=resume, profile=profile
+    )
+    complete_time = array.show_simulation_result()
+    if profile:
+        array.show_profile()
+    if counters:
+        array.show_counters()
+    # validate the extrapolation against the full run
+    if validate_steady_state and steady_state is not None:
+        full_array = BaseArray(task_behavior_list, **array_kwargs)
+        full_array.run(statistics_only=True)
+        relative_error = get_relative_error(complete_time, full_array.show_latency_throughput())
+        for task_id, error in relative_error.items():
+            print(f"Task {task_id} steady state relative error is {error*100:.3f}%")
@@ -0,0 +1,203 @@
+#-*-coding:utf-8-*-
+"""
+@FileName:
+    sweep.py
+@Description:
+    parameter sweep over the array config, jobs run in a process pool
+@CreateTime:
+    2026/10/18 16:40
+"""
+import csv
+import itertools
+import logging
+import multiprocessing
+import time
+import traceback
+
+import click
+import yaml
+
+from mnsim_noc.Array import BaseArray
+from mnsim_noc.main import get_array_kwargs, load_task_behavior_list
+from mnsim_noc.utils.result import get_latency_throughput
+from mnsim_noc.utils.yaml_io import read_yaml
+
+# keys can be overridden in the sweep, mapping_kwargs is merged into the base one
+SWEEP_KEY_LIST = [
+    "mapping_strategy", "schedule_strategy", "band_width",
+    "input_buffer_size", "output_buffer_size",
+    "tile_array_row", "tile_array_col", "transparent_flag",
+    "image_num", "mapping_kwargs",
+]
+RESULT_KEY_LIST = ["job_id"] + SWEEP_KEY_LIST + [
+    "status", "task_id", "latency", "throughput", "total_time", "wall_time", "error",
+]
+
+def get_sweep_override_list(grid=None, override_list=None):
+    """
+    get the override list from the grid (dict of list) and the override list
+    the grid is expanded as the cartesian product
+    """
+    sweep_override_list = []
+    if grid:
+        key_list = list(grid.keys())
+        for value_list in itertools.product(*[grid[key] for key in key_list]):
+            sweep_override_list.append(dict(zip(key_list, value_list)))
+    if override_list:
+        sweep_override_list.extend([dict(override) for override in override_list])
+    for override in sweep_override_list:
+        for key in override.keys():
+            assert key in SWEEP_KEY_LIST, f"{key} can not be swept"
+    return sweep_override_list
+
+def parse_grid_option(grid_option):
+    """
+    parse the grid option like key=v1,v2, values are parsed as yaml
+    """
+    grid = {}
+    for option in grid_option:
+        assert "=" in option, f"grid option {option} should be key=v1,v2"
+        key, value_str = option.split("=", 1)
+        grid[key.strip()] = [yaml.safe_load(v) for v in value_str.split(",")]
+    return grid
+
+# task behavior list is loaded once for each worker, on the first job
+_worker_task_config_path_list = None
+_worker_task_behavior_list = None
+
+def _init_worker(task_config_path_list):
+    """
+    init the worker, keep the task path and silence the info logging
+    the task is loaded in the job, so a failed load is a failed job,
+    not a worker respawned by the pool forever
+    """
+    global _worker_task_config_path_list, _worker_task_behavior_list
+    logging.disable(logging.INFO)
+    _worker_task_config_path_list = task_config_path_list
+    _worker_task_behavior_list = None
+
+def _get_worker_task_behavior_list():
+    """
+    get the task behavior list of the worker, loaded on the first call
+    """
+    global _worker_task_behavior_list
+    if _worker_task_behavior_list is None:
+        _worker_task_behavior_list = load_task_behavior_list(_worker_task_config_path_list)
+    return _worker_task_behavior_list
+
+def run_job(job):
+    """
+    run one job in the worker, the exception is returned in the result
+    job: tuple -> (job_id, array_config)
+    """
+    job_id, array_config = job
+    start_time = time.time()
+    try:
+        # mapping modifies the task id in the tile behavior, copy the dict
+        task_behavior_list = [
+            [dict(tile_behavior) for tile_behavior in task_behavior]
+            for task_behavior in _get_worker_task_behavior_list()
+        ]
+        array_kwargs = get_array_kwargs(array_config)
+        array = BaseArray(task_behavior_list, **array_kwargs)
+        array.run(statistics_only=True)
+        # latency, throughput and total time in ms
+        result = dict(
+            (task_id, tuple(None if value is None else value / 1e6
+                for value in get_latency_throughput(computation_range)
+            ))
+            for task_id, computation_range in array.show_latency_throughput().items()
+        )
+        return job_id, "ok", result, time.time() - start_time, ""
+    except Exception: # pylint: disable=broad-except
+        return job_id, "failed", {}, time.time() - start_time, traceback.format_exc()
+
+def run_sweep(array_config, sweep_override_list, task_config_path_list,
+    worker_num=1
+):
+    """
+    run the sweep, results are yielded as the jobs finish
+    each result is a list of row dicts, one row for each task
+    """
+    job_list = []
+    for job_id, override in enumerate(sweep_override_list):
+        job_config = dict(array_config)
+        job_config.update(override)
+        if "mapping_kwargs" in override:
+            job_config["mapping_kwargs"] = dict(
+                array_config.get("mapping_kwargs", None) or {}, **override["mapping_kwargs"]
+            )
+        job_list.append((job_id, job_config))
+    if worker_num <= 1:
+        _init_worker(task_config_path_list)
+        result_iter = map(run_job, job_list)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(
+            worker_num, initializer=_init_worker, initargs=(task_config_path_list,)
+        )
+        result_iter = pool.imap_unordered(run_job, job_list)
+    try:
+        for job_id, status, result, wall_time, error in result_iter:
+            base_row = {"job_id": job_id, "status": status, "wall_time": wall_time}
+            base_row.update(dict(
+                (key, job_list[job_id][1].get(key, None)) for key in SWEEP_KEY_LIST
+            ))
+            if status != "ok":
+                row_list = [dict(base_row, error=error.strip().split("\n")[-1])]
+            else:
+                row_list = []
+                for task_id, (latency, throughput, total_time) in sorted(result.items()):
+                    row_list.append(dict(base_row, task_id=task_id, latency=latency,
+                        throughput=throughput, total_time=total_time
+                    ))
+            yield row_list
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        else:
+            logging.disable(logging.NOTSET)
+
+@click.command(help="mnsim noc parameter sweep")
+@click.option("--config", type=str, default="config.yaml", help="base config file path")
+@click.option("--task", type=str, help="task file path list")
+@click.option("--sweep", type=str, default=None, help="sweep file path, with grid and list")
+@click.option("--grid", type=str, multiple=True, help="grid override, key=v1,v2")
+@click.option("--workers", type=int, default=1, help="worker number")
+@click.option("--output", type=str, default="sweep.csv", help="result csv file path")
+def main(config, task, sweep, grid, workers, output):
+    """
+    sweep function
+    """
+    array_config = read_yaml(config)
+    task_config_path_list = array_config.get("task_config_path_list", []) \
+        if task is None else task.split(",")
+    # get the override list
+    sweep_config = read_yaml(sweep) if sweep is not None else {}
+    sweep_grid = dict(sweep_config.get("grid", {}) or {})
+    sweep_grid.update(parse_grid_option(grid))
+    sweep_override_list = get_sweep_override_list(
+        sweep_grid, sweep_config.get("list", [])
+    )
+    if len(sweep_override_list) == 0:
+        sweep_override_list = [{}]
+    print(f"sweep {len(sweep_override_list)} jobs with {workers} workers")
+    # stream the result to the csv file
+    failed_number = 0
+    with open(output, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_KEY_LIST)
+        writer.writeheader()
+        for row_list in run_sweep(
+            array_config, sweep_override_list, task_config_path_list, workers
+        ):
+            writer.writerows(row_list)
+            f.flush()
+            for row in row_list:
+                if row["status"] != "ok":
+                    failed_number += 1
+                    print(f"job {row['job_id']} failed: {row['error']}")
+                else:
+                    print(f"job {row['job_id']} task {row['task_id']} done, " + \
+                        f"latency {row['latency']:.3f} ms")
+    print(f"sweep done, {failed_number} failed, result in {output}")
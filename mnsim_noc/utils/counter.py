@@ -0,0 +1,50 @@
+#-*-coding:utf-8-*-
+"""
+@FileName:
+    counter.py
+@Description:
+    counters registry shared by the components
+@CreateTime:
+    2026/10/18 18:05
+"""
+import collections
+
+# counter names, the cache counters are in pairs of name_hit and name_miss
+TIME_POINT = "time_point"
+MODULE_UPDATE = "module_update"
+COMPUTATION_START = "computation_start"
+COMPUTATION_BLOCKED_INPUT = "computation_blocked_input"
+COMPUTATION_BLOCKED_OUTPUT = "computation_blocked_output"
+SCHEDULE = "schedule"
+SCHEDULE_CHECK = "schedule_check"
+COMMUNICATION_NO_DATA = "communication_no_data"
+COMMUNICATION_BLOCKED_SPACE = "communication_blocked_space"
+TRANSFER_START = "transfer_start"
+TRANSFER_BLOCKED_WIRE = "transfer_blocked_wire"
+COMPUTATION_CACHE_HIT = "computation_cache_hit"
+COMPUTATION_CACHE_MISS = "computation_cache_miss"
+TRANSFER_TIME_CACHE_HIT = "transfer_time_cache_hit"
+TRANSFER_TIME_CACHE_MISS = "transfer_time_cache_miss"
+
+class Counters(collections.Counter):
+    """
+    counters registry, components increment the counter by name
+    one registry is shared by all components of the array
+    """
+    def get_hit_rate(self, name):
+        """
+        get the hit rate of the cache counter pair
+        """
+        hit = self[f"{name}_hit"]
+        total = hit + self[f"{name}_miss"]
+        return hit / total if total > 0 else 0.
+
+    def get_cache_name_list(self):
+        """
+        get the name of the cache counter pairs
+        """
+        return sorted(set(
+            key[:-len("_hit")] for key in self.keys() if key.endswith("_hit")
+        ) | set(
+            key[:-len("_miss")] for key in self.keys() if key.endswith("_miss")
+        ))
@@ -0,0 +1,136 @@
+#-*-coding:utf-8-*-
+"""
+@FileName:
+    event_queue.py
+@Description:
+    event queue for behavior-driven simulation
+@CreateTime:
+    2026/10/18 10:12
+"""
+import heapq
+
+class EventQueue(object):
+    """
+    event queue for behavior-driven simulation
+    update_module: list of modules, in the update order
+    modules push their end time when they start work
+    each module has at most one valid event, stale events are dropped lazily
+    only the wakeup modules are updated, in the update order
+    """
+    def __init__(self, update_module):
+        self.update_module = list(update_module)
+        self.module_index = dict(
+            (id(module), i) for i, module in enumerate(self.update_module)
+        )
+        # timed events, (end_time, index)
+        self.event_heap = []
+        self.event_time = [None] * len(self.update_module)
+        self.event_number = 0
+        # wakeup modules, all modules are wakeup at the beginning
+        self.wakeup_heap = list(range(len(self.update_module)))
+        self.wakeup_flag = [True] * len(self.update_module)
+        self.wakeup_delay = []
+        self.current_index = -1
+
+    def get_state(self):
+        """
+        get the state of the queue between two time points, for the checkpoint
+        """
+        assert self.current_index == -1 and len(self.wakeup_delay) == 0, \
+            "state can only be got between two time points"
+        return {
+            "event_heap": list(self.event_heap),
+            "event_time": list(self.event_time),
+            "event_number": self.event_number,
+            "wakeup_heap": list(self.wakeup_heap),
+            "wakeup_flag": list(self.wakeup_flag),
+        }
+
+    def set_state(self, state):
+        """
+        set the state of the queue, from the checkpoint
+        """
+        assert len(state["event_time"]) == len(self.update_module)
+        self.event_heap = list(state["event_heap"])
+        self.event_time = list(state["event_time"])
+        self.event_number = state["event_number"]
+        self.wakeup_heap = list(state["wakeup_heap"])
+        self.wakeup_flag = list(state["wakeup_flag"])
+        self.wakeup_delay = []
+        self.current_index = -1
+
+    def push(self, end_time, module):
+        """
+        push the end time of the module, override the former event
+        """
+        index = self.module_index[id(module)]
+        if self.event_time[index] is None:
+            self.event_number += 1
+        self.event_time[index] = end_time
+        heapq.heappush(self.event_heap, (end_time, index))
+
+    def wakeup(self, module):
+        """
+        wakeup the module, it will be updated in the update order
+        module before or at the current one is updated on the next time point
+        """
+        index = self.module_index[id(module)]
+        if self.wakeup_flag[index]:
+            return None
+        self.wakeup_flag[index] = True
+        if index > self.current_index:
+            heapq.heappush(self.wakeup_heap, index)
+        else:
+            self.wakeup_delay.append(index)
+        return None
+
+    def get_wakeup_module(self):
+        """
+        yield the wakeup modules in the update order
+        """
+        while len(self.wakeup_heap) > 0:
+            index = heapq.heappop(self.wakeup_heap)
+            self.wakeup_flag[index] = False
+            self.current_index = index
+            yield self.update_module[index]
+        self.current_index = -1
+        for index in self.wakeup_delay:
+            heapq.heappush(self.wakeup_heap, index)
+        self.wakeup_delay = []
+
+    def get_next_time(self, current_time):
+        """
+        get the next time point after current_time
+        events before or at current_time are already handled
+        modules with events on the next time point are wakeup
+        """
+        next_time = float("inf")
+        while len(self.event_heap) > 0:
+            end_time, index = self.event_heap[0]
+            if self.event_time[index] != end_time:
+                # stale event, overrided by the latest one
+                heapq.heappop(self.event_heap)
+                continue
+            if end_time <= current_time:
+                heapq.heappop(self.event_heap)
+                self._clear_event(index)
+                continue
+            if next_time == float("inf"):
+                next_time = end_time
+            if end_time > next_time:
+                break
+            # the event on the next time point
+            heapq.heappop(self.event_heap)
+            self._clear_event(index)
+            self.wakeup(self.update_module[index])
+        return next_time
+
+    def _clear_event(self, index):
+        """
+        clear the event of the module
+        """
+        self.event_time[index] = None
+        self.event_number -= 1
+
+    def __len__(self):
+        return self.event_number
@@ -0,0 +1,89 @@
+#-*-coding:utf-8-*-
+"""
+@FileName:
+    profiler.py
+@Description:
+    wall clock profiler for the phases of the simulation loop
+@CreateTime:
+    2026/10/18 17:45
+"""
+import time
+
+class Profiler(object):
+    """
+    wall clock profiler, cumulative time and call count for each phase
+    phase is the name like "update BaseTile", "schedule" and "next_time"
+    methods are wrapped on the instance, the loop itself is not changed
+    so there is no overhead when the profiler is not used
+    """
+    def __init__(self):
+        self.phase_time = {}
+        self.phase_count = {}
+        self.start_time = None
+        self.total_time = 0.
+        self.wrap_list = []
+
+    def wrap(self, obj, method_name, phase):
+        """
+        wrap the method of the object, the time of each call is added to the phase
+        """
+        method = getattr(obj, method_name)
+        def wrapper(*args, **kwargs):
+            start_time = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.add(phase, time.perf_counter() - start_time)
+        setattr(obj, method_name, wrapper)
+        self.wrap_list.append((obj, method_name))
+
+    def unwrap(self):
+        """
+        remove all the wrappers from the objects
+        """
+        for obj, method_name in self.wrap_list:
+            if method_name in obj.__dict__:
+                delattr(obj, method_name)
+        self.wrap_list = []
+
+    def start(self):
+        """
+        start the total clock
+        """
+        self.start_time = time.perf_counter()
+
+    def stop(self):
+        """
+        stop the total clock
+        """
+        if self.start_time is not None:
+            self.total_time += time.perf_counter() - self.start_time
+            self.start_time = None
+
+    def add(self, phase, elapsed_time):
+        """
+        add the elapsed time to the phase
+        """
+        if phase in self.phase_time:
+            self.phase_time[phase] += elapsed_time
+            self.phase_count[phase] += 1
+        else:
+            self.phase_time[phase] = elapsed_time
+            self.phase_count[phase] = 1
+
+    def get_result(self, event_number):
+        """
+        get the result dict, event_number is the number of time points
+        """
+        other_time = self.total_time - sum(self.phase_time.values())
+        return {
+            "total_time": self.total_time,
+            "other_time": other_time,
+            "event_number": event_number,
+            "events_per_second": event_number / self.total_time \
+                if self.total_time > 0 else float("inf"),
+            "phase": dict(
+                (phase, {"time": self.phase_time[phase], "count": self.phase_count[phase]})
+                for phase in sorted(self.phase_time, key=lambda k: -self.phase_time[k])
+            ),
+        }
@@ -9,6 +9,7 @@
 """
 import abc
 import collections
+import importlib
 
 from mnsim_noc.utils.log import getLogger
 
@@ -18,8 +19,27 @@ class RegistryError(Exception):
     pass
 
 LOGGER = getLogger("registry")
+
+# entry point group of the third-party classes, like mnsim_noc.mapping
+ENTRY_POINT_GROUP = "mnsim_noc.{}"
+
+def _get_entry_point_list(group):
+    """
+    get the entry point list of the group
+    """
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        return []
+    all_entry_points = entry_points()
+    if hasattr(all_entry_points, "select"):
+        return list(all_entry_points.select(group=group))
+    return list(all_entry_points.get(group, []))
+
 class RegistryMeta(abc.ABCMeta):
     registry_dict = collections.defaultdict(dict)
+    # lazy entry, the module is imported when the entry is first used
+    lazy_dict = collections.defaultdict(dict)
 
     def __init__(cls, name, bases, namespace):
         super(RegistryMeta, cls).__init__(name, bases, namespace)
@@ -48,10 +68,36 @@ class RegistryMeta(abc.ABCMeta):
                         )
                     )
 
+    @classmethod
+    def register_lazy(mcs, table, name, module_name):
+        """
+        register the entry by the module name, imported when first used
+        """
+        mcs.lazy_dict[table][name] = module_name
+
+    @classmethod
+    def _load_lazy(mcs, table, name):
+        """
+        load the lazy entry, then the entry point in the group of the table
+        """
+        if name in mcs.lazy_dict[table]:
+            importlib.import_module(mcs.lazy_dict[table].pop(name))
+            if name in mcs.registry_dict[table]:
+                return None
+        for entry_point in _get_entry_point_list(ENTRY_POINT_GROUP.format(table)):
+            if entry_point.name == name:
+                cls = entry_point.load()
+                # the class may be registered with another NAME
+                mcs.registry_dict[table].setdefault(name, cls)
+                return None
+        return None
+
     @classmethod
     def get_class(mcs, table, name):
+        if name not in mcs.registry_dict[table]:
+            mcs._load_lazy(table, name)
         try:
-            return mcs.all_classes(table)[name]
+            return mcs.registry_dict[table][name]
         except KeyError:
             raise RegistryError(
                 "No registry item {} available in registry {}.".format(
@@ -61,10 +107,15 @@ class RegistryMeta(abc.ABCMeta):
 
     @classmethod
     def all_classes(mcs, table):
-        try:
-            return mcs.registry_dict[table]
-        except KeyError:
+        # load all lazy entries and entry points
+        for name in list(mcs.lazy_dict[table].keys()):
+            mcs._load_lazy(table, name)
+        for entry_point in _get_entry_point_list(ENTRY_POINT_GROUP.format(table)):
+            if entry_point.name not in mcs.registry_dict[table]:
+                mcs._load_lazy(table, entry_point.name)
+        if table not in mcs.registry_dict:
             raise RegistryError("No registry table {} available.".format(table))
+        return mcs.registry_dict[table]
 
     @classmethod
     def avail_tables(mcs):
@@ -0,0 +1,26 @@
+#-*-coding:utf-8-*-
+"""
+@FileName:
+    result.py
+@Description:
+    latency and throughput of the image ranges
+@CreateTime:
+    2026/10/19 10:20
+"""
+
+def get_latency_throughput(computation_range):
+    """
+    get the average latency, average throughput and total time of one task
+    computation_range: list of (start, end) for each image
+    the throughput is None for only one image
+    """
+    image_num = len(computation_range)
+    latency = sum([x[1]-x[0] for x in computation_range])/image_num
+    throughput = None
+    if image_num > 1:
+        throughput = sum([
+            computation_range[i+1][1]-computation_range[i][1]
+            for i in range(image_num-1)
+        ])/(image_num-1)
+    total_time = computation_range[-1][1]-computation_range[0][0]
+    return latency, throughput, total_time
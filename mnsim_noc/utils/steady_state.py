@@ -0,0 +1,211 @@
+#-*-coding:utf-8-*-
+"""
+@FileName:
+    steady_state.py
+@Description:
+    steady state detection and extrapolation for large image number
+@CreateTime:
+    2026/10/18 17:10
+"""
+from mnsim_noc.utils.result import get_latency_throughput
+
+def get_pipeline_depth(tile_list):
+    """
+    get the tile number on the longest dependence chain of the tiles in one task
+    """
+    tile_dict = dict((tile.tile_id, tile) for tile in tile_list)
+    source_number = dict((tile_id, 0) for tile_id in tile_dict.keys())
+    for tile in tile_list:
+        for target_tile_id in tile.target_tile_id:
+            if target_tile_id in source_number:
+                source_number[target_tile_id] += 1
+    # longest chain ending on each tile, in the topological order
+    depth = dict((tile_id, 1) for tile_id in tile_dict.keys())
+    queue = [tile_id for tile_id, number in source_number.items() if number == 0]
+    for tile_id in queue:
+        for target_tile_id in tile_dict[tile_id].target_tile_id:
+            if target_tile_id in source_number:
+                depth[target_tile_id] = max(depth[target_tile_id], depth[tile_id] + 1)
+                source_number[target_tile_id] -= 1
+                if source_number[target_tile_id] == 0:
+                    queue.append(target_tile_id)
+    return max(depth.values())
+
+class SteadyStateDetector(object):
+    """
+    steady state detector for behavior-driven simulation
+    watch the start and completion interval of each image on each task
+    the pipeline is periodic when the variation of the last window intervals
+    are both within the tolerance of the mean completion interval
+    the window of each task is at least the pipeline depth, the tile number
+    on the longest dependence chain, so a back pressure has time to reach the end
+    each tile should also be periodic over the window, and no tile should be finished,
+    since a finished tile means the pipeline is draining
+    the latency can still drift, the start and end are periodic with different period
+    the remaining images on each tile are extrapolated with the period of the tile
+    a change after the window, like a buffer filling up later, is not predicted,
+    nor the drain of the last images after the first tiles finish
+    """
+    def __init__(self, tile_list, image_num, tolerance=0.01, window=8):
+        assert tolerance >= 0, "tolerance should be non-negative"
+        assert window >= 2, "window should be at least 2"
+        self.image_num = image_num
+        self.tolerance = tolerance
+        self.window = window
+        # tiles for each task, end tiles decide the image completion
+        self.task_tile = {}
+        self.task_end_tile = {}
+        for tile in tile_list:
+            self.task_tile.setdefault(tile.task_id, []).append(tile)
+            if tile.target_tile_id == [-1]:
+                self.task_end_tile.setdefault(tile.task_id, []).append(tile)
+        self.task_id_list = sorted(self.task_tile.keys())
+        # window of each task, scaled with the pipeline depth
+        self.task_window = dict(
+            (task_id, max(window, get_pipeline_depth(self.task_tile[task_id])))
+            for task_id in self.task_id_list
+        )
+        # the completed image number, and the range of each completed image
+        self.complete_number = dict((task_id, 0) for task_id in self.task_id_list)
+        self.image_range = dict((task_id, []) for task_id in self.task_id_list)
+        self.steady_flag = False
+
+    def get_state(self):
+        """
+        get the state of the detector, for the checkpoint
+        """
+        return {
+            "complete_number": dict(self.complete_number),
+            "image_range": dict((k, list(v)) for k, v in self.image_range.items()),
+            "steady_flag": self.steady_flag,
+        }
+
+    def set_state(self, state):
+        """
+        set the state of the detector, from the checkpoint
+        """
+        self.complete_number = dict(state["complete_number"])
+        self.image_range = dict((k, list(v)) for k, v in state["image_range"].items())
+        self.steady_flag = state["steady_flag"]
+
+    def _get_complete_number(self, task_id):
+        """
+        get the completed image number of the task
+        """
+        return min([
+            tile.computation_id // len(tile.dependence_list)
+            for tile in self.task_end_tile[task_id]
+        ])
+
+    def _get_image_range(self, task_id, image_id):
+        """
+        get the range of the image, first start and last end on all tiles
+        """
+        image_range = [tile.get_image_range()[image_id] for tile in self.task_tile[task_id]]
+        return (min([r[0] for r in image_range]), max([r[1] for r in image_range]))
+
+    def _get_interval(self, time_list, window):
+        """
+        get the last window intervals of the time list
+        """
+        return [
+            time_list[i] - time_list[i-1]
+            for i in range(len(time_list)-window, len(time_list))
+        ]
+
+    def _check_task_steady(self, task_id):
+        """
+        check if the task is steady or finished
+        """
+        image_range = self.image_range[task_id]
+        if len(image_range) >= self.image_num:
+            return True
+        # the first image fills the pipeline, not counted
+        window = self.task_window[task_id]
+        if len(image_range) < window + 2:
+            return False
+        end_interval = self._get_interval([r[1] for r in image_range], window)
+        start_interval = self._get_interval([r[0] for r in image_range], window)
+        threshold = self.tolerance * sum(end_interval) / len(end_interval)
+        if max(end_interval) - min(end_interval) > threshold or \
+            max(start_interval) - min(start_interval) > threshold:
+            return False
+        # a finished tile means the pipeline is draining,
+        # and each tile should be periodic on its own
+        for tile in self.task_tile[task_id]:
+            if tile.computation_id >= tile.computation_number:
+                return False
+            last_image_id = tile.computation_id // len(tile.dependence_list) - 1
+            if last_image_id < window:
+                return False
+            for time_list in [tile.image_start_time, tile.image_end_time]:
+                interval = self._get_interval(time_list[:last_image_id+1], window)
+                if max(interval) - min(interval) > threshold:
+                    return False
+        return True
+
+    def check(self):
+        """
+        update the completed images, return True when all tasks are steady
+        and some images are left to extrapolate
+        """
+        update_flag = False
+        for task_id in self.task_id_list:
+            complete_number = self._get_complete_number(task_id)
+            while self.complete_number[task_id] < complete_number:
+                self.image_range[task_id].append(
+                    self._get_image_range(task_id, self.complete_number[task_id])
+                )
+                self.complete_number[task_id] += 1
+                update_flag = True
+        if not update_flag:
+            return False
+        self.steady_flag = all([
+            self._check_task_steady(task_id) for task_id in self.task_id_list
+        ]) and any([
+            self.complete_number[task_id] < self.image_num for task_id in self.task_id_list
+        ])
+        return self.steady_flag
+
+    def extrapolate(self):
+        """
+        extrapolate the remaining images on each tile with the period of the tile
+        the images already completed on the tile are kept
+        return the simulated image number of each task
+        """
+        assert self.steady_flag, "extrapolate only in the steady state"
+        for task_id in self.task_id_list:
+            window = self.task_window[task_id]
+            for tile in self.task_tile[task_id]:
+                last_image_id = tile.computation_id // len(tile.dependence_list) - 1
+                if last_image_id + 1 >= self.image_num:
+                    continue
+                assert last_image_id >= window, "tile should be in the steady state"
+                start_time = tile.image_start_time[:last_image_id+1]
+                end_time = tile.image_end_time[:last_image_id+1]
+                start_period = sum(self._get_interval(start_time, window)) / window
+                end_period = sum(self._get_interval(end_time, window)) / window
+                for image_id in range(last_image_id + 1, self.image_num):
+                    tile.image_start_time[image_id] = \
+                        start_time[-1] + (image_id - last_image_id) * start_period
+                    tile.image_end_time[image_id] = \
+                        end_time[-1] + (image_id - last_image_id) * end_period
+        return dict(self.complete_number)
+
+def get_relative_error(extrapolated_time, full_time):
+    """
+    compare the complete time from show_latency_throughput
+    return the max relative error of the latency and throughput for each task
+    """
+    relative_error = {}
+    for task_id, full_range in full_time.items():
+        extrapolated_range = extrapolated_time[task_id]
+        error = []
+        for time_range in [full_range, extrapolated_range]:
+            latency, throughput, _ = get_latency_throughput(time_range)
+            error.append((latency, 0. if throughput is None else throughput))
+        relative_error[task_id] = max([
+            abs(e - f) / f if f != 0 else abs(e - f)
+            for f, e in zip(error[0], error[1])
+        ])
+    return relative_error
@@ -0,0 +1,286 @@
+#-*-coding:utf-8-*-
+"""
+@FileName:
+    task_io.py
+@Description:
+    columnar task behavior format, a directory of npy arrays
+@CreateTime:
+    2026/10/18 19:45
+"""
+import json
+import os
+import pickle
+import weakref
+
+import click
+import numpy as np
+
+__all__ = ["save_columnar_task", "load_columnar_task", "load_task_behavior"]
+
+FORMAT_NAME = "mnsim_noc_columnar_task"
+FORMAT_VERSION = 1
+# None in the data descriptor and the tile id
+NONE_VALUE = np.iinfo(np.int64).min
+DATA_FIELD_NUMBER = 10
+DEPENDENCE_KEY_LIST = ["wait", "output", "drop"]
+
+def _encode(value):
+    """
+    encode None to the NONE_VALUE
+    """
+    return NONE_VALUE if value is None else value
+
+def _decode(value):
+    """
+    decode the NONE_VALUE to None
+    """
+    return None if value == NONE_VALUE else value
+
+def _get_offset(length_list):
+    """
+    get the offset array from the length list
+    """
+    offset = np.zeros(len(length_list) + 1, dtype=np.int64)
+    np.cumsum(length_list, out=offset[1:])
+    return offset
+
+def save_columnar_task(task_behavior, dir_path):
+    """
+    save the task behavior (list of tile dict) to the directory
+    data descriptors are unique rows in data.npy, the lists are indices and offsets
+    """
+    os.makedirs(dir_path, exist_ok=True)
+    data_index = {}
+    data_list = []
+    array_dict = dict((key, []) for key in DEPENDENCE_KEY_LIST)
+    length_dict = dict((key, []) for key in DEPENDENCE_KEY_LIST)
+    latency_list = []
+    dependence_length = []
+    target_list, target_length = [], []
+    source_list, source_length = [], []
+    tile_list = []
+    for tile_behavior in task_behavior:
+        tile_list.append((tile_behavior["layer_id"], tile_behavior["tile_id"]))
+        target_list.extend(tile_behavior["target_tile_id"])
+        target_length.append(len(tile_behavior["target_tile_id"]))
+        source_list.extend(tile_behavior["source_tile_id"])
+        source_length.append(len(tile_behavior["source_tile_id"]))
+        dependence_length.append(len(tile_behavior["dependence"]))
+        for dependence in tile_behavior["dependence"]:
+            latency_list.append(dependence["latency"])
+            for key in DEPENDENCE_KEY_LIST:
+                length_dict[key].append(len(dependence[key]))
+                for data in dependence[key]:
+                    data_key = tuple(data)
+                    if data_key not in data_index:
+                        data_index[data_key] = len(data_list)
+                        data_list.append([_encode(v) for v in data])
+                    array_dict[key].append(data_index[data_key])
+    array = {
+        "tile": np.array(tile_list, dtype=np.int64).reshape(-1, 2),
+        "target": np.array(target_list, dtype=np.int64),
+        "target_offset": _get_offset(target_length),
+        "source": np.array(source_list, dtype=np.int64),
+        "source_offset": _get_offset(source_length),
+        "dependence_offset": _get_offset(dependence_length),
+        "latency": np.array(latency_list),
+        "data": np.array(data_list, dtype=np.int64).reshape(-1, DATA_FIELD_NUMBER),
+    }
+    for key in DEPENDENCE_KEY_LIST:
+        array[key] = np.array(array_dict[key], dtype=np.int64)
+        array[f"{key}_offset"] = _get_offset(length_dict[key])
+    for name, value in array.items():
+        np.save(os.path.join(dir_path, f"{name}.npy"), value)
+    with open(os.path.join(dir_path, "format.json"), "w") as f:
+        json.dump({
+            "format": FORMAT_NAME, "version": FORMAT_VERSION,
+            "tile_number": len(tile_list), "dependence_number": len(latency_list),
+            "data_number": len(data_list),
+        }, f)
+
+class ColumnarDependenceList(object):
+    """
+    dependence list of one tile, read from the columnar arrays on demand
+    the data table compiles it from the arrays, without the dict
+    """
+    def __init__(self, task, tile_index):
+        self.task = task
+        self.start = int(task.array["dependence_offset"][tile_index])
+        self.end = int(task.array["dependence_offset"][tile_index + 1])
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("dependence index out of range")
+        return self.task.get_dependence(self.start + index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def compile(self, data_table):
+        """
+        compile the dependence list against the data table
+        return the fields of the Dependence for each dependence
+        sizes are summed on the arrays, the split is direct for one source tile
+        """
+        base_id_map, size_map, tile_map = self.task.get_base_id_map(data_table)
+        number = len(self)
+        field_dict = {}
+        for key in DEPENDENCE_KEY_LIST:
+            offset = self.task.array[f"{key}_offset"][self.start:self.end+1]
+            index = self.task.array[key][offset[0]:offset[-1]]
+            offset = offset - offset[0]
+            base_id = base_id_map[index].tolist()
+            size = np.zeros(number, dtype=size_map.dtype)
+            single = np.ones(number, dtype=bool)
+            non_empty = offset[1:] > offset[:-1]
+            if len(index) > 0:
+                # reduceat on the start of the non empty segments
+                size[non_empty] = np.add.reduceat(size_map[index], offset[:-1][non_empty])
+                tile = tile_map[index]
+                single[non_empty] = np.maximum.reduceat(tile, offset[:-1][non_empty]) == \
+                    np.minimum.reduceat(tile, offset[:-1][non_empty])
+            offset = offset.tolist()
+            field_dict[key] = [
+                tuple(base_id[offset[i]:offset[i+1]]) for i in range(number)
+            ]
+            field_dict[f"{key}_size"] = size.tolist()
+            if key == "output":
+                continue
+            split_list = []
+            for data, data_size, single_flag in \
+                zip(field_dict[key], field_dict[f"{key}_size"], single.tolist()):
+                if len(data) == 0:
+                    split_list.append(())
+                elif single_flag:
+                    split_list.append(((data_table.data_tile[data[0]], data, data_size),))
+                else:
+                    split_list.append(data_table.split_data_list(data))
+            field_dict[f"{key}_split"] = split_list
+        field_dict["latency"] = self.task.array["latency"][self.start:self.end].tolist()
+        return list(zip(
+            field_dict["wait"], field_dict["output"], field_dict["drop"],
+            field_dict["latency"],
+            field_dict["wait_size"], field_dict["output_size"], field_dict["drop_size"],
+            field_dict["wait_split"], field_dict["drop_split"],
+        ))
+
+class ColumnarTask(list):
+    """
+    task behavior loaded from the columnar directory, list of tile dict
+    the dependence of each tile is a ColumnarDependenceList
+    """
+    def __init__(self, dir_path, mmap=True):
+        with open(os.path.join(dir_path, "format.json"), "r") as f:
+            info = json.load(f)
+        assert info["format"] == FORMAT_NAME and info["version"] == FORMAT_VERSION, \
+            f"{dir_path} is not the columnar task format"
+        self.dir_path = dir_path
+        self.array = {}
+        for file_name in os.listdir(dir_path):
+            if file_name.endswith(".npy"):
+                self.array[file_name[:-4]] = np.load(
+                    os.path.join(dir_path, file_name), mmap_mode="r" if mmap else None
+                )
+        # the data descriptor list, decoded once
+        self.data_descriptor = None
+        self.base_id_map = weakref.WeakKeyDictionary()
+        tile_behavior_list = []
+        for i, (layer_id, tile_id) in enumerate(self.array["tile"].tolist()):
+            tile_behavior_list.append({
+                "task_id": None,
+                "layer_id": layer_id,
+                "tile_id": tile_id,
+                "target_tile_id": self._get_slice("target", i),
+                "source_tile_id": self._get_slice("source", i),
+                "dependence": ColumnarDependenceList(self, i),
+            })
+        super(ColumnarTask, self).__init__(tile_behavior_list)
+
+    def _get_slice(self, key, index):
+        """
+        get the slice of the array with the offset, as list
+        """
+        offset = self.array[f"{key}_offset"]
+        return self.array[key][offset[index]:offset[index+1]].tolist()
+
+    def get_data_descriptor(self):
+        """
+        get the data descriptor list, None is decoded
+        """
+        if self.data_descriptor is None:
+            self.data_descriptor = [
+                [_decode(v) for v in data] for data in self.array["data"].tolist()
+            ]
+        return self.data_descriptor
+
+    def get_base_id_map(self, data_table):
+        """
+        get the base id, size and source tile of each data in the data table
+        interned once for each table
+        """
+        if data_table not in self.base_id_map:
+            base_id = list(data_table.intern_list(self.get_data_descriptor()))
+            self.base_id_map[data_table] = (
+                np.array(base_id, dtype=np.int64),
+                np.array([data_table.data_size[i] for i in base_id]),
+                # None tile is the input of the task, only to compare
+                np.array([
+                    -2 if data_table.data_tile[i] is None else data_table.data_tile[i]
+                    for i in base_id
+                ], dtype=np.int64),
+            )
+        return self.base_id_map[data_table]
+
+    def get_dependence(self, dependence_index):
+        """
+        get the dependence dict, the same as the pickle format
+        """
+        data_descriptor = self.get_data_descriptor()
+        dependence = {}
+        for key in DEPENDENCE_KEY_LIST:
+            offset = self.array[f"{key}_offset"]
+            dependence[key] = [
+                list(data_descriptor[i])
+                for i in self.array[key][offset[dependence_index]:offset[dependence_index+1]]
+            ]
+        dependence["latency"] = self.array["latency"][dependence_index].item()
+        return dependence
+
+    def __reduce__(self):
+        # pickled as the path, the arrays are opened again
+        return (ColumnarTask, (self.dir_path,))
+
+def load_columnar_task(dir_path, mmap=True):
+    """
+    load the columnar task, arrays are memory mapped
+    """
+    return ColumnarTask(dir_path, mmap)
+
+def load_task_behavior(task_path):
+    """
+    load the task behavior, columnar directory or pickle file
+    """
+    if os.path.isdir(task_path):
+        return load_columnar_task(task_path)
+    with open(task_path, "rb") as f:
+        return pickle.load(f)
+
+@click.command(help="convert the pickle task file to the columnar directory")
+@click.argument("pickle_path", type=str)
+@click.argument("dir_path", type=str)
+def main(pickle_path, dir_path):
+    """
+    convert function
+    """
+    with open(pickle_path, "rb") as f:
+        task_behavior = pickle.load(f)
+    save_columnar_task(task_behavior, dir_path)
+    print(f"convert {pickle_path} with {len(task_behavior)} tiles to {dir_path}")
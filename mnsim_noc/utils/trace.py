@@ -0,0 +1,114 @@
+#-*-coding:utf-8-*-
+"""
+@FileName:
+    trace.py
+@Description:
+    stream the simulation events to a fixed-width binary file
+@CreateTime:
+    2026/10/18 16:02
+"""
+import os
+import numpy as np
+
+__all__ = ["TRACE_DTYPE", "TraceWriter", "read_trace"]
+
+# event kind
+COMPUTATION_START = 0
+COMPUTATION_END = 1
+COMMUNICATION_START = 2
+COMMUNICATION_END = 3
+WIRE_START = 4
+WIRE_END = 5
+EVENT_NAME = [
+    "computation_start", "computation_end",
+    "communication_start", "communication_end",
+    "wire_start", "wire_end",
+]
+
+# time, event kind, module id (tile, communication or wire index) and data
+# data is the computation id for tile, the first transfer data id for communication
+# and the communication index for wire
+TRACE_DTYPE = np.dtype([
+    ("time", "<f8"),
+    ("event", "u1"),
+    ("module", "<i4"),
+    ("data", "<i8"),
+])
+
+class TraceWriter(object):
+    """
+    trace writer, events are buffered in chunks and appended to the file
+    the file is raw records of TRACE_DTYPE, without header
+    event_number: keep the first event_number events in the file and append
+        after them, for the resume from the checkpoint
+    """
+    def __init__(self, file_path, chunk_size=65536, event_number=0):
+        self.file_path = file_path
+        self.chunk = np.zeros(chunk_size, dtype=TRACE_DTYPE)
+        self.chunk_position = 0
+        self.event_number = event_number
+        if event_number > 0:
+            self.file = open(file_path, "r+b")
+            self.file.truncate(event_number * TRACE_DTYPE.itemsize)
+            self.file.seek(0, os.SEEK_END)
+        else:
+            self.file = open(file_path, "wb")
+
+    def record(self, time, event, module, data=-1):
+        """
+        record one event
+        """
+        if self.chunk_position >= len(self.chunk):
+            self.flush()
+        self.chunk[self.chunk_position] = (time, event, module, data)
+        self.chunk_position += 1
+
+    def record_path(self, time, event, path_index, data):
+        """
+        record the event for each wire in the path
+        """
+        if self.chunk_position + len(path_index) > len(self.chunk):
+            self.flush()
+        if len(path_index) > len(self.chunk):
+            for index in path_index:
+                self.record(time, event, index, data)
+            return None
+        chunk = self.chunk[self.chunk_position:self.chunk_position+len(path_index)]
+        chunk["time"] = time
+        chunk["event"] = event
+        chunk["module"] = path_index
+        chunk["data"] = data
+        self.chunk_position += len(path_index)
+        return None
+
+    def flush(self):
+        """
+        write the buffered events to the file
+        """
+        if self.chunk_position > 0:
+            self.file.write(self.chunk[:self.chunk_position].tobytes())
+            self.event_number += self.chunk_position
+            self.chunk_position = 0
+        self.file.flush()
+
+    def close(self):
+        """
+        flush and close the file
+        """
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+def read_trace(file_path):
+    """
+    read the trace file through a memory map
+    """
+    if os.path.getsize(file_path) == 0:
+        return np.zeros(0, dtype=TRACE_DTYPE)
+    return np.memmap(file_path, dtype=TRACE_DTYPE, mode="r")
@@ -0,0 +1,158 @@
+#-*-coding:utf-8-*-
+"""
+@FileName:
+    workload.py
+@Description:
+    synthetic task behavior generator, for the test and the benchmark
+@CreateTime:
+    2026/10/18 18:30
+"""
+
+def _get_data(x, y, start, end, bit, total, layer_id, tile_id):
+    """
+    get the data descriptor
+    (x, y, start, end, bit, total, image_id, layer_id, in_id, tile_id)
+    """
+    return [x, y, start, end, bit, total, None, layer_id, -1, tile_id]
+
+def _get_source_data(x, y, source_tile, channel, bit):
+    """
+    get the input data from the source tile, None for the input of the task
+    source_tile: (tile id, start, end, layer id)
+    """
+    if source_tile is None:
+        return [x, y, 0, channel, bit, channel, None, None, -1, None]
+    tile_id, start, end, layer_id = source_tile
+    return _get_data(x, y, start, end, bit, channel, layer_id, tile_id)
+
+def _get_window(x, y, radius, feature_map_size):
+    """
+    get the input points in the window of the output point, row major
+    """
+    return [
+        (i, j)
+        for i in range(max(x - radius, 0), min(x + radius, feature_map_size - 1) + 1)
+        for j in range(max(y - radius, 0), min(y + radius, feature_map_size - 1) + 1)
+    ]
+
+def _get_source_tile(consumer_index, consumer_num, producer_num, fan_in):
+    """
+    get the index of the producer tiles for the consumer tile
+    each consumer waits on fan_in producers, every producer has one consumer at least
+    """
+    if fan_in is None or fan_in >= producer_num:
+        return list(range(producer_num))
+    source = set((consumer_index * producer_num // consumer_num + i) % producer_num
+        for i in range(fan_in)
+    )
+    # producers not covered by any consumer are given to one consumer
+    for producer_index in range(producer_num):
+        if producer_index * consumer_num // producer_num == consumer_index:
+            source.add(producer_index)
+    return sorted(source)
+
+def generate_task_behavior(layer_num=4, tile_per_layer=2, fan_in=None,
+    merge_interval=0, feature_map_size=4, channel=16, bit=8, radius=1, latency=10
+):
+    """
+    generate a task behavior list in the same dict format as the task file
+    layer_num: the number of layers, in a chain
+    tile_per_layer: int or list, the output channel of each layer is split on the tiles
+    fan_in: the number of former tiles each tile waits on, None for all
+    merge_interval: every merge_interval layers, the layer is an element sum of
+        the former layer and the layer merge_interval before, 0 for no merge
+    feature_map_size: the output is feature_map_size x feature_map_size points
+    radius: the window radius of the input points for each output point
+        0 for the element sum like layer
+    latency: the computation latency of each output point
+    """
+    if isinstance(tile_per_layer, int):
+        tile_per_layer = [tile_per_layer] * layer_num
+    assert len(tile_per_layer) == layer_num, "tile_per_layer should be for each layer"
+    assert all([0 < n <= channel for n in tile_per_layer]), \
+        "tile number should be in (0, channel]"
+    # tile id, channel range and layer id of each layer
+    layer_tile = []
+    tile_id = 0
+    for layer_id, tile_num in enumerate(tile_per_layer):
+        layer_tile.append([
+            (tile_id + i, channel * i // tile_num, channel * (i + 1) // tile_num, layer_id)
+            for i in range(tile_num)
+        ])
+        tile_id += tile_num
+    # source of each layer, list of (layer id, radius)
+    layer_source = [[(-1, radius)]]
+    for layer_id in range(1, layer_num):
+        if merge_interval > 0 and layer_id % merge_interval == 0 \
+            and layer_id - merge_interval >= 0:
+            layer_source.append([(layer_id - 1, 0), (layer_id - merge_interval, 0)])
+        else:
+            layer_source.append([(layer_id - 1, radius)])
+    # source tile of each tile, key is tile id, value is list of (tile, radius)
+    tile_source = {}
+    for layer_id in range(layer_num):
+        for consumer_index, consumer_tile in enumerate(layer_tile[layer_id]):
+            consumer_tile_id = consumer_tile[0]
+            tile_source[consumer_tile_id] = []
+            for source_layer_id, source_radius in layer_source[layer_id]:
+                if source_layer_id == -1:
+                    tile_source[consumer_tile_id].append((None, source_radius))
+                    continue
+                for producer_index in _get_source_tile(consumer_index,
+                    len(layer_tile[layer_id]), len(layer_tile[source_layer_id]), fan_in
+                ):
+                    tile_source[consumer_tile_id].append(
+                        (layer_tile[source_layer_id][producer_index], source_radius)
+                    )
+    # target tile of each tile
+    tile_target = dict((tile[0], []) for tiles in layer_tile for tile in tiles)
+    for consumer_tile_id, source_list in tile_source.items():
+        for source_tile, _ in source_list:
+            if source_tile is not None and consumer_tile_id not in tile_target[source_tile[0]]:
+                tile_target[source_tile[0]].append(consumer_tile_id)
+    # tile behavior
+    task_behavior = []
+    point_list = [(x, y) for x in range(feature_map_size) for y in range(feature_map_size)]
+    for layer_id in range(layer_num):
+        for tile_id, start, end, _ in layer_tile[layer_id]:
+            source_list = tile_source[tile_id]
+            # the last point needs the input point, drop it there
+            last_need = {}
+            for x, y in point_list:
+                for source_tile, source_radius in source_list:
+                    for i, j in _get_window(x, y, source_radius, feature_map_size):
+                        last_need[(i, j, source_tile)] = (x, y)
+            drop_dict = {}
+            for (i, j, source_tile), point in last_need.items():
+                drop_dict.setdefault(point, []).append((i, j, source_tile))
+            dependence = []
+            for x, y in point_list:
+                wait = []
+                for source_tile, source_radius in source_list:
+                    for i, j in _get_window(x, y, source_radius, feature_map_size):
+                        wait.append(_get_source_data(i, j, source_tile, channel, bit))
+                drop = [
+                    _get_source_data(i, j, source_tile, channel, bit)
+                    for i, j, source_tile in sorted(drop_dict.get((x, y), []),
+                        key=lambda v: (v[0], v[1], -1 if v[2] is None else v[2][0])
+                    )
+                ]
+                dependence.append({
+                    "wait": wait,
+                    "output": [_get_data(x, y, start, end, bit, channel, layer_id, tile_id)],
+                    "drop": drop,
+                    "latency": latency,
+                })
+            task_behavior.append({
+                "task_id": None,
+                "layer_id": layer_id,
+                "tile_id": tile_id,
+                "target_tile_id": tile_target[tile_id] if len(tile_target[tile_id]) > 0 \
+                    else [-1],
+                "source_tile_id": sorted(set(
+                    -1 if source_tile is None else source_tile[0]
+                    for source_tile, _ in source_list
+                )),
+                "dependence": dependence,
+            })
+    return task_behavior
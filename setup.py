@@ -74,6 +74,9 @@ setup(
     entry_points={
         "console_scripts": [
             "mnsim_noc=mnsim_noc.main:main",
+            "mnsim_noc_sweep=mnsim_noc.sweep:main",
+            "mnsim_noc_benchmark=mnsim_noc.benchmark:main",
+            "mnsim_noc_convert=mnsim_noc.utils.task_io:main",
         ]
     },
 
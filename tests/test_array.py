@@ -145,3 +145,127 @@ def test_array():
     )
     array.run()
     array.show_simulation_result()
+
+def test_array_trace(tmp_path):
+    """
+    test array with the binary trace
+    """
+    from mnsim_noc.utils.trace import read_trace, COMPUTATION_START, \
+        COMMUNICATION_END, WIRE_START
+    trace_path = str(tmp_path / "trace.bin")
+    array = BaseArray(get_test_config(), 2, (3, 3), (4096, 4096), 1,
+        mapping_strategy="snake"
+    )
+    array.run(trace_path=trace_path)
+    trace = read_trace(trace_path)
+    assert (trace["event"] == COMPUTATION_START).sum() == \
+        sum([len(tile.computation_range_time) for tile in array.tile_list])
+    assert (trace["event"] == COMMUNICATION_END).sum() == \
+        sum([len(c.communication_range_time) for c in array.communication_list])
+    assert (trace["event"] == WIRE_START).sum() > 0
+    assert (trace["time"][1:] >= trace["time"][:-1]).all()
+
+def test_array_statistics_only():
+    """
+    test array in the statistics only mode, same result as the full mode
+    """
+    result = []
+    for statistics_only in [False, True]:
+        array = BaseArray(get_test_config(), 2, (3, 3), (4096, 4096), 1,
+            mapping_strategy="snake"
+        )
+        array.run(statistics_only=statistics_only)
+        result.append((
+            array.show_latency_throughput(),
+            [rate.tolist() for rate in array.show_tile_wire_rate()],
+        ))
+    assert result[0] == result[1]
+    assert len(array.time_point_list) == 0
+    assert all([len(tile.computation_range_time) == 0 for tile in array.tile_list])
+
+def test_array_steady_state():
+    """
+    test array with the steady state extrapolation, within the tolerance of the full run
+    small buffers keep the first tile from finishing early, only the last image drains
+    """
+    from mnsim_noc.utils.steady_state import get_relative_error
+    result = []
+    for steady_state_tolerance in [None, 0.01]:
+        array = BaseArray(get_test_config(), 100, (3, 3), (128, 128), 1,
+            mapping_strategy="snake"
+        )
+        array.run(statistics_only=True, steady_state_tolerance=steady_state_tolerance)
+        result.append(array.show_latency_throughput())
+    assert array.simulated_image_num[0] < 100
+    assert get_relative_error(result[1], result[0])[0] < 0.01
+
+def test_array_steady_state_drain():
+    """
+    test the steady state is not reported when the pipeline is draining,
+    large buffers let the first tiles finish all the images early
+    """
+    from mnsim_noc.utils.steady_state import get_relative_error
+    from mnsim_noc.utils.workload import generate_task_behavior
+    task_behavior = generate_task_behavior(layer_num=6, tile_per_layer=2, fan_in=2,
+        merge_interval=2, feature_map_size=4
+    )
+    result = []
+    for steady_state_tolerance in [None, 0.01]:
+        array = BaseArray([task_behavior], 30, (4, 4), (65536, 65536), 1)
+        array.run(statistics_only=True, steady_state_tolerance=steady_state_tolerance)
+        result.append(array.show_latency_throughput())
+    assert get_relative_error(result[1], result[0])[0] < 0.01
+
+def test_array_checkpoint(tmp_path):
+    """
+    test array resumed from the checkpoint, same result as the full run
+    """
+    checkpoint_path = str(tmp_path / "checkpoint.pkl")
+    result = []
+    for run_kwargs in [
+        {},
+        {"checkpoint_path": checkpoint_path, "checkpoint_events": 10},
+        {"resume_path": checkpoint_path},
+    ]:
+        array = BaseArray(get_test_config(), 4, (3, 3), (4096, 4096), 1,
+            mapping_strategy="snake"
+        )
+        array.run(**run_kwargs)
+        result.append((
+            array.show_latency_throughput(),
+            array.time_point_list,
+            [tile.computation_range_time for tile in array.tile_list],
+            array.wire_net.wire_busy_time.tolist(),
+        ))
+    assert result[0] == result[1] == result[2]
+
+def test_array_profile():
+    """
+    test array with the profile of the phases
+    """
+    array = BaseArray(get_test_config(), 2, (3, 3), (4096, 4096), 1,
+        mapping_strategy="snake"
+    )
+    array.run(profile=True)
+    result = array.show_profile()
+    assert result["event_number"] == array.time_point_number
+    assert result["phase"]["schedule"]["count"] == array.time_point_number + 1
+    assert "update BaseTile" in result["phase"]
+    assert "update" not in array.tile_list[0].__dict__
+
+def test_array_counters():
+    """
+    test array counters
+    """
+    array = BaseArray(get_test_config(), 2, (3, 3), (4096, 4096), 1,
+        mapping_strategy="snake"
+    )
+    array.run()
+    result = array.get_counters()
+    counters = result["counters"]
+    assert counters["computation_start"] == \
+        sum([tile.computation_number for tile in array.tile_list])
+    assert counters["transfer_start"] == \
+        sum([len(c.communication_range_time) for c in array.communication_list])
+    assert counters["time_point"] == array.time_point_number
+    assert 0 <= result["hit_rate"]["transfer_time_cache"] <= 1
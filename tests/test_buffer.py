@@ -9,6 +9,7 @@
 @CreateTime:
     2022/05/07 11:09
 """
+from mnsim_noc.Buffer.data_table import DataTable
 from mnsim_noc.Buffer.input_buffer import InputBuffer
 from mnsim_noc.Buffer.output_buffer import OutputBuffer
 
@@ -16,15 +17,17 @@ def test_buffer():
     """
     test buffer of input and output
     """
-    # buffer data example
-    data_list = [
+    # buffer data example, as data id in the data table
+    data_table = DataTable()
+    data_list = [data_table.get_data_id(data) for data in [
         [0, 0, 0, 3, 9, 3, 0, 0, -1, 0],
         [0, 1, 0, 3, 9, 3, 0, 0, -1, 0],
         [1, 0, 0, 3, 9, 3, 0, 0, -1, 0],
         [1, 1, 0, 3, 9, 3, 0, 0, -1, 0],
-    ]
+    ]]
+    assert data_table.get_data(data_list[1]) == [0, 1, 0, 3, 9, 3, 0, 0, -1, 0]
     # init input buffer, with data and transfer data list
-    input_buffer = InputBuffer(256)
+    input_buffer = InputBuffer(256, data_table)
     input_buffer.add_transfer_data_list(data_list[1:2])
     # for communication example on the tile input buffer
     # judge part
@@ -41,7 +44,7 @@ def test_buffer():
     input_buffer.delete_data_list(data_list[2:3])
 
     # init output buffer
-    output_buffer = OutputBuffer(256)
+    output_buffer = OutputBuffer(256, data_table)
     # for computation example on the tile output buffer
     # judge part
     assert(output_buffer.check_remain_size() == 256)
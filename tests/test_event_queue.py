@@ -0,0 +1,38 @@
+#-*-coding:utf-8-*-
+"""
+@FileName:
+    test_event_queue.py
+@Description:
+    test event queue for behavior driven
+@CreateTime:
+    2026/10/18 10:40
+"""
+from mnsim_noc.utils.event_queue import EventQueue
+
+def test_event_queue():
+    """
+    test event queue, lazy invalidation and wakeup order
+    """
+    module_list = [object() for _ in range(3)]
+    event_queue = EventQueue(module_list)
+    # all modules are wakeup at the beginning
+    assert list(event_queue.get_wakeup_module()) == module_list
+    assert list(event_queue.get_wakeup_module()) == []
+    event_queue.push(3., module_list[0])
+    event_queue.push(2., module_list[2])
+    assert event_queue.get_next_time(0.) == 2.
+    assert list(event_queue.get_wakeup_module()) == [module_list[2]]
+    # override the event of module 0
+    event_queue.push(5., module_list[0])
+    assert event_queue.get_next_time(2.) == 5.
+    # wakeup before the current module is delayed to the next time point
+    wakeup_module = []
+    for module in event_queue.get_wakeup_module():
+        wakeup_module.append(module)
+        if module is module_list[0]:
+            event_queue.wakeup(module_list[0])
+            event_queue.wakeup(module_list[1])
+    assert wakeup_module == [module_list[0], module_list[1]]
+    assert list(event_queue.get_wakeup_module()) == [module_list[0]]
+    assert event_queue.get_next_time(5.) == float("inf")
+    assert len(event_queue) == 0
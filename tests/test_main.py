@@ -0,0 +1,63 @@
+#-*-coding:utf-8-*-
+"""
+@FileName:
+    test_main.py
+@Description:
+    test the command line entry
+@CreateTime:
+    2026/10/18 22:30
+"""
+import pickle
+import yaml
+from click.testing import CliRunner
+import mnsim_noc.main
+from mnsim_noc.main import main
+from test_array import get_test_config
+
+
+def get_config_path(tmp_path):
+    """
+    get the config path of the test task
+    """
+    task_path = str(tmp_path / "task.pkl")
+    with open(task_path, "wb") as f:
+        pickle.dump(get_test_config()[0], f)
+    config_path = str(tmp_path / "config.yaml")
+    with open(config_path, "w") as f:
+        yaml.safe_dump({
+            "image_num": 2, "tile_array_row": 3, "tile_array_col": 3,
+            "input_buffer_size": 4096, "output_buffer_size": 4096,
+            "task_config_path_list": [task_path],
+        }, f)
+    return config_path
+
+
+def test_mapping_option(tmp_path):
+    """
+    test the mapping options are only given to the strategies accepting them
+    """
+    config_path = get_config_path(tmp_path)
+    runner = CliRunner()
+    result = runner.invoke(main, ["--config", config_path, "-M", "anneal", "--seed", "1"])
+    assert result.exit_code == 0, result.output
+    result = runner.invoke(main, ["--config", config_path, "-M", "commwise", "--seed", "1"])
+    assert result.exit_code == 2
+    assert "--seed does not apply to the mapping strategy commwise" in result.output
+
+
+def test_validate_steady_state(tmp_path, monkeypatch):
+    """
+    test the full run of the validation has the same seed of the random mapping
+    """
+    config_path = get_config_path(tmp_path)
+    seed_list = []
+    class SeedArray(mnsim_noc.main.BaseArray):
+        def __init__(self, *args, **kwargs):
+            super(SeedArray, self).__init__(*args, **kwargs)
+            seed_list.append(self.mapping_strategy.seed)
+    monkeypatch.setattr(mnsim_noc.main, "BaseArray", SeedArray)
+    result = CliRunner().invoke(main, ["--config", config_path, "-M", "anneal",
+        "--steady_state", "0.01", "--validate_steady_state"
+    ])
+    assert result.exit_code == 0, result.output
+    assert len(seed_list) == 2 and seed_list[0] == seed_list[1]
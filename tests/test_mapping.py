@@ -0,0 +1,161 @@
+#-*-coding:utf-8-*-
+"""
+@FileName:
+    test_mapping.py
+@Description:
+    test the mapping strategy
+@CreateTime:
+    2026/10/18 20:20
+"""
+import random
+import numpy as np
+import pytest
+from mnsim_noc.Strategy.mapping import Mapping, get_rank_list
+from mnsim_noc.Strategy.search_mapping import Individual, NSGA_II, \
+    get_link_array, get_population_comm, get_non_dominated_rank, get_crowding_distance
+from mnsim_noc.Strategy.placement import PlacementState
+from mnsim_noc.utils.workload import generate_task_behavior
+
+def test_population_comm():
+    """
+    test the vectorized total comm is the same as the individual one
+    """
+    random.seed(0)
+    tile_num = 12
+    rank_list = [((i, (i * 5 + 1) % tile_num), (i + 1) * 7) for i in range(tile_num)]
+    population = []
+    for _ in range(6):
+        individual = Individual(4, 4, tile_num, rank_list)
+        individual.random_mapping()
+        individual.update_total_comm()
+        population.append(individual)
+    position = np.array([individual.position_list for individual in population])
+    total_comm = get_population_comm(position, *get_link_array(rank_list))
+    assert total_comm.tolist() == [individual.total_comm for individual in population]
+
+def test_nsga2_island():
+    """
+    test the island nsga2 mapping only depends on the seed and the island number
+    """
+    task_behavior = generate_task_behavior(layer_num=3, tile_per_layer=3, fan_in=2)
+    for tile_behavior in task_behavior:
+        tile_behavior["task_id"] = 0
+    position_list_list = []
+    for workers in [1, 2]:
+        mapping = NSGA_II([task_behavior], 1, (4, 4), (1, 1), 1,
+            population=12, generation=5, island=3, seed=7,
+            migration_interval=2, migration_size=1, workers=workers
+        )
+        position_list_list.append(mapping._get_position_list(task_behavior))
+    assert position_list_list[0] == position_list_list[1]
+    assert len(set(position_list_list[0])) == len(task_behavior)
+
+def test_genetic_operator():
+    """
+    test the operators keep a permutation and the incremental total comm is right
+    """
+    rng = random.Random(1)
+    tile_num = 10
+    rank_list = [((i, (i * 3 + 2) % tile_num), i + 1) for i in range(tile_num)]
+    parent_list = []
+    for _ in range(2):
+        individual = Individual(4, 4, tile_num, rank_list, rng)
+        individual.random_mapping()
+        individual.update_total_comm()
+        parent_list.append(individual)
+    for _ in range(50):
+        for method in ["mutation_exchange", "mutation_reverse", "mutation_insert"]:
+            child = parent_list[0]._new_individual()
+            getattr(child, method)(parent_list[0])
+            assert sorted(child.slot_list) == list(range(16))
+            if child.total_comm is not None:
+                total_comm = child.total_comm
+                child.update_total_comm()
+                assert total_comm == child.total_comm
+        for method in ["ox", "pmx"]:
+            child = parent_list[0]._new_individual()
+            child.crossover(parent_list[0], parent_list[1], method)
+            assert sorted(child.slot_list) == list(range(16))
+            assert len(set(child.position_list)) == tile_num
+    with pytest.raises(AssertionError):
+        parent_list[0]._new_individual().crossover(parent_list[0], parent_list[1], "cx")
+
+def test_placement_state():
+    """
+    test the incremental distance field and the free cell queries
+    """
+    rng = random.Random(2)
+    placement = PlacementState(5, 7)
+    placement.get_most_open()
+    occupied = []
+    for _ in range(20):
+        loc = placement.get_free(rng.randrange(placement.free_number))
+        assert placement.get_nearest_free(loc) != loc
+        placement.place(loc)
+        occupied.append(loc)
+        # brute force distance to the border and the occupied cells
+        distance = [
+            min([min(5 - row, row + 1, 7 - column, column + 1)] + \
+                [abs(row - r) + abs(column - c) for r, c in occupied])
+            for row in range(5) for column in range(7)
+        ]
+        assert placement.distance == distance
+        free_list = [(row, column) for row in range(5) for column in range(7)
+            if (row, column) not in occupied
+        ]
+        assert placement.get_free(0) == free_list[0]
+        assert placement.get_free(placement.free_number - 1) == free_list[-1]
+    placement.remove(occupied[0])
+    assert placement.is_free(occupied[0])
+    placement.get_most_open()
+    assert placement.distance[occupied[0][0] * 7 + occupied[0][1]] > 0
+
+def test_anneal():
+    """
+    test the seeded anneal mapping with the default move budget is reproducible
+    and not worse than the commwise mapping
+    """
+    task_behavior = generate_task_behavior(layer_num=4, tile_per_layer=4, merge_interval=2)
+    for tile_behavior in task_behavior:
+        tile_behavior["task_id"] = 0
+    rank_list = get_rank_list(task_behavior)
+    def get_total_comm(position_list):
+        return sum(comm * (abs(position_list[i][0] - position_list[j][0]) + \
+            abs(position_list[i][1] - position_list[j][1])) for (i, j), comm in rank_list
+        )
+    commwise = Mapping.get_class_("commwise")([task_behavior], 1, (5, 5), (1, 1), 1)
+    position_list_list = []
+    for _ in range(2):
+        mapping = Mapping.get_class_("anneal")([task_behavior], 1, (5, 5), (1, 1), 1, seed=3)
+        position_list_list.append(mapping._get_position_list(task_behavior))
+    assert position_list_list[0] == position_list_list[1]
+    assert len(set(position_list_list[0])) == len(task_behavior)
+    assert get_total_comm(position_list_list[0]) <= \
+        get_total_comm(commwise._get_position_list(task_behavior))
+
+def test_non_dominated_sort():
+    """
+    test the non dominated rank and the crowding distance
+    """
+    objective = np.array([[1, 5], [2, 3], [4, 1], [3, 4], [5, 5], [2, 3]])
+    rank = get_non_dominated_rank(objective)
+    assert rank.tolist() == [0, 0, 0, 1, 2, 0]
+    distance = get_crowding_distance(objective, rank)
+    assert np.isinf(distance[[0, 2, 3, 4]]).all()
+    assert np.isfinite(distance[[1, 5]]).all()
+
+def test_nsga2_comm_load():
+    """
+    test the multi objective nsga2 mapping is reproducible
+    """
+    task_behavior = generate_task_behavior(layer_num=3, tile_per_layer=3)
+    for tile_behavior in task_behavior:
+        tile_behavior["task_id"] = 0
+    position_list_list = []
+    for _ in range(2):
+        mapping = NSGA_II([task_behavior], 1, (4, 4), (1, 1), 1,
+            population=10, generation=4, seed=5, objective="comm_load"
+        )
+        position_list_list.append(mapping._get_position_list(task_behavior))
+    assert position_list_list[0] == position_list_list[1]
+    assert len(set(position_list_list[0])) == len(task_behavior)
@@ -0,0 +1,50 @@
+#-*-coding:utf-8-*-
+"""
+@FileName:
+    test_startup.py
+@Description:
+    test the startup import and the lazy registry
+@CreateTime:
+    2026/10/18 19:30
+"""
+import subprocess
+import sys
+from mnsim_noc.benchmark import run_startup
+from mnsim_noc.utils import RegistryMeta
+from mnsim_noc.Strategy.mapping import Mapping, NaiveMapping
+
+def test_startup():
+    """
+    test no heavy module is imported on the startup
+    """
+    _, heavy_module = run_startup(repeat=1)
+    assert heavy_module == []
+    # the search mapping is registered lazily
+    code = "import sys, mnsim_noc.main; " + \
+        "print('mnsim_noc.Strategy.search_mapping' in sys.modules, 'multiprocessing' in sys.modules)"
+    output = subprocess.check_output([sys.executable, "-c", code]).decode().split()
+    assert output == ["False", "False"]
+
+def test_lazy_registry(tmp_path, monkeypatch):
+    """
+    test the lazy entry is imported when first used
+    """
+    with open(tmp_path / "mnsim_noc_lazy_mapping.py", "w") as f:
+        f.write(
+            "from mnsim_noc.Strategy.mapping import NaiveMapping\n"
+            "class LazyMapping(NaiveMapping):\n"
+            "    NAME = 'lazy_test'\n"
+        )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    RegistryMeta.register_lazy("mapping", "lazy_test", "mnsim_noc_lazy_mapping")
+    assert "lazy_test" not in RegistryMeta.registry_dict["mapping"]
+    assert "mnsim_noc_lazy_mapping" not in sys.modules
+    assert issubclass(Mapping.get_class_("lazy_test"), NaiveMapping)
+    assert "mnsim_noc_lazy_mapping" in sys.modules
+
+def test_search_mapping_lazy():
+    """
+    test the nsga2 and anneal mapping are loaded by name
+    """
+    assert Mapping.get_class_("nsga2").__module__ == "mnsim_noc.Strategy.search_mapping"
+    assert issubclass(Mapping.get_class_("anneal"), Mapping)
@@ -0,0 +1,57 @@
+#-*-coding:utf-8-*-
+"""
+@FileName:
+    test_steady_state.py
+@Description:
+    test the steady state detector
+@CreateTime:
+    2026/10/18 23:55
+"""
+from mnsim_noc.utils.steady_state import SteadyStateDetector, get_pipeline_depth
+
+
+class ChainTile(object):
+    """
+    tile on a chain, one computation for each image
+    """
+    def __init__(self, tile_id, tile_num, image_num):
+        self.task_id = 0
+        self.tile_id = tile_id
+        self.target_tile_id = [tile_id + 1] if tile_id < tile_num - 1 else [-1]
+        self.dependence_list = [None]
+        self.computation_id = 0
+        self.computation_number = image_num
+        self.image_start_time = [0.] * image_num
+        self.image_end_time = [0.] * image_num
+
+    def get_image_range(self):
+        return list(zip(self.image_start_time, self.image_end_time))
+
+
+def test_steady_state_depth():
+    """
+    test the periodic start of a deep pipeline, then a throughput change
+    the detector should not fire before the change
+    """
+    tile_num, image_num, change_image = 12, 40, 12
+    tile_list = [ChainTile(tile_id, tile_num, image_num) for tile_id in range(tile_num)]
+    assert get_pipeline_depth(tile_list) == tile_num
+    # period 10 for the first images, then 20 when a buffer is full
+    base_time = [10. * min(i, change_image) + 20. * max(i - change_image, 0)
+        for i in range(image_num)
+    ]
+    detector = SteadyStateDetector(tile_list, image_num, tolerance=0.01, window=8)
+    assert detector.task_window[0] == tile_num
+    steady_image = None
+    for image_id in range(image_num):
+        for tile in tile_list:
+            tile.image_start_time[image_id] = base_time[image_id] + 5. * tile.tile_id
+            tile.image_end_time[image_id] = tile.image_start_time[image_id] + 5.
+            tile.computation_id = image_id + 1
+        if detector.check():
+            steady_image = image_id + 1
+            break
+    # steady only when the window is all on the new period
+    assert steady_image == change_image + tile_num + 1
+    detector.extrapolate()
+    assert tile_list[-1].image_end_time[-1] == base_time[-1] + 5. * tile_num
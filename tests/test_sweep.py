@@ -0,0 +1,69 @@
+#-*-coding:utf-8-*-
+"""
+@FileName:
+    test_sweep.py
+@Description:
+    test the parameter sweep
+@CreateTime:
+    2026/10/18 16:58
+"""
+import pickle
+from mnsim_noc.sweep import get_sweep_override_list, parse_grid_option, run_sweep
+from test_array import get_test_config
+
+def test_sweep(tmp_path):
+    """
+    test sweep, failed job should not abort the sweep
+    """
+    grid = parse_grid_option(["mapping_strategy=naive,snake", "band_width=1,2"])
+    assert grid == {"mapping_strategy": ["naive", "snake"], "band_width": [1, 2]}
+    override_list = get_sweep_override_list(grid, [{"mapping_strategy": "unknown"}])
+    assert len(override_list) == 5
+    task_path = str(tmp_path / "task.pkl")
+    with open(task_path, "wb") as f:
+        pickle.dump(get_test_config()[0], f)
+    array_config = {
+        "image_num": 2, "tile_array_row": 3, "tile_array_col": 3,
+        "input_buffer_size": 4096, "output_buffer_size": 4096,
+    }
+    row_list = sum(list(run_sweep(array_config, override_list, [task_path])), [])
+    assert len(row_list) == 5
+    status = dict((row["job_id"], row["status"]) for row in row_list)
+    assert status == {0: "ok", 1: "ok", 2: "ok", 3: "ok", 4: "failed"}
+    assert all(row["latency"] > 0 for row in row_list if row["status"] == "ok")
+    # the same result in the worker processes
+    pool_row_list = sum(list(run_sweep(array_config, override_list, [task_path], 2)), [])
+    assert sorted([(row["job_id"], row["status"], row.get("latency")) for row in pool_row_list]) == \
+        sorted([(row["job_id"], row["status"], row.get("latency")) for row in row_list])
+
+def test_sweep_missing_task(tmp_path):
+    """
+    test the task load error is a failed job, the pool should not hang
+    """
+    array_config = {"image_num": 2, "tile_array_row": 3, "tile_array_col": 3}
+    for worker_num in [1, 2]:
+        row_list = sum(list(run_sweep(array_config, [{}, {"band_width": 2}],
+            [str(tmp_path / "missing.pkl")], worker_num
+        )), [])
+        assert [row["status"] for row in row_list] == ["failed", "failed"]
+
+def test_sweep_mapping_kwargs(tmp_path):
+    """
+    test the mapping kwargs are merged into the base config for each job
+    """
+    task_path = str(tmp_path / "task.pkl")
+    with open(task_path, "wb") as f:
+        pickle.dump(get_test_config()[0], f)
+    array_config = {
+        "image_num": 2, "tile_array_row": 3, "tile_array_col": 3,
+        "input_buffer_size": 4096, "output_buffer_size": 4096,
+        "mapping_strategy": "anneal", "mapping_kwargs": {"move_factor": 2},
+    }
+    override_list = get_sweep_override_list(
+        {"mapping_kwargs": [{"seed": 1}, {"seed": 1}], "image_num": [3]}
+    )
+    row_list = sum(list(run_sweep(array_config, override_list, [task_path])), [])
+    assert [row["status"] for row in row_list] == ["ok", "ok"]
+    assert row_list[0]["mapping_kwargs"] == {"move_factor": 2, "seed": 1}
+    assert row_list[0]["image_num"] == 3
+    assert row_list[0]["latency"] == row_list[1]["latency"]
@@ -0,0 +1,40 @@
+#-*-coding:utf-8-*-
+"""
+@FileName:
+    test_task_io.py
+@Description:
+    test the columnar task format
+@CreateTime:
+    2026/10/18 20:05
+"""
+import pickle
+from mnsim_noc.Array import BaseArray
+from mnsim_noc.utils.task_io import save_columnar_task, load_task_behavior
+from mnsim_noc.utils.workload import generate_task_behavior
+from test_array import get_test_config
+
+def test_task_io(tmp_path):
+    """
+    test the columnar task is the same as the pickle task
+    """
+    for i, task_behavior in enumerate([
+        get_test_config()[0],
+        generate_task_behavior(layer_num=4, tile_per_layer=[1, 2, 3, 1], merge_interval=2),
+    ]):
+        dir_path = str(tmp_path / f"task_{i}")
+        save_columnar_task(task_behavior, dir_path)
+        columnar_task = load_task_behavior(dir_path)
+        assert len(columnar_task) == len(task_behavior)
+        for tile, columnar_tile in zip(task_behavior, columnar_task):
+            assert columnar_tile["target_tile_id"] == tile["target_tile_id"]
+            assert list(columnar_tile["dependence"]) == tile["dependence"]
+        # pickled as the path
+        assert len(pickle.loads(pickle.dumps(columnar_task))) == len(task_behavior)
+        result = []
+        for task in [task_behavior, columnar_task]:
+            array = BaseArray([task], 2, (4, 4), (822400, 822400), 1,
+                mapping_strategy="snake"
+            )
+            array.run()
+            result.append((array.show_latency_throughput(), array.time_point_list))
+        assert result[0] == result[1]
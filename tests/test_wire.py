@@ -9,11 +9,56 @@
 @CreateTime:
     2022/05/07 17:33
 """
+import random
+import numpy as np
 from mnsim_noc.Wire import WireNet
+from mnsim_noc.Wire.link_load import get_link_load, get_link_load_report
+
 
 def test_wire():
     """
     test wire net class
     """
     wire_net = WireNet((2, 2), 1)
-    wire_net.set_transparent_flag(True)
\ No newline at end of file
+    wire_net.set_transparent_flag(True)
+
+
+def test_route_table():
+    """
+    test route table of the wire net
+    """
+    wire_net = WireNet((2, 2), 4)
+    route_table = wire_net.route_table
+    route_id = route_table.get_route_id((0, 0), (1, 1))
+    # first left or right, then up or down
+    assert route_table.route_hop[route_id] == 2
+    assert list(route_table.route_index[route_id]) == [
+        wire_net.get_wire_index(((0, 0), (0, 1))),
+        wire_net.get_wire_index(((0, 1), (1, 1))),
+    ]
+    assert route_table.get_route_id((0, 0), (1, 1)) == route_id
+    assert route_table.get_transfer_time(route_id, 8) == 4.
+
+
+def test_link_load():
+    """
+    test the analytic wire load is the same as the volume on the routes of the route table
+    """
+    rng = random.Random(0)
+    wire_net = WireNet((4, 5), 1)
+    position = rng.sample([(i, j) for i in range(4) for j in range(5)], 12)
+    link_list = [(i, (i * 5 + 3) % 12, rng.randint(1, 100)) for i in range(12)]
+    expect = np.zeros(len(wire_net.wire_position))
+    for source, target, volume in link_list:
+        route_id = wire_net.route_table.get_route_id(position[source], position[target])
+        expect[wire_net.route_table.route_index[route_id]] += volume
+    link_source, link_target, link_volume = [np.array(v) for v in zip(*link_list)]
+    load = get_link_load(position, link_source, link_target, link_volume, (4, 5))
+    assert np.array_equal(load, expect)
+    # population
+    population_load = get_link_load(np.array([position, position[::-1]]),
+        link_source, link_target, link_volume, (4, 5)
+    )
+    assert np.array_equal(population_load[0], expect)
+    report = get_link_load_report(population_load)
+    assert report["max"][0] == expect.max() and report["total"][0] == expect.sum()
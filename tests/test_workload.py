@@ -0,0 +1,30 @@
+#-*-coding:utf-8-*-
+"""
+@FileName:
+    test_workload.py
+@Description:
+    test the synthetic workload generator
+@CreateTime:
+    2026/10/18 19:10
+"""
+from mnsim_noc.Array import BaseArray
+from mnsim_noc.utils.workload import generate_task_behavior
+
+def test_workload():
+    """
+    test the generated task behavior can be simulated to the end
+    """
+    task_behavior = generate_task_behavior(layer_num=5, tile_per_layer=[1, 3, 2, 4, 1],
+        fan_in=2, merge_interval=2, feature_map_size=3
+    )
+    assert [tile["tile_id"] for tile in task_behavior] == list(range(11))
+    assert task_behavior[0]["source_tile_id"] == [-1]
+    assert task_behavior[-1]["target_tile_id"] == [-1]
+    # the element sum layer waits on the former layer and the merged layer
+    assert task_behavior[4]["source_tile_id"] == [0, 1, 2]
+    for tile in task_behavior:
+        assert len(tile["dependence"]) == 9
+    array = BaseArray([task_behavior], 2, (4, 4), (822400, 822400), 1,
+        mapping_strategy="snake"
+    )
+    array.run()